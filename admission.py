@@ -0,0 +1,245 @@
+"""
+Admission control & rate limiting untuk endpoint prediksi api.py.
+
+Dua lapis pemeriksaan sebelum body request dibaca (middleware ASGI murni):
+1. Token bucket per klien (header X-API-Key yang terdaftar, selain itu IP) -> 429 + Retry-After jika kuota habis.
+   Biaya token = jumlah forward model (both = 2).
+2. Kapasitas inferensi: estimasi waktu tunggu = total biaya request yang sedang berjalan / INFERENCE_WORKERS,
+   dengan biaya per model = EWMA durasi forward pass request yang terukur (hook observe InferenceScheduler di api.py,
+   tanpa waktu antre dan tanpa warm-up).
+   Jika estimasi melewati batas -> 503 + Retry-After. Endpoint mahal (VGG16, both, tiles) ditolak lebih awal
+   (pada ADMISSION_LOW_PRIORITY_FRACTION dari batas) sehingga saat server jenuh MobileNetV2 tetap dilayani.
+
+Layanan gRPC (grpc_server.py) memakai controller yang sama lewat admit_models.
+"""
+
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from metrics import Counter, Gauge
+from tiling import valid_tile_params
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "2"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))
+# Batas estimasi waktu tunggu (detik) untuk endpoint prioritas tinggi (MobileNetV2)
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "10"))
+ADMISSION_LOW_PRIORITY_FRACTION = float(os.getenv("ADMISSION_LOW_PRIORITY_FRACTION", "0.5"))
+INFERENCE_WORKERS = max(1, int(os.getenv("INFERENCE_WORKERS", "1")))
+# Pakai X-Forwarded-For sebagai identitas klien hanya jika API berada di belakang proxy tepercaya
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "0") == "1"
+MAX_TRACKED_CLIENTS = 10000
+# API key (dipisah koma) tanpa rate limit per klien, misal tier UI Streamlit bersama; tetap kena admission kapasitas
+RATE_LIMIT_EXEMPT_KEYS = {key.strip() for key in os.getenv("RATE_LIMIT_EXEMPT_KEYS", "").split(",") if key.strip()}
+# API key (dipisah koma) yang mendapat bucket sendiri. Key lain diabaikan (identitas = IP): key acak per request
+# tidak boleh menghasilkan bucket baru
+RATE_LIMIT_KEYS = {key.strip() for key in os.getenv("RATE_LIMIT_KEYS", "").split(",") if key.strip()}
+KNOWN_API_KEYS = RATE_LIMIT_KEYS | RATE_LIMIT_EXEMPT_KEYS
+
+API_KEY_HEADER = b"x-api-key"
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+# Latensi forward awal (detik, CPU) sebelum ada pengukuran
+PRIOR_LATENCY = {"vgg16": 0.8, "mobilenetv2": 0.12}
+LATENCY_EWMA_ALPHA = 0.2
+
+# path -> (model yang dijalankan, prioritas). Tiles: model dari query ?model=
+ENDPOINTS = {
+    "/api/predict/mobilenetv2": (("mobilenetv2",), PRIORITY_HIGH),
+    "/api/predict/vgg16": (("vgg16",), PRIORITY_LOW),
+    "/api/predict/both": (("vgg16", "mobilenetv2"), PRIORITY_LOW),
+    "/api/predict/tiles": (None, PRIORITY_LOW),
+}
+
+ADMISSION_REJECTED_TOTAL = Counter("dragonfruit_admission_rejected_total",
+                                   "Request yang ditolak admission control (rate_limit / capacity)",
+                                   ["reason", "endpoint"])
+ADMISSION_PENDING_SECONDS = Gauge("dragonfruit_admission_pending_seconds",
+                                  "Estimasi total waktu inferensi request yang sudah diterima dan belum selesai")
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, cost, now):
+        """Ambil `cost` token; mengembalikan 0 jika berhasil, selain itu detik sampai token cukup"""
+        cost = min(cost, self.burst)  # request yang lebih mahal dari burst tetap bisa lolos saat bucket penuh
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def refund(self, cost):
+        self.tokens = min(self.burst, self.tokens + min(cost, self.burst))
+
+
+REJECTION_DETAILS = {
+    "rate_limit": "Terlalu banyak request, coba lagi nanti",
+    "capacity": "Server sedang penuh, coba lagi nanti",
+}
+
+
+def model_priority(model_keys):
+    """Prioritas request dari model yang dijalankan: hanya MobileNetV2 (murah) yang prioritas tinggi"""
+    return PRIORITY_HIGH if set(model_keys) == {"mobilenetv2"} else PRIORITY_LOW
+
+
+def tile_cost_factor(params):
+    """
+    Pengali biaya request tiles: grid (tile di-batch, jauh di bawah linear terhadap jumlah tile).
+    grid/overlap di luar batas endpoint (tiling.valid_tile_params) ditolak 400 tanpa inferensi -> biaya dasar.
+    """
+    try:
+        grid = int(params.get("grid", ["3"])[0])
+        overlap = float(params.get("overlap", ["0.25"])[0])
+    except ValueError:
+        return 1
+    return grid if valid_tile_params(grid, overlap) else 1
+
+
+class AdmissionController:
+    """State bersama (thread-safe): bucket per klien, EWMA latensi per model, biaya request yang sedang berjalan"""
+
+    def __init__(self, rate=RATE_LIMIT_RPS, burst=RATE_LIMIT_BURST, max_wait=ADMISSION_MAX_WAIT_SECONDS,
+                 workers=INFERENCE_WORKERS):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.workers = workers
+        self.exempt_clients = {"key:" + key for key in RATE_LIMIT_EXEMPT_KEYS}
+        self.latency = dict(PRIOR_LATENCY)
+        self.pending_seconds = 0.0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, model_key, seconds):
+        """Latensi forward terukur satu model (EWMA)"""
+        with self._lock:
+            previous = self.latency.get(model_key, seconds)
+            self.latency[model_key] = previous + LATENCY_EWMA_ALPHA * (seconds - previous)
+
+    def estimated_wait(self):
+        return self.pending_seconds / self.workers
+
+    def request_cost(self, path, query):
+        """(token, estimasi detik inferensi, prioritas) untuk satu request"""
+        model_keys, priority = ENDPOINTS[path]
+        factor = 1.0
+        if model_keys is None:
+            params = parse_qs(query)
+            model_keys = (params.get("model", ["mobilenetv2"])[0],)
+            factor = tile_cost_factor(params)
+        seconds = sum(self.latency.get(key, max(PRIOR_LATENCY.values())) for key in model_keys) * factor
+        return len(model_keys), seconds, priority
+
+    def admit(self, client, path, query):
+        """
+        Mengembalikan (None, biaya_detik) jika diterima - panggil release(biaya_detik) setelah selesai -,
+        atau ((status, alasan, retry_after_detik), 0) jika ditolak.
+        """
+        return self._admit(client, *self.request_cost(path, query))
+
+    def admit_models(self, client, model_keys):
+        """admit untuk pemanggil non-HTTP (gRPC): biaya dari daftar model yang dijalankan"""
+        seconds = sum(self.latency.get(key, max(PRIOR_LATENCY.values())) for key in model_keys)
+        return self._admit(client, len(model_keys), seconds, model_priority(model_keys))
+
+    def _admit(self, client, tokens, seconds, priority):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+                if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            retry_after = 0.0 if client in self.exempt_clients else bucket.take(tokens, now)
+            if retry_after > 0:
+                return (429, "rate_limit", retry_after), 0.0
+
+            limit = self.max_wait if priority == PRIORITY_HIGH else self.max_wait * ADMISSION_LOW_PRIORITY_FRACTION
+            wait = self.estimated_wait()
+            if wait > 0 and wait + seconds / self.workers > limit:
+                bucket.refund(tokens)
+                return (503, "capacity", wait), 0.0
+
+            self.pending_seconds += seconds
+        ADMISSION_PENDING_SECONDS.inc(seconds)
+        return None, seconds
+
+    def release(self, seconds):
+        with self._lock:
+            self.pending_seconds = max(0.0, self.pending_seconds - seconds)
+        ADMISSION_PENDING_SECONDS.dec(seconds)
+
+
+def api_key_identity(api_key, known_keys=KNOWN_API_KEYS):
+    """Identitas "key:..." hanya untuk key yang terdaftar (RATE_LIMIT_KEYS / RATE_LIMIT_EXEMPT_KEYS), selain itu None"""
+    if api_key and api_key in known_keys:
+        return "key:" + api_key
+    return None
+
+
+def client_identity(scope, known_keys=KNOWN_API_KEYS):
+    """
+    API key terdaftar jika ada, selain itu IP klien. Dengan TRUST_FORWARDED_FOR=1 dipakai entri X-Forwarded-For
+    paling kanan (ditambahkan proxy tepercaya di depan API); entri di kirinya dikirim klien dan bisa dipalsukan
+    """
+    headers = dict(scope["headers"])
+    api_key = headers.get(API_KEY_HEADER)
+    identity = api_key_identity(api_key.decode("latin-1") if api_key else None, known_keys)
+    if identity:
+        return identity
+    forwarded = headers.get(b"x-forwarded-for")
+    if TRUST_FORWARDED_FOR and forwarded:
+        hop = forwarded.decode("latin-1").split(",")[-1].strip()
+        if hop:
+            return "ip:" + hop
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI murni: keputusan diambil sebelum body upload dibaca"""
+
+    def __init__(self, app, controller=None):
+        self.app = app
+        self.controller = controller or AdmissionController()
+
+    async def _reject(self, send, status, reason, retry_after):
+        body = ('{"detail": "%s"}' % REJECTION_DETAILS[reason]).encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"retry-after", str(max(1, math.ceil(retry_after))).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if not ADMISSION_ENABLED or scope["type"] != "http" or scope.get("method") != "POST" or path not in ENDPOINTS:
+            await self.app(scope, receive, send)
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        rejection, seconds = self.controller.admit(client_identity(scope), path, query)
+        if rejection is not None:
+            status, reason, retry_after = rejection
+            ADMISSION_REJECTED_TOTAL.inc(reason=reason, endpoint=path)
+            await self._reject(send, status, reason, retry_after)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(seconds)
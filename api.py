@@ -4,18 +4,39 @@ Menggunakan FastAPI untuk menyediakan endpoint API
 """
 
 import os
+import io
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.preprocessing import image  # type: ignore
 from PIL import Image
-import io
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import uvicorn
 
+import tracing
+from metrics import Counter, Gauge, Histogram, generate_latest
+from postprocessing import INVALID_CLASS_NAME, score_stats, softmax
+from embeddings import FeatureExtractor
+from embedding_index import EMBEDDING_INDEX_FILE, EmbeddingIndex
+import tta
+import compact_response
+from preprocessing import convert_to_rgb, to_model_input
+from uploads import MaxBodySizeMiddleware, hash_upload
+from admission import AdmissionController, AdmissionMiddleware
+from scheduler import LANE_BULK, LANE_HEADER, LANE_INTERACTIVE, LANES, InferenceScheduler
+import autotune
+from tensor_ingest import SHAPE_HEADER, TRANSFER_ENCODING_HEADER, decode_tensor, is_tensor_upload
+from tiling import MAX_GRID, MAX_OVERLAP, TileLimitError, merge_regions, tile_batch, valid_tile_params
+
 # ==============================================================================
 # KONFIGURASI PATH
 # ==============================================================================
@@ -36,6 +57,10 @@ IMG_HEIGHT = 224
 IMG_WIDTH = 224
 CLASS_NAMES = ['Defect Dragon Fruit', 'Immature Dragon Fruit', 'Mature Dragon Fruit']
 
+# Ukuran batch yang di-warm-up saat startup (dipisah koma), contoh: "1,4,8"
+# Kosongkan ("") untuk melewati warm-up
+WARMUP_BATCH_SIZES = [int(b) for b in os.getenv("WARMUP_BATCH_SIZES", "1").split(",") if b.strip()]
+
 # ==============================================================================
 # INISIALISASI FASTAPI
 # ==============================================================================
@@ -46,26 +71,64 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# CORS middleware untuk mengizinkan akses dari web browser
+# Urutan middleware: yang ditambahkan terakhir membungkus yang sebelumnya (paling luar).
+# Dari luar ke dalam: tracing (@app.middleware di bawah) -> CORS -> Admission -> MaxBodySize -> endpoint.
+
+# Batas ukuran body (413), paling dalam: hanya request yang lolos admission yang body-nya dibaca
+app.add_middleware(MaxBodySizeMiddleware)
+
+# Admission (rate limit + kapasitas): request ditolak (429/503) sebelum body dibaca
+admission_controller = AdmissionController()
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# CORS middleware untuk mengizinkan akses dari web browser; ditambahkan setelah Admission dan MaxBodySize
+# sehingga membungkus keduanya dan respons 413/429/503 tetap mendapat header CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Untuk production, ganti dengan domain spesifik
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Trace-Id"],
 )
 
+@app.middleware("http")
+async def tracing_middleware(request: Request, call_next):
+    """Tracing opt-in: jika diminta (header X-Trace: 1), durasi tiap tahap dikembalikan di header Server-Timing"""
+    if not tracing.is_requested(request.headers):
+        return await call_next(request)
+    
+    trace, token = tracing.start_trace(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        tracing.end_trace(trace, token)
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers["X-Trace-Id"] = trace.trace_id
+    return response
+
 # ==============================================================================
 # MEMUAT MODEL (Dilakukan sekali saat startup)
 # ==============================================================================
 
-model_vgg16 = None
-model_mobilenetv2 = None
+# Registry model: key endpoint -> model Keras (None jika gagal dimuat)
+models = {"vgg16": None, "mobilenetv2": None}
+MODEL_DISPLAY_NAMES = {"vgg16": "VGG16", "mobilenetv2": "MobileNetV2"}
+
+# Status readiness: True hanya setelah warm-up selesai
+models_ready = False
+warmup_report = {}
+
+# Profil autotune host ini (model_results/autotune.json): thread TF + ukuran batch scheduler per model
+autotune_profile = autotune.load_profile() if autotune.AUTOTUNE_APPLY else None
+
+# Index kNN embedding training set (opsional, model_results/embedding_index.npz) + extractor MobileNetV2
+embedding_index = None
+feature_extractor = None
 
 @app.on_event("startup")
 async def load_models():
     """Memuat model saat aplikasi startup"""
-    global model_vgg16, model_mobilenetv2
     
     print(f"Base directory: {BASE_DIR}")
     print(f"Model results directory: {MODEL_RESULTS_DIR}")
@@ -179,17 +242,170 @@ async def load_models():
             traceback.print_exc()
             return None
     
+    # Thread TF hanya bisa diatur sebelum runtime TF aktif, jadi sebelum model pertama dimuat
+    if autotune_profile is not None and autotune.apply_thread_settings(autotune_profile, tf):
+        print(f"🎛️ Thread TF dari autotune: {autotune_profile['threads']}")
+    
     print("\nMemuat model VGG16...")
-    model_vgg16 = load_model_safe(VGG16_MODEL_PATH, "VGG16")
-    if model_vgg16 is None:
+    models["vgg16"] = load_model_safe(VGG16_MODEL_PATH, "VGG16")
+    if models["vgg16"] is None:
         print("⚠️ API akan tetap berjalan, tapi endpoint VGG16 tidak akan tersedia")
     
     print("\nMemuat model MobileNetV2...")
-    model_mobilenetv2 = load_model_safe(MOBILENETV2_MODEL_PATH, "MobileNetV2")
-    if model_mobilenetv2 is None:
+    models["mobilenetv2"] = load_model_safe(MOBILENETV2_MODEL_PATH, "MobileNetV2")
+    if models["mobilenetv2"] is None:
         print("⚠️ API akan tetap berjalan, tapi endpoint MobileNetV2 tidak akan tersedia")
     
-    print("\n✅ Startup selesai!")
+    load_embedding_index()
+    autotune.apply_batch_sizes(autotune_profile, inference_scheduler)
+    
+    # Warm-up dijalankan di thread terpisah agar /api/live tetap bisa menjawab
+    # selama graph TF di-trace; /api/ready baru 200 setelah warm-up selesai
+    asyncio.get_running_loop().run_in_executor(None, warmup_models).add_done_callback(report_warmup_failure)
+    
+    print("\n✅ Startup selesai! (warm-up berjalan di background)")
+
+def load_embedding_index():
+    """Memuat index kNN embedding jika file ada dan MobileNetV2 dimuat (dipakai untuk statistik OOD/duplikat)"""
+    global embedding_index, feature_extractor
+    
+    if models["mobilenetv2"] is None or not os.path.exists(EMBEDDING_INDEX_FILE):
+        return
+    try:
+        embedding_index = EmbeddingIndex.load(EMBEDDING_INDEX_FILE)
+        feature_extractor = FeatureExtractor(models["mobilenetv2"], embedding_index.layer_name or None)
+        print(f"✅ Index embedding dimuat: {len(embedding_index.vectors)} vektor, threshold OOD {embedding_index.ood_distance:.4f}")
+    except Exception as e:
+        embedding_index = None
+        feature_extractor = None
+        print(f"⚠️ Index embedding tidak dapat dimuat, statistik kNN dinonaktifkan: {e}")
+
+def warmup_models():
+    """
+    Menjalankan batch dummy di setiap ukuran batch melalui semua model yang dimuat (lewat inference_scheduler,
+    jalur yang sama dengan request), supaya tracing graph, pemilihan kernel dan alokasi memori TF terjadi sebelum
+    request pertama, bukan di request pertama. Ready hanya jika setiap model yang dimuat berhasil di-warm-up
+    minimal di satu ukuran batch.
+    """
+    global models_ready
+    
+    # Batch TTA (K-1 view) ikut di-warm-up jika TTA aktif secara default
+    warmup_batch_sizes = list(WARMUP_BATCH_SIZES)
+    if tta.TTA_MODE != "off" and len(tta.DEFAULT_VIEWS) - 1 not in warmup_batch_sizes:
+        warmup_batch_sizes.append(len(tta.DEFAULT_VIEWS) - 1)
+    # Ukuran batch hasil autotune juga di-warm-up karena itulah batch yang akan dibentuk scheduler
+    if WARMUP_BATCH_SIZES:
+        warmup_batch_sizes += [b for b in autotune.tuned_batch_sizes(autotune_profile) if b not in warmup_batch_sizes]
+    
+    loaded = {key: model for key, model in models.items() if model is not None}
+    for key, model in loaded.items():
+        batches = {}
+        for batch_size in warmup_batch_sizes:
+            dummy = np.zeros((batch_size, IMG_HEIGHT, IMG_WIDTH, 3), dtype=np.float32)
+            # Batch yang lebih besar dari batas lane interactive dibentuk scheduler di lane bulk
+            lane = LANE_INTERACTIVE if batch_size <= inference_scheduler.batch_limit(LANE_INTERACTIVE, key) \
+                else LANE_BULK
+            start = time.perf_counter()
+            try:
+                inference_scheduler.run(key, model, dummy, lane, observe=False)
+                batches[str(batch_size)] = round((time.perf_counter() - start) * 1000, 1)
+            except Exception as e:
+                print(f"❌ Warm-up {MODEL_DISPLAY_NAMES[key]} batch {batch_size} gagal: {e}")
+                batches[str(batch_size)] = f"error: {e}"
+        ok = not warmup_batch_sizes or any(not isinstance(v, str) for v in batches.values())
+        warmup_report[key] = {**batches, "status": "ok" if ok else "failed"}
+        print(f"🔥 Warm-up {MODEL_DISPLAY_NAMES[key]} selesai: {warmup_report[key]} (ms)")
+    
+    models_ready = bool(loaded) and all(warmup_report[key]["status"] == "ok" for key in loaded)
+    print(f"✅ Warm-up selesai, ready={models_ready}")
+    
+    # Sweep autotune (bisa beberapa menit di CPU) tidak menunda readiness: berjalan di background lewat scheduler
+    if models_ready and autotune.AUTOTUNE_ON_STARTUP and autotune_profile is None:
+        threading.Thread(target=run_startup_autotune, name="autotune", daemon=True).start()
+
+def report_warmup_failure(future):
+    """Exception dari warm-up di executor tidak boleh hilang diam-diam: catat di log dan di warmup_report"""
+    error = future.exception()
+    if error is not None:
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
+        warmup_report["error"] = f"{type(error).__name__}: {error}"
+        print(f"❌ Warm-up gagal, API tidak ready: {error}")
+
+def run_startup_autotune():
+    """
+    AUTOTUNE_ON_STARTUP=1 tanpa profil untuk host ini: sweep ukuran batch (thread saat ini) lewat scheduler lane bulk,
+    sementara API sudah melayani request; hasil diterapkan ke scheduler lalu disimpan (best-effort)
+    """
+    global autotune_profile
+    
+    try:
+        autotune_profile = autotune.tune_in_process(models, inference_scheduler, IMG_HEIGHT, IMG_WIDTH)
+        print("🎛️ Autotune selesai: " + ", ".join(
+            f"{MODEL_DISPLAY_NAMES[key]} bulk={tuned['bulk_batch']} interactive={tuned['interactive_batch']}"
+            for key, tuned in autotune_profile["models"].items()))
+    except Exception as e:
+        print(f"⚠️ Autotune saat startup gagal, ukuran batch default dipakai: {e}")
+
+# ==============================================================================
+# METRIK & CACHE PREDIKSI
+# ==============================================================================
+
+STAGE_LATENCY = Histogram(
+    "dragonfruit_stage_latency_seconds",
+    "Latensi per tahap pipeline prediksi (upload_read, decode, preprocess, forward, postprocess, tta, knn, serialize)",
+    ["stage", "model"]
+)
+PREDICTIONS_TOTAL = Counter("dragonfruit_predictions_total", "Jumlah prediksi per model dan kelas", ["model", "class"])
+INVALID_TOTAL = Counter("dragonfruit_invalid_total", "Jumlah prediksi 'Tidak Valid - Bukan Buah Naga'", ["model"])
+CACHE_HITS_TOTAL = Counter("dragonfruit_cache_hits_total", "Jumlah prediksi yang dilayani dari cache", ["model"])
+CACHE_MISSES_TOTAL = Counter("dragonfruit_cache_misses_total", "Jumlah prediksi yang harus menjalankan model", ["model"])
+QUEUE_DEPTH = Gauge("dragonfruit_inference_queue_depth", "Request prediksi yang sedang menunggu atau menjalani inferensi")
+
+# Jumlah hasil prediksi yang disimpan (key: model + hash isi file). Opt-in: default 0 = nonaktif,
+# sehingga setiap request menjalankan model kecuali cache diaktifkan secara eksplisit
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+
+class PredictionCache:
+    """
+    Cache LRU sederhana untuk hasil predict_image, key = (model, sha1 isi upload).
+    Dipakai bersamaan dari thread request REST (asyncio.to_thread) dan gRPC, jadi akses OrderedDict dikunci.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, model_key, digest):
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            result = self._items.get((model_key, digest))
+            if result is not None:
+                self._items.move_to_end((model_key, digest))
+        if result is not None:
+            CACHE_HITS_TOTAL.inc(model=model_key)
+        else:
+            CACHE_MISSES_TOTAL.inc(model=model_key)
+        return result
+    
+    def put(self, model_key, digest, result):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[(model_key, digest)] = result
+            self._items.move_to_end((model_key, digest))
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE)
+
+@contextmanager
+def timed_stage(stage, model_key=""):
+    """Mencatat durasi satu tahap ke histogram /metrics dan ke span trace (jika request di-trace)"""
+    span_name = f"{stage}-{model_key}" if model_key else stage
+    with STAGE_LATENCY.time(stage=stage, model=model_key), tracing.span(span_name):
+        yield
 
 # ==============================================================================
 # FUNGSI PREPROCESSING DAN PREDIKSI
@@ -200,69 +416,100 @@ def preprocess_image(img):
     Melakukan pre-processing pada gambar agar sesuai dengan input model CNN.
     """
     try:
-        # Konversi RGBA/LA/P ke RGB
-        if img.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        img = img.resize((IMG_HEIGHT, IMG_WIDTH))
-        img_array = image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0)
-        img_array = img_array / 255.0  # Normalisasi
-        return img_array
+        # Mode resize & filter dari env PREPROCESS_RESIZE / PREPROCESS_FILTER (preprocessing.py)
+        return to_model_input(img, IMG_WIDTH, IMG_HEIGHT)
     except Exception as e:
         return None
 
-def predict_image(model, img_array):
+def postprocess_batch(scores):
+    """
+    Statistik (margin, entropy) dan deteksi "Tidak Valid" untuk skor softmax [N, 3] sekaligus
+    (postprocessing.score_stats, vectorized). Mengembalikan list (nama_kelas, confidence, scores, stats) per baris.
+    """
+    scores = np.atleast_2d(scores)
+    stats = score_stats(scores)
+    results = []
+    for i, row in enumerate(scores):
+        is_invalid = bool(stats["is_invalid"][i])
+        predicted_class_name = INVALID_CLASS_NAME if is_invalid else CLASS_NAMES[stats["predicted_index"][i]]
+        row_stats = {
+            "confidence_diff": float(stats["confidence_diff"][i]),
+            "entropy": float(stats["entropy"][i]),
+            "max_entropy": stats["max_entropy"],
+            "is_valid": not is_invalid
+        }
+        scores_dict = dict(zip(CLASS_NAMES, (row * 100).tolist()))
+        results.append((predicted_class_name, float(stats["max_confidence"][i]), scores_dict, row_stats))
+    return results
+
+def postprocess_scores(scores_numpy):
+    """
+    Menghitung statistik (margin, entropy) dan deteksi "Tidak Valid" dari skor softmax satu gambar.
+    Mengembalikan (nama_kelas, confidence, scores, stats)
+    """
+    return postprocess_batch(scores_numpy)[0]
+
+def apply_knn_statistics(result, embedding, model_key=""):
+    """
+    Menambahkan statistik kNN (jarak, label tetangga, OOD, near-duplicate) ke stats hasil prediksi.
+    Gambar OOD (jauh dari semua gambar training) ditandai "Tidak Valid" walaupun softmax yakin.
+    """
+    predicted_class_name, confidence, scores_dict, stats = result
+    with timed_stage("knn", model_key):
+        knn_stats = embedding_index.statistics(embedding)[0]
+    stats = {**stats, **knn_stats}
+    if knn_stats["is_ood"]:
+        predicted_class_name = INVALID_CLASS_NAME
+        stats["is_valid"] = False
+    return predicted_class_name, confidence, scores_dict, stats
+
+def forward_batch(model_key, model, batch):
+    """Forward pass satu batch (dijalankan thread worker scheduler). Mengembalikan (embeddings atau None, predictions)"""
+    if model_key == "mobilenetv2" and feature_extractor is not None:
+        # Satu forward pass menghasilkan skor dan embedding untuk index kNN
+        return feature_extractor(batch)
+    return None, model.predict(batch, batch_size=len(batch), verbose=0)
+
+# Semua forward pass lewat scheduler: lane interactive didahulukan, lane bulk mengisi sisa kapasitas dengan batch besar.
+# Durasi forward pass request (tanpa waktu antre, tanpa warm-up) -> estimasi kapasitas admission control;
+# waktu antre sudah dihitung terpisah oleh admission lewat biaya request yang sedang berjalan
+inference_scheduler = InferenceScheduler(forward_batch, observe=admission_controller.observe)
+
+def predict_image(model, img_array, model_key="", tta_mode=tta.TTA_MODE, lane=LANE_INTERACTIVE):
     """
     Melakukan prediksi menggunakan model.
+    tta_mode: "off", "adaptive" (TTA hanya jika margin view tunggal ambigu) atau "always".
+    lane: lane scheduler (interactive / bulk).
     Mengembalikan (nama_kelas, confidence, scores, stats)
     """
     try:
-        predictions = model.predict(img_array, verbose=0)
-        scores = tf.nn.softmax(predictions[0])
-        scores_numpy = scores.numpy()
+        embedding = None
+        with timed_stage("forward", model_key):
+            embeddings, predictions = inference_scheduler.run(model_key, model, img_array, lane)
+            if embeddings is not None:
+                embedding = embeddings[0]
         
-        max_confidence = np.max(scores_numpy) * 100
-        predicted_class_index = np.argmax(scores_numpy)
-        predicted_class_name = CLASS_NAMES[predicted_class_index]
+        with timed_stage("postprocess", model_key):
+            single_scores = softmax(predictions)[0]
+            result = postprocess_scores(single_scores)
         
-        # Hitung statistik
-        sorted_scores = np.sort(scores_numpy)[::-1]
-        confidence_diff = (sorted_scores[0] - sorted_scores[1]) * 100 if len(sorted_scores) > 1 else 100
-        entropy = -np.sum(scores_numpy * np.log(scores_numpy + 1e-10))
-        max_entropy = np.log(len(CLASS_NAMES))
+        tta_views = 1
+        if tta.should_apply(tta_mode, result[3]["confidence_diff"]):
+            # View selain yang asli dijalankan sebagai satu batch [K-1, H, W, 3]; skor view asli dipakai ulang
+            with timed_stage("tta", model_key):
+                views = tta.augmented_views(img_array)[1:]
+                view_scores = softmax(inference_scheduler.run(model_key, model, views, lane)[1])
+                result = postprocess_scores(tta.aggregate(np.vstack([single_scores[None, :], view_scores])))
+            tta_views = len(views) + 1
+        result[3]["tta_views"] = tta_views
         
-        # Deteksi "Tidak Valid"
-        is_invalid = False
-        if max_confidence < 70:
-            is_invalid = True
-        elif max_confidence >= 75 and max_confidence < 85:
-            if confidence_diff < 30 or (entropy > max_entropy * 0.50 and confidence_diff < 40):
-                is_invalid = True
-        elif max_confidence >= 85 and max_confidence < 98:
-            if confidence_diff < 50 or (entropy > max_entropy * 0.45 and confidence_diff < 60):
-                is_invalid = True
+        if embedding is not None:
+            result = apply_knn_statistics(result, embedding, model_key)
         
-        if is_invalid:
-            predicted_class_name = "Tidak Valid - Bukan Buah Naga"
-        
-        stats = {
-            "confidence_diff": float(confidence_diff),
-            "entropy": float(entropy),
-            "max_entropy": float(max_entropy),
-            "is_valid": not is_invalid
-        }
-        
-        # Konversi scores ke list
-        scores_dict = {CLASS_NAMES[i]: float(scores_numpy[i]) * 100 for i in range(len(CLASS_NAMES))}
-        
-        return predicted_class_name, float(max_confidence), scores_dict, stats
+        PREDICTIONS_TOTAL.inc(model=model_key, **{"class": result[0]})
+        if not result[3]["is_valid"]:
+            INVALID_TOTAL.inc(model=model_key)
+        return result
     except Exception as e:
         return None, 0.0, {}, {}
 
@@ -282,6 +529,215 @@ class CombinedPredictionResponse(BaseModel):
     mobilenetv2: Optional[PredictionResponse]
     message: str
 
+class TileRegion(BaseModel):
+    box: List[float]
+    prediction: str
+    confidence: float
+    scores: dict
+
+class TilePredictionResponse(BaseModel):
+    model: str
+    image_size: List[int]
+    tiles_total: int
+    regions: List[TileRegion]
+    counts: dict
+    message: str
+
+# ==============================================================================
+# HELPER PIPELINE ENDPOINT
+# ==============================================================================
+
+async def read_upload(file: UploadFile, allow_tensor=True):
+    """
+    Validasi tipe file lalu baca isi upload. Mengembalikan (contents, sha1 hex).
+    contents = file upload ter-spool (dibaca langsung oleh decoder, tanpa copy ke bytes), atau array uint8 [H, W, 3]
+    untuk upload tensor mentah (tensor_ingest.py). Ukuran body sudah dibatasi MaxBodySizeMiddleware (413).
+    """
+    tensor_upload = allow_tensor and is_tensor_upload(file.content_type)
+    if not tensor_upload and not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File harus berupa gambar (JPG, JPEG, PNG)")
+    
+    if not tensor_upload:
+        with timed_stage("upload_read"):
+            digest = hash_upload(file.file)
+        return file.file, digest
+    
+    with timed_stage("upload_read"):
+        contents = await file.read()
+    
+    with timed_stage("decode"):
+        try:
+            pixels = decode_tensor(contents, file.content_type, IMG_HEIGHT, IMG_WIDTH,
+                                   file.headers.get(SHAPE_HEADER), file.headers.get(TRANSFER_ENCODING_HEADER))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return pixels, hashlib.sha1(pixels).hexdigest()
+
+def open_image(contents):
+    """Decode gambar dari bytes (gRPC) atau langsung dari file upload ter-spool (REST)"""
+    img = Image.open(contents if hasattr(contents, "read") else io.BytesIO(contents))
+    img.load()
+    return img
+
+def decode_and_preprocess(contents):
+    """Decode gambar (bytes / file upload) dengan PIL lalu preprocess ke array [1, H, W, 3]"""
+    if isinstance(contents, np.ndarray):
+        # Tensor mentah sudah berukuran input model: tanpa Image.open dan preprocess_image
+        with timed_stage("preprocess"):
+            return contents[np.newaxis].astype(np.float32) / 255.0
+    
+    with timed_stage("decode"):
+        img = open_image(contents)
+    
+    with timed_stage("preprocess"):
+        img_array = preprocess_image(img)
+    if img_array is None:
+        raise HTTPException(status_code=400, detail="Gagal memproses gambar")
+    return img_array
+
+def predict_cached(model_keys, contents, digest, tta_mode=tta.TTA_MODE, lane=LANE_INTERACTIVE):
+    """
+    Menjalankan prediksi untuk setiap model di model_keys (yang sudah dimuat).
+    Hasil diambil dari cache jika ada; decode/preprocess hanya dilakukan sekali dan hanya jika perlu.
+    Mengembalikan dict key -> (nama_kelas, confidence, scores, stats), None jika gagal (tanpa Pydantic, dipakai juga gRPC)
+    """
+    results = {}
+    img_array = None
+    # Hasil TTA berbeda dengan hasil view tunggal, jadi mode TTA ikut menjadi bagian key cache
+    cache_digest = digest if tta_mode == "off" else f"{digest}:tta-{tta_mode}"
+    
+    for key in model_keys:
+        result = prediction_cache.get(key, cache_digest)
+        if result is None:
+            if img_array is None:
+                img_array = decode_and_preprocess(contents)
+            try:
+                result = predict_image(models[key], img_array, key, tta_mode, lane)
+            except Exception as e:
+                print(f"Error {MODEL_DISPLAY_NAMES[key]}: {e}")
+                result = (None, 0.0, {}, {})
+            if result[0] is not None:
+                prediction_cache.put(key, cache_digest, result)
+        
+        results[key] = result if result[0] is not None else None
+    
+    return results
+
+def run_models(model_keys, contents, digest, tta_mode=tta.TTA_MODE, lane=LANE_INTERACTIVE):
+    """predict_cached dengan hasil berupa PredictionResponse per key (None jika gagal)"""
+    results = {}
+    for key, result in predict_cached(model_keys, contents, digest, tta_mode, lane).items():
+        if result is None:
+            results[key] = None
+            continue
+        prediction, confidence, scores, stats = result
+        results[key] = PredictionResponse(
+            model=MODEL_DISPLAY_NAMES[key],
+            prediction=prediction,
+            confidence=confidence,
+            scores=scores,
+            statistics=stats
+        )
+    return results
+
+def predict_tile_regions(model_key, contents, grid, overlap, lane=LANE_INTERACTIVE):
+    """
+    Mode multi-buah: tile overlap -> satu batch forward -> region per buah (NMS per kelas) dan jumlah per kelas.
+    Tile yang "Tidak Valid" (latar, bukan buah) tidak dijadikan region.
+    """
+    with timed_stage("decode"):
+        img = open_image(contents)
+    
+    with timed_stage("preprocess"):
+        try:
+            img = convert_to_rgb(img)
+            tiles, boxes = tile_batch(img, grid, overlap, IMG_HEIGHT)
+        except TileLimitError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception:
+            raise HTTPException(status_code=400, detail="Gagal memproses gambar")
+        batch = tiles.astype(np.float32) / 255.0  # Normalisasi
+    
+    with timed_stage("forward", model_key):
+        predictions = inference_scheduler.run(model_key, models[model_key], batch, lane)[1]
+    
+    with timed_stage("postprocess", model_key):
+        scores = softmax(predictions)
+        stats = score_stats(scores)
+        valid = np.flatnonzero(~stats["is_invalid"])
+        keep = valid[merge_regions(boxes[valid], stats["predicted_index"][valid], stats["max_confidence"][valid])]
+        regions = [
+            TileRegion(
+                box=[round(float(v), 1) for v in boxes[i]],
+                prediction=CLASS_NAMES[stats["predicted_index"][i]],
+                confidence=float(stats["max_confidence"][i]),
+                scores=dict(zip(CLASS_NAMES, (scores[i] * 100).tolist())),
+            )
+            for i in keep
+        ]
+        counts = {name: 0 for name in CLASS_NAMES}
+        for region in regions:
+            counts[region.prediction] += 1
+    
+    return TilePredictionResponse(
+        model=MODEL_DISPLAY_NAMES[model_key],
+        image_size=list(img.size),
+        tiles_total=len(tiles),
+        regions=regions,
+        counts=counts,
+        message=f"{len(regions)} region buah naga terdeteksi dari {len(tiles)} tile"
+    )
+
+def resolve_tta_mode(tta_param):
+    """Mode TTA dari query ?tta= (default env TTA_MODE); 400 jika tidak dikenal"""
+    mode = tta_param or tta.TTA_MODE
+    if mode not in tta.TTA_MODES:
+        raise HTTPException(status_code=400, detail=f"Parameter tta harus salah satu dari: {', '.join(tta.TTA_MODES)}")
+    return mode
+
+def resolve_lane(lane_header):
+    """Lane scheduler dari header X-Inference-Lane (default interactive); 400 jika tidak dikenal"""
+    lane = (lane_header or LANE_INTERACTIVE).strip().lower()
+    if lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"Header X-Inference-Lane harus salah satu dari: {', '.join(LANES)}")
+    return lane
+
+def negotiated_response(accept, results, json_result):
+    """
+    Respons biner ringkas (MessagePack/CBOR, compact_response.py) jika diminta lewat header Accept,
+    selain itu json_result (model Pydantic) sebagai JSON. Keduanya dengan Vary: Accept karena URL yang sama
+    menghasilkan format berbeda, sehingga cache bersama tidak menyajikan JSON ke klien yang meminta biner.
+    """
+    media_type = compact_response.negotiate(accept)
+    if media_type is None:
+        return JSONResponse(content=jsonable_encoder(json_result), headers={"Vary": "Accept"})
+    with timed_stage("serialize"):
+        content = compact_response.dumps(compact_response.encode_predictions(results), media_type)
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
+
+async def predict_single(model_key, file, tta_param=None, accept=None, lane_header=None):
+    """Pipeline bersama untuk endpoint prediksi satu model"""
+    if models[model_key] is None:
+        raise HTTPException(status_code=503, detail=f"Model {MODEL_DISPLAY_NAMES[model_key]} tidak dimuat")
+    
+    tta_mode = resolve_tta_mode(tta_param)
+    lane = resolve_lane(lane_header)
+    contents, digest = await read_upload(file)
+    
+    try:
+        with QUEUE_DEPTH.track_inprogress():
+            # Di thread agar event loop tetap menerima request lain (yang bisa di-batch scheduler);
+            # to_thread menyalin contextvars sehingga span tracing tetap tercatat
+            result = (await asyncio.to_thread(run_models, [model_key], contents, digest, tta_mode, lane))[model_key]
+        
+        if result is None:
+            raise HTTPException(status_code=500, detail="Gagal melakukan prediksi")
+        return negotiated_response(accept, {model_key: result}, result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
 # ==============================================================================
 # ENDPOINT API
 # ==============================================================================
@@ -293,15 +749,17 @@ async def root():
         "message": "Dragon Fruit Classification API",
         "version": "1.0.0",
         "status": "running",
-        "models_loaded": {
-            "vgg16": model_vgg16 is not None,
-            "mobilenetv2": model_mobilenetv2 is not None
-        },
+        "models_loaded": {key: model is not None for key, model in models.items()},
+        "ready": models_ready,
         "endpoints": {
             "predict_vgg16": "/api/predict/vgg16",
             "predict_mobilenetv2": "/api/predict/mobilenetv2",
             "predict_both": "/api/predict/both",
+            "predict_tiles": "/api/predict/tiles",
             "health": "/api/health",
+            "live": "/api/live",
+            "ready": "/api/ready",
+            "metrics": "/metrics",
             "docs": "/docs"
         },
         "usage": "Visit /docs for interactive API documentation"
@@ -312,155 +770,119 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "vgg16_loaded": model_vgg16 is not None,
-        "mobilenetv2_loaded": model_mobilenetv2 is not None
+        "ready": models_ready,
+        "vgg16_loaded": models["vgg16"] is not None,
+        "mobilenetv2_loaded": models["mobilenetv2"] is not None
     }
 
+@app.get("/api/live")
+async def liveness_probe():
+    """Liveness probe - proses hidup dan event loop merespons"""
+    return {"status": "alive"}
+
+@app.get("/api/ready")
+async def readiness_probe():
+    """
+    Readiness probe - 200 hanya setelah model dimuat dan warm-up selesai.
+    Load balancer sebaiknya memakai endpoint ini agar tidak mengirim traffic ke worker yang masih dingin.
+    """
+    body = {
+        "status": "ready" if models_ready else "warming_up",
+        "models_loaded": {key: model is not None for key, model in models.items()},
+        "warmup_ms": warmup_report,
+        "batch_limits": {lane: {key: inference_scheduler.batch_limit(lane, key) for key, model in models.items()
+                                if model is not None} for lane in LANES}
+    }
+    if not models_ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Metrik format Prometheus: histogram latensi per tahap, counter prediksi, cache dan queue depth"""
+    return Response(content=generate_latest(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.post("/api/predict/vgg16", response_model=PredictionResponse)
-async def predict_vgg16(file: UploadFile = File(...)):
+async def predict_vgg16(request: Request, file: UploadFile = File(...), tta: Optional[str] = None):
     """
     Endpoint untuk prediksi menggunakan model VGG16
     
-    - **file**: File gambar (JPG, JPEG, PNG)
-    - Returns: Hasil prediksi dengan confidence score
+    - **file**: File gambar (JPG, JPEG, PNG) atau tensor uint8 224x224x3 mentah / .npy (lihat tensor_ingest.py)
+    - **tta**: (opsional) off / adaptive / always - test-time augmentation
+    - Returns: Hasil prediksi dengan confidence score (MessagePack/CBOR ringkas jika Accept memintanya)
     """
-    if model_vgg16 is None:
-        raise HTTPException(status_code=503, detail="Model VGG16 tidak dimuat")
-    
-    # Validasi file
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File harus berupa gambar (JPG, JPEG, PNG)")
-    
-    try:
-        # Baca file
-        contents = await file.read()
-        img = Image.open(io.BytesIO(contents))
-        
-        # Preprocess
-        img_array = preprocess_image(img)
-        if img_array is None:
-            raise HTTPException(status_code=400, detail="Gagal memproses gambar")
-        
-        # Predict
-        prediction, confidence, scores, stats = predict_image(model_vgg16, img_array)
-        
-        if prediction is None:
-            raise HTTPException(status_code=500, detail="Gagal melakukan prediksi")
-        
-        return PredictionResponse(
-            model="VGG16",
-            prediction=prediction,
-            confidence=confidence,
-            scores=scores,
-            statistics=stats
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    return await predict_single("vgg16", file, tta, request.headers.get("accept"), request.headers.get(LANE_HEADER))
 
 @app.post("/api/predict/mobilenetv2", response_model=PredictionResponse)
-async def predict_mobilenetv2(file: UploadFile = File(...)):
+async def predict_mobilenetv2(request: Request, file: UploadFile = File(...), tta: Optional[str] = None):
     """
     Endpoint untuk prediksi menggunakan model MobileNetV2
     
-    - **file**: File gambar (JPG, JPEG, PNG)
-    - Returns: Hasil prediksi dengan confidence score
+    - **file**: File gambar (JPG, JPEG, PNG) atau tensor uint8 224x224x3 mentah / .npy (lihat tensor_ingest.py)
+    - **tta**: (opsional) off / adaptive / always - test-time augmentation
+    - Returns: Hasil prediksi dengan confidence score (MessagePack/CBOR ringkas jika Accept memintanya)
     """
-    if model_mobilenetv2 is None:
-        raise HTTPException(status_code=503, detail="Model MobileNetV2 tidak dimuat")
-    
-    # Validasi file
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File harus berupa gambar (JPG, JPEG, PNG)")
-    
-    try:
-        # Baca file
-        contents = await file.read()
-        img = Image.open(io.BytesIO(contents))
-        
-        # Preprocess
-        img_array = preprocess_image(img)
-        if img_array is None:
-            raise HTTPException(status_code=400, detail="Gagal memproses gambar")
-        
-        # Predict
-        prediction, confidence, scores, stats = predict_image(model_mobilenetv2, img_array)
-        
-        if prediction is None:
-            raise HTTPException(status_code=500, detail="Gagal melakukan prediksi")
-        
-        return PredictionResponse(
-            model="MobileNetV2",
-            prediction=prediction,
-            confidence=confidence,
-            scores=scores,
-            statistics=stats
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    return await predict_single("mobilenetv2", file, tta, request.headers.get("accept"), request.headers.get(LANE_HEADER))
 
 @app.post("/api/predict/both", response_model=CombinedPredictionResponse)
-async def predict_both(file: UploadFile = File(...)):
+async def predict_both(request: Request, file: UploadFile = File(...), tta: Optional[str] = None):
     """
     Endpoint untuk prediksi menggunakan kedua model (VGG16 dan MobileNetV2)
     
-    - **file**: File gambar (JPG, JPEG, PNG)
-    - Returns: Hasil prediksi dari kedua model
+    - **file**: File gambar (JPG, JPEG, PNG) atau tensor uint8 224x224x3 mentah / .npy (lihat tensor_ingest.py)
+    - **tta**: (opsional) off / adaptive / always - test-time augmentation
+    - Returns: Hasil prediksi dari kedua model (MessagePack/CBOR ringkas jika Accept memintanya)
     """
-    # Validasi file
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="File harus berupa gambar (JPG, JPEG, PNG)")
+    tta_mode = resolve_tta_mode(tta)
+    lane = resolve_lane(request.headers.get(LANE_HEADER))
+    contents, digest = await read_upload(file)
     
     try:
-        # Baca file sekali
-        contents = await file.read()
-        img = Image.open(io.BytesIO(contents))
+        loaded_keys = [key for key, model in models.items() if model is not None]
+        with QUEUE_DEPTH.track_inprogress():
+            results = await asyncio.to_thread(run_models, loaded_keys, contents, digest, tta_mode, lane)
         
-        # Preprocess
-        img_array = preprocess_image(img)
-        if img_array is None:
-            raise HTTPException(status_code=400, detail="Gagal memproses gambar")
-        
-        vgg16_result = None
-        mobilenetv2_result = None
-        
-        # Predict dengan VGG16
-        if model_vgg16 is not None:
-            try:
-                prediction, confidence, scores, stats = predict_image(model_vgg16, img_array)
-                if prediction is not None:
-                    vgg16_result = PredictionResponse(
-                        model="VGG16",
-                        prediction=prediction,
-                        confidence=confidence,
-                        scores=scores,
-                        statistics=stats
-                    )
-            except Exception as e:
-                print(f"Error VGG16: {e}")
-        
-        # Predict dengan MobileNetV2
-        if model_mobilenetv2 is not None:
-            try:
-                prediction, confidence, scores, stats = predict_image(model_mobilenetv2, img_array)
-                if prediction is not None:
-                    mobilenetv2_result = PredictionResponse(
-                        model="MobileNetV2",
-                        prediction=prediction,
-                        confidence=confidence,
-                        scores=scores,
-                        statistics=stats
-                    )
-            except Exception as e:
-                print(f"Error MobileNetV2: {e}")
+        vgg16_result = results.get("vgg16")
+        mobilenetv2_result = results.get("mobilenetv2")
         
         if vgg16_result is None and mobilenetv2_result is None:
             raise HTTPException(status_code=500, detail="Gagal melakukan prediksi dengan kedua model")
         
-        return CombinedPredictionResponse(
+        return negotiated_response(request.headers.get("accept"), results, CombinedPredictionResponse(
             vgg16=vgg16_result,
             mobilenetv2=mobilenetv2_result,
             message="Prediksi berhasil"
-        )
+        ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+@app.post("/api/predict/tiles", response_model=TilePredictionResponse)
+async def predict_tiles(request: Request, file: UploadFile = File(...), model: str = "mobilenetv2", grid: int = 3,
+                        overlap: float = 0.25):
+    """
+    Endpoint multi-buah: foto peti/conveyor dipecah menjadi tile overlap dan semua tile diklasifikasikan sekaligus
+    
+    - **file**: File gambar (JPG, JPEG, PNG)
+    - **model**: vgg16 / mobilenetv2 (default mobilenetv2)
+    - **grid**: jumlah tile di sisi terpendek gambar (1-8)
+    - **overlap**: fraksi overlap antar tile (0-0.75)
+    - Returns: Region (box x0, y0, x1, y1 dalam piksel gambar asli) per buah dan jumlah per kelas kematangan
+    """
+    if model not in models:
+        raise HTTPException(status_code=400, detail=f"Model harus salah satu dari: {', '.join(models)}")
+    if models[model] is None:
+        raise HTTPException(status_code=503, detail=f"Model {MODEL_DISPLAY_NAMES[model]} tidak dimuat")
+    if not valid_tile_params(grid, overlap):
+        raise HTTPException(status_code=400, detail=f"grid harus 1-{MAX_GRID} dan overlap 0-{MAX_OVERLAP}")
+    lane = resolve_lane(request.headers.get(LANE_HEADER))
+    
+    contents, _ = await read_upload(file, allow_tensor=False)
+    
+    try:
+        with QUEUE_DEPTH.track_inprogress():
+            return await asyncio.to_thread(predict_tile_regions, model, contents, grid, overlap, lane)
     except HTTPException:
         raise
     except Exception as e:
@@ -1,22 +1,43 @@
 import streamlit as st
-import tensorflow as tf
-from tensorflow.keras.preprocessing import image  # type: ignore
 import numpy as np
 from PIL import Image
 import os
 import json
-import matplotlib.pyplot as plt
-import seaborn as sns
-import random # Diperlukan untuk Mode Presentasi
+import importlib.util
 import io
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-# Import Gemini dengan error handling
+from charts import confidence_chart_spec
+from postprocessing import calibrate_scores, softmax
+from preprocessing import to_model_input
+from dragon_gate import DRAGON_GATE_FILE, GATE_ACCEPT, GATE_BORDERLINE
+
+# Awal rerun - dipakai record_rerun_timing di akhir script
+RERUN_START = time.perf_counter()
+
+# Library berat (tensorflow, google.generativeai) di-import secara lazy
+# di dalam fungsi yang membutuhkannya. Streamlit menjalankan ulang seluruh script di setiap
+# interaksi, jadi import di top-level hanya untuk modul ringan.
+# Ukur waktu import dengan: python benchmarks/importtime_report.py
+
+# Mode client: jika INFERENCE_API_URL di-set, inferensi dikirim ke layanan FastAPI (api.py)
+# sehingga proses UI tidak perlu import TensorFlow maupun memuat model
+INFERENCE_API_URL = os.getenv("INFERENCE_API_URL", "")
+
+# Batas waktu (detik) menunggu Gemini di TAHAP 1. Gemini dan inferensi CNN berjalan bersamaan;
+# jika Gemini belum menjawab saat deadline, keputusan diambil dari statistik CNN (is_dragon_fruit_fallback)
+GEMINI_DEADLINE_SECONDS = float(os.getenv("GEMINI_DEADLINE_SECONDS", "8"))
+
+# Port exporter /metrics proses UI (histogram latensi Gemini); 0 = tidak diekspos
+UI_METRICS_PORT = int(os.getenv("UI_METRICS_PORT", "0"))
+
+# Cek ketersediaan Gemini tanpa meng-import library-nya
 try:
-    import google.generativeai as genai  # type: ignore
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
-    genai = None  # Set ke None untuk avoid error
 
 # Import konfigurasi Gemini dari file terpisah
 try:
@@ -141,1733 +162,260 @@ CLASS_NAMES = ['Defect Dragon Fruit', 'Immature Dragon Fruit', 'Mature Dragon Fr
 
 
 # ==============================================================================
-# BAGIAN 1.1: CUSTOM CSS (Tetap sama)
+# BAGIAN 1.1: CUSTOM CSS
 # ==============================================================================
 
-# Custom CSS
-st.markdown("""
-<style>
-    /* ... (CSS lengkap Anda dari file asli ada di sini) ... */
-    /* Background utama dengan gradient */
-    .stApp {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        min-height: 100vh;
-        padding-top: 0rem !important;
-    }
-    
-    /* Kurangi padding-top dari main content area */
-    .main {
-        padding-top: 0rem !important;
-        margin-top: 0rem !important;
-    }
-    
-    /* Hapus margin atas dari element pertama */
-    .main .block-container > div:first-child {
-        margin-top: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    
-    /* Override margin dari Streamlit default */
-    div[data-testid="stVerticalBlock"] > div:first-child {
-        margin-top: 0rem !important;
-    }
-    
-    /* Override element-container margin */
-    .element-container:first-child {
-        margin-top: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    
-    /* Override stMarkdown margin untuk header pertama */
-    .stMarkdown:first-child h1 {
-        margin-top: 0rem !important;
-    }
-    
-    /* Override margin dari semua element di dalam block-container yang pertama */
-    .main .block-container > *:first-child {
-        margin-top: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    
-    /* Container utama */
-    .main .block-container {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 20px;
-        padding: 0.5rem 2rem;
-        margin: 0rem 1rem !important;
-        margin-top: 0rem !important;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.3);
-        backdrop-filter: blur(10px);
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    /* Saat sidebar tertutup - konten terpusat dengan max-width yang wajar */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main .block-container {
-        margin-left: auto !important;
-        margin-right: auto !important;
-        margin-top: -1rem !important;
-        margin-bottom: 1rem !important;
-        padding-top: 0 !important;
-        padding-bottom: 2rem !important;
-        padding-left: 2rem !important;
-        padding-right: 2rem !important;
-        max-width: 1200px !important;
-        width: calc(100% - 4rem) !important;
-    }
-    
-    /* Sidebar styling - Pastikan sidebar selalu terlihat dengan animasi */
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #2C3E50 0%, #34495E 100%) !important;
-        min-width: 250px !important;
-        transition: transform 0.4s cubic-bezier(0.4, 0, 0.2, 1),
-                    opacity 0.3s ease,
-                    box-shadow 0.3s ease,
-                    margin-left 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        box-shadow: 4px 0 20px rgba(0, 0, 0, 0.3) !important;
-    }
-    
-    /* Sidebar saat terbuka - tambahkan efek glow */
-    section[data-testid="stSidebar"]:not([aria-hidden="true"]) {
-        box-shadow: 4px 0 30px rgba(78, 205, 196, 0.3) !important;
-    }
-    
-    /* Sidebar saat tertutup - benar-benar tidak terlihat sama sekali */
-    section[data-testid="stSidebar"][aria-hidden="true"] {
-        display: none !important;
-        visibility: hidden !important;
-        width: 0px !important;
-        min-width: 0px !important;
-        max-width: 0px !important;
-        height: 0px !important;
-        opacity: 0 !important;
-        overflow: hidden !important;
-        margin: 0 !important;
-        padding: 0 !important;
-        border: none !important;
-        box-shadow: none !important;
-        position: absolute !important;
-        left: -9999px !important;
-        top: -9999px !important;
-        z-index: -1 !important;
-        pointer-events: none !important;
-    }
-    
-    /* Pastikan semua elemen dalam sidebar tersembunyi */
-    section[data-testid="stSidebar"][aria-hidden="true"] * {
-        display: none !important;
-        visibility: hidden !important;
-        opacity: 0 !important;
-        width: 0 !important;
-        height: 0 !important;
-        margin: 0 !important;
-        padding: 0 !important;
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Sidebar container - sembunyikan saat tertutup */
-    section[data-testid="stSidebar"][aria-hidden="true"] .css-1d391kg {
-        display: none !important;
-        visibility: hidden !important;
-        width: 0 !important;
-        opacity: 0 !important;
-    }
-    
-    .css-1d391kg {
-        background: linear-gradient(180deg, #2C3E50 0%, #34495E 100%);
-    }
-    
-    /* Sejajarkan konten utama dengan kartu Informasi Model di sidebar */
-    /* Sidebar biasanya memiliki padding-top sekitar 1rem, kartu Informasi Model ada di posisi pertama */
-    section[data-testid="stSidebar"] .element-container:first-child {
-        padding-top: 1rem;
-    }
-    
-    .main-header {
-        font-size: 3rem;
-        font-weight: 900;
-        text-align: center;
-        color: white;
-        margin-top: -1rem !important;
-        margin-bottom: 0.5rem !important;
-        padding: 0.25rem 0 !important;
-        text-shadow: 
-            0 0 20px rgba(78, 205, 196, 0.8),
-            0 0 40px rgba(78, 205, 196, 0.6),
-            0 4px 8px rgba(0, 0, 0, 0.3);
-        letter-spacing: -0.02em;
-        line-height: 1.1;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        gap: 0.75rem;
-    }
-    
-    .sub-header {
-        font-size: 1.8rem;
-        font-weight: 700;
-        background: linear-gradient(45deg, #4ECDC4, #45B7D1);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-    }
-    
-    .info-box {
-        background: linear-gradient(135deg, #2C3E50 0%, #34495E 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 6px solid #4ECDC4;
-        margin: 1rem 0;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.3);
-        color: white;
-        border: 2px solid #4ECDC4;
-    }
-    
-    .success-box {
-        background: linear-gradient(135deg, #27AE60 0%, #2ECC71 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 6px solid #FFFFFF;
-        margin: 1rem 0;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.3);
-        color: white;
-        border: 2px solid #FFFFFF;
-    }
-    
-    .warning-box {
-        background: linear-gradient(135deg, #E67E22 0%, #F39C12 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 6px solid #FFFFFF;
-        margin: 1rem 0;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.3);
-        color: white;
-        border: 2px solid #FFFFFF;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        box-shadow: 0 12px 24px rgba(0,0,0,0.4);
-        margin: 1rem 0;
-        border: 3px solid #4ECDC4;
-        position: relative;
-        color: white;
-    }
-    
-    
-    .prediction-result {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 2rem;
-        border-radius: 20px;
-        text-align: center;
-        margin: 1rem 0;
-        box-shadow: 0 15px 30px rgba(0,0,0,0.3);
-        border: 3px solid rgba(255,255,255,0.2);
-    }
-    
-    .prediction-result.invalid {
-        background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);
-        border: 3px solid white;
-    }
-    
-    /* Upload area styling */
-    .stFileUploader > div > div {
-        background: linear-gradient(135deg, #2C3E50 0%, #34495E 100%);
-        border-radius: 15px;
-        border: 3px dashed #4ECDC4;
-        padding: 2rem;
-        color: white !important;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-    }
-    
-    /* File uploader text styling */
-    .stFileUploader label {
-        color: white !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-    }
-    
-    .stFileUploader p {
-        color: white !important;
-        font-weight: 500 !important;
-        font-size: 1rem !important;
-    }
-    
-    .stFileUploader div[data-testid="stFileUploader"] {
-        color: white !important;
-    }
-    
-    /* Upload button styling */
-    .stFileUploader button {
-        background: linear-gradient(45deg, #4ECDC4, #45B7D1) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 10px !important;
-        padding: 0.75rem 1.5rem !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2) !important;
-    }
-    
-    .stFileUploader button:hover {
-        background: linear-gradient(45deg, #45B7D1, #4ECDC4) !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.3) !important;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        background: linear-gradient(90deg, #4ECDC4, #45B7D1);
-        border-radius: 10px;
-        padding: 0.5rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        border-radius: 8px;
-        color: white;
-        font-weight: 600;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: rgba(255,255,255,0.2);
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(45deg, #4ECDC4, #45B7D1);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(45deg, #45B7D1, #4ECDC4);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0,0,0,0.3);
-    }
-    
-    /* Footer styling */
-    .footer-box {
-        background: linear-gradient(135deg, #2C3E50 0%, #34495E 100%);
-        color: white;
-        padding: 2rem;
-        border-radius: 20px;
-        text-align: center;
-        margin-top: 2rem;
-        box-shadow: 0 15px 30px rgba(0,0,0,0.2);
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    /* Jangan sembunyikan header - butuh untuk tombol toggle sidebar */
-    /* header {visibility: hidden;} */
-    
-    /* Styling untuk tombol toggle sidebar agar lebih terlihat */
-    header[data-testid="stHeader"] {
-        background: transparent !important;
-        position: relative !important;
-        z-index: 1000 !important;
-        padding-left: 0 !important;
-        padding-right: 0 !important;
-        margin: 0 !important;
-    }
-    
-    /* Container untuk tombol toggle sidebar - geser ke pojok kiri tanpa celah */
-    div[data-testid="stToolbar"],
-    header[data-testid="stHeader"] > div:first-child,
-    header[data-testid="stHeader"] > div {
-        justify-content: flex-start !important;
-        padding-left: 0 !important;
-        padding-right: 0 !important;
-        margin-left: 0 !important;
-        margin-right: 0 !important;
-        width: 100% !important;
-    }
-    
-    /* Force header content ke pojok kiri tanpa celah */
-    header[data-testid="stHeader"] {
-        padding: 0 !important;
-        margin: 0 !important;
-    }
-    
-    /* Tombol toggle sidebar (hamburger menu) - Pojok kiri TANPA CELAH */
-    button[data-testid="baseButton-header"] {
-        background: linear-gradient(135deg, #4ECDC4 0%, #45B7D1 50%, #4ECDC4 100%) !important;
-        background-size: 200% 200% !important;
-        color: white !important;
-        border: 3px solid rgba(255, 255, 255, 0.3) !important;
-        border-radius: 12px !important;
-        padding: 0.75rem !important;
-        min-width: 60px !important;
-        min-height: 60px !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        box-shadow: 0 6px 20px rgba(78, 205, 196, 0.4), 
-                    0 0 20px rgba(78, 205, 196, 0.2) !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        cursor: pointer !important;
-        position: relative !important;
-        overflow: hidden !important;
-        animation: pulseGlow 2s ease-in-out infinite !important;
-        margin-left: 0 !important;
-        margin-right: auto !important;
-        margin-top: 0 !important;
-        margin-bottom: 0 !important;
-    }
-    
-    /* Saat sidebar tertutup - geser tombol ke pojok kiri TANPA CELAH */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ header[data-testid="stHeader"] button[data-testid="baseButton-header"] {
-        margin-left: 0 !important;
-        margin-right: auto !important;
-    }
-    
-    /* Pastikan header toolbar align ke pojok kiri TANPA CELAH */
-    header[data-testid="stHeader"] > div:first-child {
-        display: flex !important;
-        justify-content: flex-start !important;
-        align-items: center !important;
-        padding-left: 0 !important;
-        padding-right: 0 !important;
-        margin-left: 0 !important;
-        margin-right: 0 !important;
-        width: 100% !important;
-    }
-    
-    /* Hapus semua spacing tambahan - TANPA CELAH SAMA SEKALI */
-    header[data-testid="stHeader"] > div:first-child > *:first-child,
-    header[data-testid="stHeader"] button[data-testid="baseButton-header"],
-    div[data-testid="stToolbar"] > *:first-child {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-    }
-    
-    /* Pastikan semua child elements tidak punya margin/padding kiri */
-    header[data-testid="stHeader"] * {
-        margin-left: 0 !important;
-    }
-    
-    /* Exception: biarkan tombol punya margin-right untuk spacing internal */
-    header[data-testid="stHeader"] button[data-testid="baseButton-header"] {
-        margin-left: 0 !important;
-        margin-right: auto !important;
-    }
+# CSS statis disimpan di assets/style.css dan dibaca sekali (cache per mtime file),
+# bukan dibangun ulang sebagai string ~1.500 baris di setiap rerun
+APP_CSS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'style.css')
+
+@st.cache_data
+def load_css(path, mtime):
+    """Membaca file CSS dan membungkusnya dalam tag <style> (mtime sebagai bagian key cache)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f"<style>\n{f.read()}\n</style>"
+
+st.markdown(load_css(APP_CSS_FILE, os.path.getmtime(APP_CSS_FILE)), unsafe_allow_html=True)
+
+
+# ==============================================================================
+# BAGIAN 1.2: MEMUAT METRIK DAN MODEL (LOKAL)
+# ==============================================================================
+
+METRIC_ARTIFACT_KEYS = ('accuracy_loss_plot_path', 'confusion_matrix_plot_path', 'classification_report_path')
+METRIC_ARTIFACT_SUFFIXES = {
+    'accuracy_loss_plot_path': ('accuracy_loss.png', 'training_history.png'),
+    'confusion_matrix_plot_path': ('confusion_matrix.png', 'cm.png'),
+    'classification_report_path': ('classification_report.txt', 'report.txt'),
+}
+
+
+def model_results_fingerprint():
+    """
+    Sidik jari folder model_results: (nama, mtime_ns, ukuran) untuk setiap file.
+    Cukup satu os.scandir per rerun; index artefak metrik hanya dibangun ulang jika nilai ini berubah.
+    """
+    try:
+        with os.scandir(MODEL_RESULTS_DIR) as entries:
+            files = [(entry.name, entry.stat()) for entry in entries if entry.is_file()]
+    except OSError:
+        return ()
+    return tuple(sorted((name, stat.st_mtime_ns, stat.st_size) for name, stat in files))
+
+
+def find_metric_artifact(model, key, available, filename=None, with_patterns=True):
+    """
+    Mencari file artefak (plot/report) di model_results berdasarkan daftar nama file yang ada (tanpa os.path.exists).
+    Urutan kandidat: nama file dari JSON beserta variasi huruf besar/kecil, lalu pola nama default per model.
+    """
+    candidates = []
+    if filename:
+        candidates += [
+            filename,
+            filename.replace('VGG16', 'vgg16').replace('MobileNetV2', 'mobilenetv2'),
+            filename.replace('vgg16', 'VGG16').replace('mobilenetv2', 'MobileNetV2'),
+        ]
+    if with_patterns:
+        model_name_capital = 'VGG16' if model == 'vgg16' else 'MobileNetV2'
+        for suffix in METRIC_ARTIFACT_SUFFIXES[key]:
+            candidates += [f"{model_name_capital}_{suffix}", f"{model}_{suffix}"]
+    for name in candidates:
+        if name in available:
+            return os.path.join(MODEL_RESULTS_DIR, name)
+    return None
+
+
+def load_model_metrics(available):
+    """
+    Memuat metrik model dari file JSON dan me-resolve path plot/report ke file lokal di model_results.
+    """
+    if os.path.exists(MODEL_METRICS_FILE):
+        try:
+            with open(MODEL_METRICS_FILE, 'r', encoding='utf-8') as f:
+                metrics = json.load(f)
+            
+            if metrics:
+                # Pastikan struktur yang diharapkan ada
+                for model in ['vgg16', 'mobilenetv2']:
+                    if model not in metrics:
+                        metrics[model] = {}
+                    if not isinstance(metrics[model], dict):
+                        continue
+                    
+                    # Mapping key yang mungkin berbeda di JSON
+                    # Beberapa JSON menggunakan 'test_accuracy' bukan 'accuracy'
+                    if 'test_accuracy' in metrics[model] and 'accuracy' not in metrics[model]:
+                        metrics[model]['accuracy'] = metrics[model]['test_accuracy']
+                    
+                    # Mapping path yang mungkin berbeda
+                    # Beberapa JSON menggunakan 'plot_path' bukan 'accuracy_loss_plot_path'
+                    path_mapping = {
+                        'plot_path': 'accuracy_loss_plot_path',
+                        'cm_path': 'confusion_matrix_plot_path',
+                        'report_path': 'classification_report_path'
+                    }
+                    for old_key, new_key in path_mapping.items():
+                        if old_key in metrics[model] and new_key not in metrics[model]:
+                            metrics[model][new_key] = metrics[model][old_key]
+                    
+                    # --- PERBAIKAN PATH GAMBAR & LAPORAN ---
+                    # Path di JSON mungkin relatif atau path Kaggle (misal: "/kaggle/working/model_results/...")
+                    # Kita perlu menggabungkannya dengan BASE_DIR atau mencari file lokal
+                    for key in METRIC_ARTIFACT_KEYS:
+                        relative_path = metrics[model].get(key)
+                        if not relative_path:
+                            # Jika key tidak ada, coba mencari file dengan pattern default
+                            metrics[model][key] = find_metric_artifact(model, key, available)
+                        elif isinstance(relative_path, str):
+                            filename = os.path.basename(relative_path)
+                            if relative_path.startswith('/kaggle/working/'):
+                                # Path Kaggle: cari file lokal dengan nama yang sama atau pola default
+                                metrics[model][key] = find_metric_artifact(model, key, available, filename)
+                            else:
+                                # Path relatif biasa
+                                absolute_path = os.path.join(BASE_DIR, relative_path)
+                                if os.path.exists(absolute_path):
+                                    metrics[model][key] = absolute_path
+                                else:
+                                    metrics[model][key] = find_metric_artifact(
+                                        model, key, available, filename, with_patterns=False)
+            
+            return metrics
+            
+        except json.JSONDecodeError as e:
+            st.error(f"Error parsing JSON dari '{MODEL_METRICS_FILE}'. File mungkin corrupt. Error: {e}")
+            return None
+        except Exception as e:
+            st.error(f"Gagal memuat metrik model dari '{MODEL_METRICS_FILE}'. Error: {e}")
+            return None
+    else:
+        st.warning(f"⚠ File metrik model '{MODEL_METRICS_FILE}' tidak ditemukan. Pastikan file ada di lokasi tersebut.")
+        return None
+
+
+def read_metric_artifacts(metrics):
+    """
+    Membaca isi artefak yang path-nya sudah di-resolve: bytes gambar untuk plot, teks untuk classification report.
+    Hasil: {model: {key: isi atau None, 'classification_report_error': pesan atau None}}
+    """
+    artifacts = {}
+    for model in ['vgg16', 'mobilenetv2']:
+        model_metrics = metrics.get(model) if metrics else None
+        model_artifacts = {key: None for key in METRIC_ARTIFACT_KEYS}
+        model_artifacts['classification_report_error'] = None
+        if isinstance(model_metrics, dict):
+            for key in METRIC_ARTIFACT_KEYS:
+                path = model_metrics.get(key)
+                if not isinstance(path, str):
+                    continue
+                try:
+                    if key == 'classification_report_path':
+                        with open(path, 'r') as f:
+                            model_artifacts[key] = f.read()
+                    else:
+                        with open(path, 'rb') as f:
+                            model_artifacts[key] = f.read()
+                except OSError as e:
+                    if key == 'classification_report_path':
+                        model_artifacts['classification_report_error'] = str(e)
+        artifacts[model] = model_artifacts
+    return artifacts
+
+
+@st.cache_resource(max_entries=1)
+def load_metrics_index(fingerprint):
+    """
+    Index artefak metrik (metrik JSON, path ter-resolve, teks report dan bytes gambar), dibangun sekali
+    per sidik jari model_results. cache_resource agar bytes gambar tidak di-copy setiap rerun;
+    max_entries=1 membuang index lama begitu isi folder berubah.
+    """
+    available = frozenset(name for name, _, _ in fingerprint)
+    metrics = load_model_metrics(available)
+    return {"metrics": metrics, "artifacts": read_metric_artifacts(metrics)}
+
+# Muat metrik model (index dibangun ulang hanya jika isi folder model_results berubah)
+metrics_index = load_metrics_index(model_results_fingerprint())
+model_performance_metrics = metrics_index["metrics"]
+metrics_artifacts = metrics_index["artifacts"]
+
+@st.cache_resource
+def load_models():
+    """
+    Memuat model VGG16 dan MobileNetV2 dari file .h5 atau .keras.
+    """
+    import tensorflow as tf  # Lazy import - hanya mode lokal, sekali per proses (cache_resource)
+
+    model_vgg16 = None
+    model_mobilenetv2 = None
+
+    # Fix untuk compatibility issues dengan TensorFlow/Keras versi berbeda
     
-    /* AGRESIF: Paksa tombol ke pojok kiri dengan absolute positioning jika perlu */
-    header[data-testid="stHeader"] {
-        position: relative !important;
-    }
+    # 1. InputLayer compatibility - handle batch_shape untuk TensorFlow 2.15
+    # Model dibuat dengan batch_shape, tapi TF 2.15 tidak support
+    # Perlu custom InputLayer yang benar-benar compatible
+    class CompatibleInputLayer(tf.keras.layers.InputLayer):
+        """Custom InputLayer yang handle batch_shape dengan benar"""
+        @classmethod
+        def from_config(cls, config):
+            """Override from_config untuk handle batch_shape"""
+            # Convert batch_shape ke input_shape jika ada
+            if 'batch_shape' in config:
+                batch_shape = config.pop('batch_shape')
+                if batch_shape and len(batch_shape) > 1:
+                    # Skip batch dimension, ambil [H, W, C]
+                    config['input_shape'] = tuple(batch_shape[1:])
+            return super().from_config(config)
     
-    /* Pastikan container header tidak punya padding/margin apapun */
-    header[data-testid="stHeader"],
-    header[data-testid="stHeader"] > div,
-    header[data-testid="stHeader"] > div > div {
-        padding-left: 0 !important;
-        margin-left: 0 !important;
-    }
+    # 2. DTypePolicy compatibility - handle Keras 3.x dtype policy
+    # Keras 3.x menggunakan DTypePolicy, TensorFlow 2.x menggunakan string langsung
+    class DTypePolicyCompat:
+        """Compatible DTypePolicy untuk handle Keras 3.x model di TensorFlow 2.x"""
+        def __init__(self, name='float32', *args, **kwargs):
+            if isinstance(name, str):
+                self.name = name
+            elif hasattr(name, 'name'):
+                self.name = name.name
+            else:
+                self.name = 'float32'
+            # Tambahkan attribute yang dibutuhkan TensorFlow
+            self.compute_dtype = self.name
+            self.variable_dtype = self.name
+        
+        @property
+        def dtype(self):
+            """Return dtype sebagai string"""
+            return self.name
+        
+        @classmethod
+        def from_config(cls, config):
+            """Dari config Keras 3.x"""
+            if isinstance(config, dict):
+                name = config.get('name', 'float32')
+            else:
+                name = 'float32'
+            return cls(name=name)
+        
+        def get_config(self):
+            return {'name': self.name}
+        
+        def __call__(self, dtype=None):
+            """Callable untuk compatibility"""
+            return self.name
     
-    /* Pastikan header container bisa menampung tombol absolute */
-    header[data-testid="stHeader"] > div:first-child {
-        position: relative !important;
-        min-height: 60px !important;
-    }
+    # Try import dari keras jika ada
+    try:
+        from keras import DTypePolicy
+        # Gunakan wrapper yang compatible
+        DTypePolicyClass = DTypePolicyCompat
+    except ImportError:
+        DTypePolicyClass = DTypePolicyCompat
     
-    /* Force tombol ke pojok kiri TANPA CELAH dengan absolute positioning */
-    header[data-testid="stHeader"] button[data-testid="baseButton-header"],
-    button[data-testid="baseButton-header"] {
-        position: absolute !important;
-        left: 0 !important;
-        top: 50% !important;
-        transform: translateY(-50%) !important;
-        margin: 0 !important;
-        padding-left: 0.25rem !important;
-        padding-right: 0.75rem !important;
-        z-index: 10000 !important;
-        order: -999 !important;
-        flex-shrink: 0 !important;
-    }
-    
-    
-    /* Animasi pulse glow untuk menarik perhatian */
-    @keyframes pulseGlow {
-        0%, 100% {
-            box-shadow: 0 6px 20px rgba(78, 205, 196, 0.4), 
-                        0 0 20px rgba(78, 205, 196, 0.2);
-        }
-        50% {
-            box-shadow: 0 6px 25px rgba(78, 205, 196, 0.6), 
-                        0 0 30px rgba(78, 205, 196, 0.4);
-        }
-    }
-    
-    /* Animasi gradient background */
-    @keyframes gradientShift {
-        0% {
-            background-position: 0% 50%;
-        }
-        50% {
-            background-position: 100% 50%;
-        }
-        100% {
-            background-position: 0% 50%;
-        }
-    }
-    
-    /* Hover effect - lebih dramatis dengan absolute positioning */
-    button[data-testid="baseButton-header"]:hover {
-        background: linear-gradient(135deg, #45B7D1 0%, #4ECDC4 50%, #45B7D1 100%) !important;
-        background-size: 200% 200% !important;
-        animation: gradientShift 1.5s ease infinite, pulseGlow 1.5s ease-in-out infinite !important;
-        transform: translateY(-50%) scale(1.15) rotate(5deg) !important;
-        box-shadow: 0 8px 30px rgba(78, 205, 196, 0.7), 
-                    0 0 40px rgba(78, 205, 196, 0.5),
-                    inset 0 0 20px rgba(255, 255, 255, 0.2) !important;
-        border-color: rgba(255, 255, 255, 0.6) !important;
-        left: 0 !important;
-    }
-    
-    /* Active/pressed effect dengan absolute positioning */
-    button[data-testid="baseButton-header"]:active {
-        transform: translateY(-50%) scale(1.05) rotate(-5deg) !important;
-        box-shadow: 0 4px 15px rgba(78, 205, 196, 0.5), 
-                    inset 0 2px 10px rgba(0, 0, 0, 0.2) !important;
-        transition: all 0.1s ease !important;
-        left: 0 !important;
-    }
-    
-    /* Ripple effect background */
-    button[data-testid="baseButton-header"]::before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        width: 0;
-        height: 0;
-        border-radius: 50%;
-        background: rgba(255, 255, 255, 0.3);
-        transform: translate(-50%, -50%);
-        transition: width 0.6s, height 0.6s;
-    }
-    
-    button[data-testid="baseButton-header"]:hover::before {
-        width: 300px;
-        height: 300px;
-    }
-    
-    /* Icon hamburger di tombol - lebih besar dan jelas */
-    button[data-testid="baseButton-header"] svg {
-        fill: white !important;
-        width: 32px !important;
-        height: 32px !important;
-        transition: transform 0.3s ease !important;
-        filter: drop-shadow(0 2px 4px rgba(0, 0, 0, 0.3)) !important;
-        z-index: 1 !important;
-        position: relative !important;
-    }
-    
-    /* Animasi rotasi icon saat hover */
-    button[data-testid="baseButton-header"]:hover svg {
-        transform: rotate(90deg) scale(1.1) !important;
-    }
-    
-    /* Remove white spaces and improve spacing */
-    .stApp > div {
-        background: transparent;
-    }
-    
-    /* Main content container - smooth transition saat sidebar buka/tutup */
-    .main .block-container {
-        max-width: 1200px;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        /* Biarkan Streamlit mengatur margin secara dinamis untuk pergeseran */
-    }
-    
-    /* Saat sidebar tertutup - pastikan main area tidak ada margin kiri berlebihan */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-        width: 100% !important;
-        max-width: 100% !important;
-        left: 0 !important;
-    }
-    
-    /* Saat sidebar tertutup - pastikan konten benar-benar mulai dari kiri */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main > div {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-    }
-    
-    /* Pastikan block-container benar-benar mulai dari kiri tanpa margin */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main .block-container {
-        margin-left: 0 !important;
-    }
-    
-    /* Main content area - smooth transition - Streamlit otomatis set margin-left */
-    .main {
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        /* Biarkan Streamlit mengatur margin-left secara dinamis */
-    }
-    
-    /* Pastikan saat sidebar tertutup, konten bergeser sepenuhnya ke kiri */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ * {
-        margin-left: 0 !important;
-    }
-    
-    /* Override: Pastikan block-container mulai dari kiri saat sidebar tertutup */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main .block-container {
-        margin-left: 0 !important;
-        padding-left: 1.5rem !important;
-        width: calc(100% - 3rem) !important;
-        max-width: none !important;
-    }
-    
-    /* Pastikan tidak ada spacing tambahan dari Streamlit */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ section[data-testid="stMain"] {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-    }
-    
-    /* Agresif: Hapus semua margin kiri dari parent elements saat sidebar tertutup (tapi biarkan padding untuk readability) */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main {
-        margin-left: 0 !important;
-    }
-    
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main > div {
-        margin-left: 0 !important;
-    }
-    
-    /* Pastikan element pertama di main content tidak punya margin kiri */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main > div:first-child {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-    }
-    
-    /* Header title - smooth transition dan ikut bergeser dengan konten */
-    .main-header {
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        text-align: center !important;
-        /* Header akan ikut bergeser karena berada dalam .main yang sudah memiliki transition */
-    }
-    
-    /* Pastikan semua elemen konten memiliki transisi smooth */
-    .element-container,
-    .stMarkdown,
-    .stColumns,
-    [data-testid="column"],
-    section.main > div {
-        transition: margin-left 0.4s cubic-bezier(0.4, 0, 0.2, 1),
-                    transform 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    /* Pastikan semua elemen di main content bergeser dengan smooth */
-    .info-box,
-    .metric-card,
-    .prediction-result,
-    .footer-box {
-        transition: margin-left 0.4s cubic-bezier(0.4, 0, 0.2, 1),
-                    transform 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    /* Memastikan app content area responsive terhadap sidebar dengan smooth transition */
-    div[data-testid="stAppViewContainer"] {
-        transition: margin-left 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    /* Saat sidebar tertutup - pastikan app view container tidak punya margin kiri */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ div[data-testid="stAppViewContainer"] {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-        width: 100% !important;
-        left: 0 !important;
-    }
-    
-    /* Saat sidebar tertutup - pastikan semua elemen di dalam app view container mulai dari kiri */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ div[data-testid="stAppViewContainer"] > div {
-        margin-left: 0 !important;
-        padding-left: 0 !important;
-    }
-    
-    /* Pastikan tidak ada transform atau positioning yang membuat celah */
-    section[data-testid="stSidebar"][aria-hidden="true"] ~ .main {
-        transform: translateX(0) !important;
-    }
-    
-    /* Memastikan semua elemen Streamlit memiliki transisi */
-    section[data-testid="stSidebar"] ~ * {
-        transition: margin-left 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    /* Improve sidebar */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #2C3E50 0%, #34495E 100%) !important;
-    }
-    
-    .css-1d391kg .css-1lcbmhc {
-        background: transparent !important;
-    }
-    
-    /* Style metric components */
-    .metric-container {
-        background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-        color: white;
-        border: 2px solid #4ECDC4;
-    }
-    
-    /* Improve image display */
-    .stImage {
-        border-radius: 15px;
-        box-shadow: 0 8px 16px rgba(0,0,0,0.2);
-    }
-    
-    /* Style code blocks */
-    .stCode {
-        background: linear-gradient(135deg, #2C3E50 0%, #34495E 100%);
-        color: white;
-        border-radius: 10px;
-        padding: 1rem;
-    }
-    
-    /* Improve spinner */
-    .stSpinner {
-        color: #4ECDC4;
-    }
-    
-    /* Text styling for better readability */
-    .info-box h3, .info-box h4 {
-        color: white !important;
-        font-weight: 700;
-    }
-    
-    .info-box p, .info-box li {
-        color: white !important;
-        font-weight: 500;
-        line-height: 1.6;
-    }
-    
-    .success-box h4, .success-box p {
-        color: white !important;
-        font-weight: 600;
-    }
-    
-    .warning-box h4, .warning-box p {
-        color: white !important;
-        font-weight: 600;
-    }
-    
-    .metric-container h4, .metric-container h2, .metric-container h3 {
-        color: white !important;
-        font-weight: 700;
-    }
-    
-    .metric-card h3, .metric-card h2, .metric-card h4 {
-        color: white !important;
-        font-weight: 700;
-    }
-    
-    /* Sidebar text styling */
-    .css-1d391kg h2, .css-1d391kg h3, .css-1d391kg h4 {
-        color: white !important;
-        font-weight: 700;
-    }
-    
-    .css-1d391kg p, .css-1d391kg li {
-        color: #E8F8F5 !important;
-        font-weight: 500;
-    }
-    
-    /* General text styling for better visibility */
-    .stApp .stMarkdown {
-        color: white !important;
-    }
-    
-    .stApp .stMarkdown p {
-        color: white !important;
-        font-weight: 500 !important;
-    }
-    
-    .stApp .stMarkdown h1, .stApp .stMarkdown h2, .stApp .stMarkdown h3 {
-        color: white !important;
-        font-weight: 700 !important;
-    }
-    
-    /* Streamlit text elements */
-    .stText {
-        color: white !important;
-    }
-    
-    .stTextInput > div > div > input {
-        color: #2C3E50 !important;
-        background: white !important;
-    }
-    
-    /* File uploader specific styling */
-    .stFileUploader > div {
-        background: transparent !important;
-    }
-    
-    .stFileUploader .uploadedFile {
-        color: white !important;
-        background: rgba(255,255,255,0.1) !important;
-        border-radius: 10px !important;
-        padding: 1rem !important;
-        margin: 0.5rem 0 !important;
-    }
-    
-    /* ============================================================================
-       RESPONSIVE DESIGN UNTUK MOBILE
-       ============================================================================ */
-    
-    /* Mobile devices (max-width: 768px) */
-    @media (max-width: 768px) {
-        /* Header utama - perbesar font untuk mobile */
-        .main-header {
-            font-size: 2rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Sub header */
-        .sub-header {
-            font-size: 1.3rem !important;
-            margin-top: 1rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Container utama - kurangi padding untuk mobile */
-        .main .block-container {
-            padding: 1rem !important;
-            margin: 0.5rem !important;
-            border-radius: 15px !important;
-        }
-        
-        /* Info box - perbesar padding dan font */
-        .info-box,
-        .success-box,
-        .warning-box {
-            padding: 1rem !important;
-            margin: 0.75rem 0 !important;
-            font-size: 0.95rem !important;
-        }
-        
-        .info-box h3,
-        .info-box h4,
-        .success-box h4,
-        .warning-box h4 {
-            font-size: 1.1rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        .info-box p,
-        .info-box li,
-        .success-box p,
-        .warning-box p {
-            font-size: 0.9rem !important;
-            line-height: 1.5 !important;
-        }
-        
-        /* Metric cards - full width di mobile */
-        .metric-card {
-            padding: 1.5rem !important;
-            margin: 0.75rem 0 !important;
-        }
-        
-        .metric-card h3 {
-            font-size: 1.2rem !important;
-        }
-        
-        .metric-card h2 {
-            font-size: 1.8rem !important;
-        }
-        
-        .metric-container {
-            padding: 0.75rem !important;
-            margin: 0.5rem 0 !important;
-        }
-        
-        .metric-container h4 {
-            font-size: 0.95rem !important;
-        }
-        
-        .metric-container h2 {
-            font-size: 1.5rem !important;
-        }
-        
-        .metric-container h3 {
-            font-size: 1.2rem !important;
-        }
-        
-        /* Prediction result - perbesar font untuk mobile */
-        .prediction-result {
-            padding: 1.5rem !important;
-            margin: 0.75rem 0 !important;
-        }
-        
-        .prediction-result h2 {
-            font-size: 1.5rem !important;
-        }
-        
-        .prediction-result h3 {
-            font-size: 1.2rem !important;
-        }
-        
-        .prediction-result p {
-            font-size: 0.9rem !important;
-        }
-        
-        /* Upload area - perbesar untuk touch target */
-        .stFileUploader > div > div {
-            padding: 1.5rem !important;
-        }
-        
-        /* Sidebar - overlay style di mobile untuk responsif */
-        section[data-testid="stSidebar"] {
-            position: fixed !important;
-            z-index: 999 !important;
-            width: 85% !important;
-            max-width: 300px !important;
-            height: 100vh !important;
-            top: 0 !important;
-            left: 0 !important;
-            box-shadow: 4px 0 30px rgba(0, 0, 0, 0.5) !important;
-            transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        }
-        
-        /* Sidebar tertutup di mobile - benar-benar tidak terlihat */
-        section[data-testid="stSidebar"][aria-hidden="true"] {
-            display: none !important;
-            visibility: hidden !important;
-            width: 0px !important;
-            min-width: 0px !important;
-            max-width: 0px !important;
-            height: 0px !important;
-            opacity: 0 !important;
-            transform: translateX(-100%) !important;
-            overflow: hidden !important;
-            margin: 0 !important;
-            padding: 0 !important;
-            border: none !important;
-            box-shadow: none !important;
-            position: fixed !important;
-            left: -9999px !important;
-            top: -9999px !important;
-            z-index: -1 !important;
-        }
-        
-        /* Pastikan elemen dalam sidebar tersembunyi */
-        section[data-testid="stSidebar"][aria-hidden="true"] *,
-        section[data-testid="stSidebar"][aria-hidden="true"] .css-1d391kg,
-        section[data-testid="stSidebar"][aria-hidden="true"] .element-container,
-        section[data-testid="stSidebar"][aria-hidden="true"] > div,
-        section[data-testid="stSidebar"][aria-hidden="true"] > * {
-            display: none !important;
-            visibility: hidden !important;
-            opacity: 0 !important;
-            width: 0 !important;
-            height: 0 !important;
-            margin: 0 !important;
-            padding: 0 !important;
-        }
-        
-        /* Sidebar terbuka di mobile */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"]) {
-            transform: translateX(0) !important;
-        }
-        
-        /* Backdrop overlay saat sidebar terbuka di mobile */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"])::before {
-            content: '';
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100vw;
-            height: 100vh;
-            background: rgba(0, 0, 0, 0.5);
-            z-index: 998;
-            pointer-events: auto;
-        }
-        
-        /* Sidebar styling di mobile */
-        .css-1d391kg {
-            width: 85% !important;
-            max-width: 300px !important;
-        }
-        
-        /* Main content saat sidebar terbuka di mobile */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"]) ~ .main {
-            margin-left: 0 !important;
-            filter: blur(0) !important;
-        }
-        
-        /* Tombol close sidebar di mobile - tetap di pojok kiri */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"]) button[data-testid="baseButton-header"] {
-            position: absolute !important;
-            z-index: 10001 !important;
-            top: 50% !important;
-            left: 0 !important;
-            transform: translateY(-50%) !important;
-            background: rgba(78, 205, 196, 0.9) !important;
-            margin: 0 !important;
-            padding-left: 0.25rem !important;
-        }
-        
-        /* Tombol toggle sidebar - pastikan tetap terlihat dan cukup besar untuk mobile */
-        button[data-testid="baseButton-header"] {
-            position: absolute !important;
-            left: 0 !important;
-            top: 50% !important;
-            transform: translateY(-50%) !important;
-            min-width: 50px !important;
-            min-height: 50px !important;
-            padding: 0.75rem !important;
-            border-width: 2px !important;
-            animation: pulseGlow 2.5s ease-in-out infinite !important;
-            margin: 0 !important;
-            padding-left: 0.25rem !important;
-            z-index: 10000 !important;
-        }
-        
-        button[data-testid="baseButton-header"]:hover {
-            transform: translateY(-50%) scale(1.1) !important;
-            left: 0 !important;
-        }
-        
-        button[data-testid="baseButton-header"]:active {
-            transform: translateY(-50%) scale(1.05) !important;
-            left: 0 !important;
-        }
-        
-        button[data-testid="baseButton-header"] svg {
-            width: 28px !important;
-            height: 28px !important;
-        }
-        
-        button[data-testid="baseButton-header"]:hover svg {
-            transform: rotate(90deg) scale(1.05) !important;
-        }
-        
-        /* Sidebar text lebih kecil di mobile */
-        section[data-testid="stSidebar"] h2 {
-            font-size: 1.1rem !important;
-        }
-        
-        section[data-testid="stSidebar"] h3 {
-            font-size: 0.95rem !important;
-        }
-        
-        section[data-testid="stSidebar"] h4 {
-            font-size: 0.9rem !important;
-        }
-        
-        .css-1d391kg h2 {
-            font-size: 1.1rem !important;
-        }
-        
-        .css-1d391kg h3 {
-            font-size: 1rem !important;
-        }
-        
-        .css-1d391kg h4 {
-            font-size: 0.9rem !important;
-        }
-        
-        .css-1d391kg p {
-            font-size: 0.85rem !important;
-        }
-        
-        /* Sidebar padding lebih kecil */
-        section[data-testid="stSidebar"] .element-container {
-            padding: 0.5rem 0.25rem !important;
-        }
-        
-        .css-1d391kg .element-container {
-            padding: 0.5rem 0.25rem !important;
-        }
-        
-        /* Tab styling untuk mobile */
-        .stTabs [data-baseweb="tab-list"] {
-            padding: 0.25rem !important;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            font-size: 0.85rem !important;
-            padding: 0.5rem 0.75rem !important;
-        }
-        
-        /* Button - perbesar untuk mobile touch */
-        .stButton > button {
-            padding: 0.75rem 1.5rem !important;
-            font-size: 1rem !important;
-            min-height: 44px !important; /* Minimum touch target size */
-        }
-        
-        /* Footer */
-        .footer-box {
-            padding: 1.5rem !important;
-            margin-top: 1rem !important;
-        }
-        
-        .footer-box h3 {
-            font-size: 1.3rem !important;
-        }
-        
-        .footer-box p {
-            font-size: 0.9rem !important;
-        }
-        
-        /* Text umum - perbesar untuk readability */
-        .stApp .stMarkdown {
-            font-size: 0.95rem !important;
-        }
-        
-        .stApp .stMarkdown h1 {
-            font-size: 1.8rem !important;
-        }
-        
-        .stApp .stMarkdown h2 {
-            font-size: 1.4rem !important;
-        }
-        
-        .stApp .stMarkdown h3 {
-            font-size: 1.2rem !important;
-        }
-        
-        /* Radio buttons - perbesar spacing */
-        .stRadio > div {
-            gap: 0.5rem !important;
-        }
-        
-        .stRadio label {
-            font-size: 1rem !important;
-            padding: 0.75rem !important;
-        }
-        
-        /* File uploader label */
-        .stFileUploader label {
-            font-size: 1rem !important;
-        }
-        
-        /* Image display */
-        .stImage img {
-            border-radius: 10px !important;
-        }
-        
-        /* Code blocks */
-        .stCode {
-            padding: 0.75rem !important;
-            font-size: 0.85rem !important;
-            overflow-x: auto !important;
-        }
-        
-        /* Heatmap caption */
-        .stImage > div > div {
-            font-size: 0.85rem !important;
-        }
-        
-        /* Spinner text */
-        .stSpinner > div {
-            font-size: 1rem !important;
-        }
-        
-        /* Tables - scroll horizontal di mobile */
-        .stDataFrame,
-        table {
-            overflow-x: auto !important;
-            display: block !important;
-            width: 100% !important;
-        }
-        
-        /* Charts - full width di mobile */
-        .stPyplot {
-            width: 100% !important;
-        }
-        
-        /* Input fields - perbesar di mobile */
-        .stTextInput > div > div > input,
-        .stTextArea > div > div > textarea {
-            font-size: 16px !important; /* Prevent zoom on iOS */
-            padding: 0.75rem !important;
-        }
-        
-        /* Selectbox dan dropdown */
-        .stSelectbox > div > div {
-            font-size: 1rem !important;
-        }
-        
-        /* Camera input */
-        .stCameraInput {
-            width: 100% !important;
-        }
-        
-        /* Image containers */
-        [data-testid="stImage"] {
-            width: 100% !important;
-        }
-        
-        /* Metric display - stack vertically */
-        .element-container [data-testid="metric-container"] {
-            margin: 0.5rem 0 !important;
-        }
-    }
-    
-    /* Small mobile devices (max-width: 480px) */
-    @media (max-width: 480px) {
-        .main-header {
-            font-size: 1.5rem !important;
-        }
-        
-        .sub-header {
-            font-size: 1.1rem !important;
-        }
-        
-        .main .block-container {
-            padding: 0.75rem !important;
-            margin: 0.25rem !important;
-        }
-        
-        .metric-card {
-            padding: 1rem !important;
-        }
-        
-        .prediction-result {
-            padding: 1rem !important;
-        }
-        
-        .prediction-result h2 {
-            font-size: 1.2rem !important;
-        }
-        
-        .info-box,
-        .success-box,
-        .warning-box {
-            padding: 0.75rem !important;
-        }
-        
-        /* Sidebar - full width di mobile kecil */
-        section[data-testid="stSidebar"] {
-            width: 85% !important;
-            max-width: 280px !important;
-            font-size: 0.9rem !important;
-        }
-        
-        section[data-testid="stSidebar"] p {
-            font-size: 0.85rem !important;
-            line-height: 1.4 !important;
-        }
-        
-        section[data-testid="stSidebar"] .stButton > button {
-            font-size: 0.9rem !important;
-            padding: 0.5rem 0.75rem !important;
-        }
-        
-        section[data-testid="stSidebar"] [data-testid="column"] {
-            min-width: 48% !important;
-            padding: 0.25rem !important;
-        }
-        
-        section[data-testid="stSidebar"] .metric-container {
-            padding: 0.5rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        section[data-testid="stSidebar"] .metric-container h2,
-        section[data-testid="stSidebar"] .metric-container h3,
-        section[data-testid="stSidebar"] .metric-container h4 {
-            margin: 0.25rem 0 !important;
-        }
-        
-        section[data-testid="stSidebar"] .stColumns {
-            gap: 0.5rem !important;
-        }
-        
-        .css-1d391kg {
-            width: 85% !important;
-            max-width: 280px !important;
-        }
-        
-        /* Column layout - stack vertically di mobile kecil */
-        .stColumns > div {
-            width: 100% !important;
-            margin-bottom: 1rem !important;
-        }
-        
-        /* Force columns to stack pada mobile */
-        [data-testid="column"] {
-            min-width: 100% !important;
-            width: 100% !important;
-        }
-        
-        /* Radio button horizontal menjadi vertical di mobile */
-        [data-testid="stHorizontalBlock"] {
-            flex-direction: column !important;
-        }
-        
-        [data-testid="stHorizontalBlock"] > div {
-            width: 100% !important;
-            margin-bottom: 0.5rem !important;
-        }
-    }
-    
-    /* Tablet devices (min-width: 481px, max-width: 1024px) */
-    @media (min-width: 481px) and (max-width: 1024px) {
-        .main-header {
-            font-size: 2.5rem !important;
-        }
-        
-        .sub-header {
-            font-size: 1.5rem !important;
-        }
-        
-        .main .block-container {
-            padding: 1.5rem !important;
-            margin: 0.75rem !important;
-        }
-        
-        /* Sidebar - overlay style untuk tablet juga */
-        section[data-testid="stSidebar"] {
-            position: fixed !important;
-            z-index: 999 !important;
-            width: 70% !important;
-            max-width: 350px !important;
-            height: 100vh !important;
-            box-shadow: 4px 0 30px rgba(0, 0, 0, 0.5) !important;
-        }
-        
-        /* Sidebar tertutup di tablet */
-        section[data-testid="stSidebar"][aria-hidden="true"] {
-            transform: translateX(-100%) !important;
-        }
-        
-        /* Backdrop overlay untuk tablet */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"])::before {
-            content: '';
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100vw;
-            height: 100vh;
-            background: rgba(0, 0, 0, 0.4);
-            z-index: 998;
-            pointer-events: auto;
-        }
-        
-        .css-1d391kg {
-            width: 70% !important;
-            max-width: 350px !important;
-        }
-    }
-    
-    /* Desktop - pastikan sidebar tidak overlay (normal behavior) */
-    @media (min-width: 1025px) {
-        section[data-testid="stSidebar"] {
-            position: relative !important;
-            height: auto !important;
-        }
-        
-        /* Desktop - sidebar terbuka */
-        section[data-testid="stSidebar"]:not([aria-hidden="true"]) {
-            transform: none !important;
-            width: auto !important;
-            opacity: 1 !important;
-            visibility: visible !important;
-            display: block !important;
-        }
-        
-        /* Desktop - sidebar tertutup benar-benar tidak terlihat */
-        section[data-testid="stSidebar"][aria-hidden="true"] {
-            display: none !important;
-            visibility: hidden !important;
-            width: 0px !important;
-            min-width: 0px !important;
-            max-width: 0px !important;
-            height: 0px !important;
-            opacity: 0 !important;
-            transform: translateX(-100%) !important;
-            overflow: hidden !important;
-            margin: 0 !important;
-            padding: 0 !important;
-            border: none !important;
-            box-shadow: none !important;
-            position: fixed !important;
-            left: -9999px !important;
-            top: -9999px !important;
-            z-index: -1 !important;
-        }
-        
-        /* Pastikan elemen dalam sidebar tersembunyi */
-        section[data-testid="stSidebar"][aria-hidden="true"] *,
-        section[data-testid="stSidebar"][aria-hidden="true"] .css-1d391kg,
-        section[data-testid="stSidebar"][aria-hidden="true"] .element-container,
-        section[data-testid="stSidebar"][aria-hidden="true"] > div,
-        section[data-testid="stSidebar"][aria-hidden="true"] > * {
-            display: none !important;
-            visibility: hidden !important;
-            opacity: 0 !important;
-            width: 0 !important;
-            height: 0 !important;
-            margin: 0 !important;
-            padding: 0 !important;
-        }
-        
-        section[data-testid="stSidebar"]:not([aria-hidden="true"])::before {
-            display: none !important;
-        }
-    }
-    
-    /* Touch-friendly improvements untuk semua mobile */
-    @media (hover: none) and (pointer: coarse) {
-        /* Perbesar semua clickable elements */
-        .stButton > button,
-        .stFileUploader button,
-        .stRadio label,
-        .stCheckbox label {
-            min-height: 44px !important;
-            min-width: 44px !important;
-        }
-        
-        /* Hapus hover effects di touch devices */
-        .stButton > button:hover,
-        .stFileUploader button:hover {
-            transform: none !important;
-        }
-    }
-    
-    /* ============================================================================
-       STYLING EXPANDER UNTUK TOGGLE BUTTON
-       ============================================================================ */
-    
-    /* Expander header - make it more clickable and visible */
-    [data-baseweb="accordion"] {
-        background: transparent !important;
-    }
-    
-    /* Expander button/toggle area */
-    [data-baseweb="accordion"] button {
-        background: linear-gradient(135deg, #2C3E50 0%, #34495E 100%) !important;
-        color: white !important;
-        border: 2px solid #4ECDC4 !important;
-        border-radius: 10px !important;
-        padding: 1rem !important;
-        width: 100% !important;
-        cursor: pointer !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    [data-baseweb="accordion"] button:hover {
-        background: linear-gradient(135deg, #34495E 0%, #2C3E50 100%) !important;
-        border-color: #4ECDC4 !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 4px 8px rgba(78, 205, 196, 0.3) !important;
-    }
-    
-    /* Expander icon (arrow) */
-    [data-baseweb="accordion"] svg {
-        color: #4ECDC4 !important;
-        fill: #4ECDC4 !important;
-    }
-    
-    /* Expander content area */
-    [data-baseweb="accordion"] > div[aria-expanded="true"] {
-        background: transparent !important;
-        padding: 0.5rem 0 !important;
-    }
-    
-    /* Make sure expander is clickable */
-    [data-baseweb="accordion"] button,
-    [data-baseweb="accordion"] button > div {
-        pointer-events: auto !important;
-        cursor: pointer !important;
-        z-index: 10 !important;
-        position: relative !important;
-    }
-    
-    /* Sidebar expander specific styling */
-    .css-1d391kg [data-baseweb="accordion"] button {
-        margin-bottom: 0.5rem !important;
-    }
-    
-    /* Ensure expander content is visible */
-    [data-baseweb="accordion"] > div {
-        overflow: visible !important;
-    }
-    
-    /* Fix for sidebar expander - ensure it works */
-    section[data-testid="stSidebar"] [data-baseweb="accordion"] {
-        margin-bottom: 1rem !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-baseweb="accordion"] button {
-        display: flex !important;
-        align-items: center !important;
-        justify-content: space-between !important;
-    }
-    
-    /* Make expander text clearly visible */
-    [data-baseweb="accordion"] button span {
-        color: white !important;
-        font-weight: 600 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-# ==============================================================================
-# BAGIAN 1.2: MEMUAT METRIK DAN MODEL (LOKAL)
-# ==============================================================================
-
-@st.cache_data
-def load_model_metrics():
-    """
-    Memuat metrik model dari file JSON.
-    """
-    if os.path.exists(MODEL_METRICS_FILE):
-        try:
-            with open(MODEL_METRICS_FILE, 'r', encoding='utf-8') as f:
-                metrics = json.load(f)
-            
-            # Debug: Tampilkan struktur JSON untuk troubleshooting
-            if metrics:
-                # Pastikan struktur yang diharapkan ada
-                for model in ['vgg16', 'mobilenetv2']:
-                    if model not in metrics:
-                        metrics[model] = {}
-                    if not isinstance(metrics[model], dict):
-                        continue
-                    
-                    # Mapping key yang mungkin berbeda di JSON
-                    # Beberapa JSON menggunakan 'test_accuracy' bukan 'accuracy'
-                    if 'test_accuracy' in metrics[model] and 'accuracy' not in metrics[model]:
-                        metrics[model]['accuracy'] = metrics[model]['test_accuracy']
-                    
-                    # Mapping path yang mungkin berbeda
-                    # Beberapa JSON menggunakan 'plot_path' bukan 'accuracy_loss_plot_path'
-                    path_mapping = {
-                        'plot_path': 'accuracy_loss_plot_path',
-                        'cm_path': 'confusion_matrix_plot_path',
-                        'report_path': 'classification_report_path'
-                    }
-                    for old_key, new_key in path_mapping.items():
-                        if old_key in metrics[model] and new_key not in metrics[model]:
-                            metrics[model][new_key] = metrics[model][old_key]
-                    
-                    # --- PERBAIKAN PATH GAMBAR & LAPORAN ---
-                    # Path di JSON mungkin relatif atau path Kaggle (misal: "/kaggle/working/model_results/...")
-                    # Kita perlu menggabungkannya dengan BASE_DIR atau mencari file lokal
-                    for key in ['accuracy_loss_plot_path', 'confusion_matrix_plot_path', 'classification_report_path']:
-                        if key in metrics[model] and metrics[model][key]:
-                            # Menggabungkan BASE_DIR dengan path relatif dari JSON
-                            relative_path = metrics[model][key]
-                            # Pastikan path adalah string, bukan None
-                            if isinstance(relative_path, str):
-                                # Handle path Kaggle (misal: "/kaggle/working/model_results/...")
-                                if relative_path.startswith('/kaggle/working/'):
-                                    # Extract filename dari path Kaggle
-                                    filename = os.path.basename(relative_path)
-                                    # Cari file dengan berbagai variasi nama
-                                    possible_names = [
-                                        filename,
-                                        filename.replace('VGG16', 'vgg16').replace('MobileNetV2', 'mobilenetv2'),
-                                        filename.replace('vgg16', 'VGG16').replace('mobilenetv2', 'MobileNetV2'),
-                                    ]
-                                    # Tambahkan pattern berdasarkan key
-                                    if key == 'accuracy_loss_plot_path':
-                                        model_name_capital = 'VGG16' if model == 'vgg16' else 'MobileNetV2'
-                                        possible_names.extend([
-                                            f"{model_name_capital}_accuracy_loss.png",
-                                            f"{model}_accuracy_loss.png",
-                                            f"{model_name_capital}_training_history.png",
-                                            f"{model}_training_history.png",
-                                        ])
-                                    elif key == 'confusion_matrix_plot_path':
-                                        model_name_capital = 'VGG16' if model == 'vgg16' else 'MobileNetV2'
-                                        possible_names.extend([
-                                            f"{model_name_capital}_confusion_matrix.png",
-                                            f"{model}_confusion_matrix.png",
-                                            f"{model_name_capital}_cm.png",
-                                            f"{model}_cm.png",
-                                        ])
-                                    elif key == 'classification_report_path':
-                                        model_name_capital = 'VGG16' if model == 'vgg16' else 'MobileNetV2'
-                                        possible_names.extend([
-                                            f"{model_name_capital}_classification_report.txt",
-                                            f"{model}_classification_report.txt",
-                                            f"{model_name_capital}_report.txt",
-                                            f"{model}_report.txt",
-                                        ])
-                                    
-                                    found = False
-                                    for name in possible_names:
-                                        if name:
-                                            alt_path = os.path.join(MODEL_RESULTS_DIR, name)
-                                            if os.path.exists(alt_path):
-                                                metrics[model][key] = alt_path
-                                                found = True
-                                                break
-                                    if not found:
-                                        metrics[model][key] = None
-                                else:
-                                    # Path relatif biasa
-                                    absolute_path = os.path.join(BASE_DIR, relative_path)
-                                    
-                                    # Simpan path absolut kembali ke dict
-                                    if os.path.exists(absolute_path):
-                                        metrics[model][key] = absolute_path
-                                    else:
-                                        # Coba mencari file dengan pattern yang mungkin
-                                        filename = os.path.basename(relative_path)
-                                        possible_names = [
-                                            filename,
-                                            filename.replace('VGG16', 'vgg16').replace('MobileNetV2', 'mobilenetv2'),
-                                            filename.replace('vgg16', 'VGG16').replace('mobilenetv2', 'MobileNetV2'),
-                                        ]
-                                        found = False
-                                        for name in possible_names:
-                                            if name:
-                                                alt_path = os.path.join(MODEL_RESULTS_DIR, name)
-                                                if os.path.exists(alt_path):
-                                                    metrics[model][key] = alt_path
-                                                    found = True
-                                                    break
-                                        if not found:
-                                            metrics[model][key] = None
-                        else:
-                            # Jika key tidak ada, coba mencari file dengan pattern default
-                            model_name_capital = 'VGG16' if model == 'vgg16' else 'MobileNetV2'
-                            possible_patterns = {
-                                'accuracy_loss_plot_path': [
-                                    f"{model_name_capital}_accuracy_loss.png",
-                                    f"{model}_accuracy_loss.png",
-                                    f"{model_name_capital}_training_history.png",
-                                    f"{model}_training_history.png"
-                                ],
-                                'confusion_matrix_plot_path': [
-                                    f"{model_name_capital}_confusion_matrix.png",
-                                    f"{model}_confusion_matrix.png",
-                                    f"{model_name_capital}_cm.png",
-                                    f"{model}_cm.png"
-                                ],
-                                'classification_report_path': [
-                                    f"{model_name_capital}_classification_report.txt",
-                                    f"{model}_classification_report.txt",
-                                    f"{model_name_capital}_report.txt",
-                                    f"{model}_report.txt"
-                                ]
-                            }
-                            if key in possible_patterns:
-                                for pattern in possible_patterns[key]:
-                                    alt_path = os.path.join(MODEL_RESULTS_DIR, pattern)
-                                    if os.path.exists(alt_path):
-                                        metrics[model][key] = alt_path
-                                        break
-                                else:
-                                    if key not in metrics[model]:
-                                        metrics[model][key] = None
-            
-            return metrics
-            
-        except json.JSONDecodeError as e:
-            st.error(f"Error parsing JSON dari '{MODEL_METRICS_FILE}'. File mungkin corrupt. Error: {e}")
-            return None
-        except Exception as e:
-            st.error(f"Gagal memuat metrik model dari '{MODEL_METRICS_FILE}'. Error: {e}")
-            return None
-    else:
-        st.warning(f"⚠ File metrik model '{MODEL_METRICS_FILE}' tidak ditemukan. Pastikan file ada di lokasi tersebut.")
-        return None
-
-# Muat metrik model
-model_performance_metrics = load_model_metrics()
-
-@st.cache_resource
-def load_models():
-    """
-    Memuat model VGG16 dan MobileNetV2 dari file .h5 atau .keras.
-    """
-    model_vgg16 = None
-    model_mobilenetv2 = None
-
-    # Fix untuk compatibility issues dengan TensorFlow/Keras versi berbeda
-    
-    # 1. InputLayer compatibility - handle batch_shape untuk TensorFlow 2.15
-    # Model dibuat dengan batch_shape, tapi TF 2.15 tidak support
-    # Perlu custom InputLayer yang benar-benar compatible
-    class CompatibleInputLayer(tf.keras.layers.InputLayer):
-        """Custom InputLayer yang handle batch_shape dengan benar"""
-        @classmethod
-        def from_config(cls, config):
-            """Override from_config untuk handle batch_shape"""
-            # Convert batch_shape ke input_shape jika ada
-            if 'batch_shape' in config:
-                batch_shape = config.pop('batch_shape')
-                if batch_shape and len(batch_shape) > 1:
-                    # Skip batch dimension, ambil [H, W, C]
-                    config['input_shape'] = tuple(batch_shape[1:])
-            return super().from_config(config)
-    
-    # 2. DTypePolicy compatibility - handle Keras 3.x dtype policy
-    # Keras 3.x menggunakan DTypePolicy, TensorFlow 2.x menggunakan string langsung
-    class DTypePolicyCompat:
-        """Compatible DTypePolicy untuk handle Keras 3.x model di TensorFlow 2.x"""
-        def __init__(self, name='float32', *args, **kwargs):
-            if isinstance(name, str):
-                self.name = name
-            elif hasattr(name, 'name'):
-                self.name = name.name
-            else:
-                self.name = 'float32'
-            # Tambahkan attribute yang dibutuhkan TensorFlow
-            self.compute_dtype = self.name
-            self.variable_dtype = self.name
-        
-        @property
-        def dtype(self):
-            """Return dtype sebagai string"""
-            return self.name
-        
-        @classmethod
-        def from_config(cls, config):
-            """Dari config Keras 3.x"""
-            if isinstance(config, dict):
-                name = config.get('name', 'float32')
-            else:
-                name = 'float32'
-            return cls(name=name)
-        
-        def get_config(self):
-            return {'name': self.name}
-        
-        def __call__(self, dtype=None):
-            """Callable untuk compatibility"""
-            return self.name
-    
-    # Try import dari keras jika ada
-    try:
-        from keras import DTypePolicy
-        # Gunakan wrapper yang compatible
-        DTypePolicyClass = DTypePolicyCompat
-    except ImportError:
-        DTypePolicyClass = DTypePolicyCompat
-    
-    # Custom objects untuk load model dengan compatibility fixes
-    # PERBAIKAN: Gunakan CompatibleInputLayer yang handle batch_shape di from_config
-    # Ini lebih aman karena hanya override from_config, bukan __init__
-    custom_objects = {
-        'InputLayer': CompatibleInputLayer,
-        'DTypePolicy': DTypePolicyClass,
+    # Custom objects untuk load model dengan compatibility fixes
+    # PERBAIKAN: Gunakan CompatibleInputLayer yang handle batch_shape di from_config
+    # Ini lebih aman karena hanya override from_config, bukan __init__
+    custom_objects = {
+        'InputLayer': CompatibleInputLayer,
+        'DTypePolicy': DTypePolicyClass,
     }
     
     # Muat VGG16
@@ -1973,8 +521,23 @@ def load_models():
         
     return model_vgg16, model_mobilenetv2
 
+@st.cache_resource
+def load_remote_models(api_url):
+    """
+    Mode client: model dijalankan di layanan FastAPI, UI hanya memegang client HTTP (connection pool bersama).
+    """
+    from inference_client import load_remote_models as connect_remote_models
+    try:
+        return connect_remote_models(api_url)
+    except Exception as e:
+        st.error(f"Gagal terhubung ke layanan inferensi '{api_url}'. Error: {e}")
+        return None, None
+
 # Muat model
-model_vgg16, model_mobilenetv2 = load_models()
+if INFERENCE_API_URL:
+    model_vgg16, model_mobilenetv2 = load_remote_models(INFERENCE_API_URL)
+else:
+    model_vgg16, model_mobilenetv2 = load_models()
 
 
 # ==============================================================================
@@ -1989,21 +552,6 @@ with st.sidebar:
 # Threshold diubah menjadi 80% untuk mengkategorikan confidence sebagai "tinggi"
 confidence_threshold = 80 
 
-# Konfigurasi Gemini API Key
-try:
-    import importlib
-    if GEMINI_AVAILABLE:
-        importlib.reload(genai) if 'genai' in globals() and genai is not None else None
-    else:
-        raise ImportError("Library tidak tersedia")
-except Exception:
-    try:
-        import google.generativeai as genai  # type: ignore
-        globals()['genai'] = genai
-        globals()['GEMINI_AVAILABLE'] = True
-    except ImportError:
-        pass
-
 # Gunakan nilai kosong (tidak ada input dari user)
 gemini_api_key_input = ""
 
@@ -2029,37 +577,63 @@ def preprocess_image(img):
     Konversi RGBA ke RGB jika diperlukan.
     """
     try:
-        # --- PERBAIKAN ERROR PNG 4-CHANNEL ---
-        # Konversi RGBA/LA/P ke RGB dengan background putih untuk transparansi
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Buat background putih untuk transparansi
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        img = img.resize((IMG_HEIGHT, IMG_WIDTH))
-        img_array = image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0)
-        img_array = img_array / 255.0  # Normalisasi
-        return img_array
+        # Konversi RGBA/LA/P ke RGB (latar putih), resize sesuai PREPROCESS_RESIZE / PREPROCESS_FILTER
+        return to_model_input(img, IMG_WIDTH, IMG_HEIGHT)
     except Exception as e:
         # st.error(f"Error saat pre-processing gambar: {e}") # Dihapus
         return None
 
+def model_scores(model, img_array):
+    """
+    Skor softmax (np.ndarray [3]) untuk satu gambar.
+    Model lokal (Keras) dijalankan langsung; model remote (mode client) meminta skor ke layanan FastAPI.
+    """
+    if hasattr(model, "predict_scores"):
+        return model.predict_scores(img_array)
+    predictions = model.predict(img_array, verbose=0)
+    # Softmax NumPy (setara tf.nn.softmax) agar jalur ini tidak butuh modul TensorFlow
+    return softmax(predictions)[0]
+
+@st.cache_resource
+def get_gemini_latency_histogram():
+    """
+    Histogram latensi round trip Gemini, dibuat sekali per proses (bukan per rerun) agar tidak terdaftar ganda.
+    Diekspos di http://<host>:UI_METRICS_PORT/metrics jika env tersebut di-set.
+    """
+    from metrics import Histogram, start_http_server
+    histogram = Histogram("dragonfruit_gemini_latency_seconds",
+                          "Latensi round trip deteksi Gemini (TAHAP 1) per hasil (ok / error)", ["outcome"])
+    if UI_METRICS_PORT:
+        try:
+            start_http_server(UI_METRICS_PORT)
+        except OSError as e:
+            print(f"⚠️ Exporter metrik UI tidak dapat dijalankan di port {UI_METRICS_PORT}: {e}")
+    return histogram
+
+# Diambil di thread script (cache_resource), lalu dipakai juga oleh thread executor Gemini
+GEMINI_LATENCY = get_gemini_latency_histogram()
+
 def is_dragon_fruit_gemini(img_pil, api_key, demo_mode=False):
     """
     TAHAP 1: Deteksi apakah gambar adalah buah naga atau bukan menggunakan Gemini Vision API.
     Ini adalah metode PINTAR yang menggunakan AI Vision untuk menganalisis gambar secara visual.
     Mengembalikan (is_dragon_fruit: bool, confidence: float, reason: str)
     """
+    start = time.perf_counter()
+    result = detect_with_gemini(img_pil, api_key, demo_mode)
+    # Panggilan yang melewati GEMINI_DEADLINE_SECONDS tetap tercatat saat selesai di background
+    GEMINI_LATENCY.observe(time.perf_counter() - start, outcome="ok" if result[0] is not None else "error")
+    return result
+
+def detect_with_gemini(img_pil, api_key, demo_mode=False):
+    """Panggilan Gemini Vision API untuk is_dragon_fruit_gemini (tanpa pencatatan latensi)"""
     try:
         if not GEMINI_AVAILABLE:
             return None, 0.0, "Library google-generativeai tidak tersedia. Install dengan: pip install google-generativeai"
         
+        # Lazy import - library Gemini hanya dimuat saat deteksi pertama kali dijalankan
+        import google.generativeai as genai  # type: ignore
+        
         # Setup Gemini menggunakan konfigurasi dari config_gemini.py
         genai.configure(api_key=api_key)
         
@@ -2125,15 +699,14 @@ def is_dragon_fruit_gemini(img_pil, api_key, demo_mode=False):
         # Fallback jika error
         return None, 0.0, f"Error API: {str(e)}"
 
-def is_dragon_fruit_fallback(model, img_array, demo_mode=False):
+def is_dragon_fruit_fallback(model, img_array, demo_mode=False, scores=None):
     """
     FALLBACK: Deteksi menggunakan analisis distribusi probabilitas dari model CNN.
-    Digunakan jika Gemini API tidak tersedia atau error.
+    Digunakan jika Gemini API tidak tersedia, error, atau melewati GEMINI_DEADLINE_SECONDS.
+    scores: skor model yang sudah dihitung (opsional), agar model tidak dijalankan dua kali.
     """
     try:
-        predictions = model.predict(img_array, verbose=0)
-        scores = tf.nn.softmax(predictions[0])
-        scores_numpy = scores.numpy()
+        scores_numpy = model_scores(model, img_array) if scores is None else scores
         
         # Analisis sederhana
         max_confidence = np.max(scores_numpy) * 100
@@ -2175,17 +748,16 @@ def is_dragon_fruit(img_pil, api_key=None, model=None, demo_mode=False):
     except Exception as e:
         return False, 0.0, f"Error: {str(e)}"
 
-def predict_image_local(model, img_array, demo_mode=False, confidence_threshold=80):
+def predict_image_local(model, img_array, demo_mode=False, confidence_threshold=80, scores=None):
     """
     TAHAP 2: Klasifikasi kematangan buah naga (hanya dipanggil jika sudah terkonfirmasi buah naga).
     MENGGUNAKAN OUTPUT LANGSUNG DARI MODEL .h5 TANPA MODIFIKASI.
+    scores: skor model yang sudah dihitung (opsional, dari inferensi yang berjalan bersamaan dengan Gemini).
     Mengembalikan (nama_kelas, confidence, scores)
     """
     try:
         # Prediksi langsung dari model
-        predictions = model.predict(img_array, verbose=0)
-        scores = tf.nn.softmax(predictions[0])
-        scores_numpy = scores.numpy()
+        scores_numpy = model_scores(model, img_array) if scores is None else scores
         
         # Ambil prediksi kelas dengan confidence tertinggi (LANGSUNG DARI MODEL)
         predicted_class_index = np.argmax(scores_numpy)
@@ -2216,10 +788,259 @@ def predict_image_local(model, img_array, demo_mode=False, confidence_threshold=
     except Exception as e:
         return None, 0, None
 
+def classify_ripeness(model, processed_img, scores=None):
+    """
+    TAHAP 2 untuk satu model: prediksi lalu kalibrasi tampilan (confidence minimal 80%, hanya jika valid).
+    Kalibrasi memakai postprocessing.calibrate_scores (vectorized, sama untuk batch [N, 3]).
+    Mengembalikan (nama_kelas, confidence, scores)
+    """
+    predicted_class, confidence_raw, scores = predict_image_local(model, processed_img, demo_mode, confidence_threshold, scores)
+    if predicted_class is None or "Tidak Valid" in predicted_class or scores is None:
+        return predicted_class, confidence_raw, scores
+    calibrated_scores, confidences = calibrate_scores(scores[np.newaxis, :], confidences=[confidence_raw])
+    return predicted_class, float(confidences[0]), calibrated_scores[0]
+
+@st.cache_resource
+def get_gemini_executor():
+    """
+    Thread pool bersama untuk panggilan Gemini. Panggilan yang melewati deadline dibiarkan selesai di
+    background (tidak di-join), jadi UI tidak ikut menunggu.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini")
+
+@st.cache_resource(max_entries=1)
+def load_dragon_gate(path, mtime, _model):
+    """Gate lokal + feature extractor MobileNetV2 (dimuat ulang hanya jika file gate berubah)"""
+    from dragon_gate import DragonFruitGate
+    from embeddings import FeatureExtractor
+    try:
+        gate = DragonFruitGate.load(path)
+        return gate, FeatureExtractor(_model, gate.layer_name or None)
+    except Exception as e:
+        st.warning(f"⚠️ Gate lokal '{path}' tidak dapat dimuat, deteksi memakai Gemini/CNN. Error: {e}")
+        return None, None
+
+def get_dragon_gate():
+    """
+    (gate, extractor) jika model_results/dragon_gate.npz ada dan MobileNetV2 dimuat lokal; selain itu (None, None).
+    Buat file gate dengan: python dragon_gate.py build ...
+    """
+    if model_mobilenetv2 is None or INFERENCE_API_URL or not os.path.exists(DRAGON_GATE_FILE):
+        return None, None
+    return load_dragon_gate(DRAGON_GATE_FILE, os.path.getmtime(DRAGON_GATE_FILE), model_mobilenetv2)
+
+def run_cnn_scores(processed_img, extractor=None):
+    """
+    Skor softmax semua model yang dimuat untuk satu gambar: ({'vgg16': scores|None, 'mobilenetv2': scores|None}, embedding).
+    Jika extractor diberikan, MobileNetV2 dijalankan lewat extractor sehingga embedding gate lokal ikut
+    dihitung dalam forward pass yang sama; selain itu embedding = None.
+    """
+    cnn_scores = {}
+    embedding = None
+    for key, model in (("vgg16", model_vgg16), ("mobilenetv2", model_mobilenetv2)):
+        cnn_scores[key] = None
+        if model is not None:
+            try:
+                if key == "mobilenetv2" and extractor is not None:
+                    embeddings, outputs = extractor(processed_img)
+                    cnn_scores[key] = softmax(outputs)[0]
+                    embedding = embeddings[0]
+                else:
+                    cnn_scores[key] = model_scores(model, processed_img)
+            except Exception:
+                pass
+    return cnn_scores, embedding
+
+def classify_two_stage(img, processed_img):
+    """
+    Bagian komputasi SISTEM 2 TAHAP (deteksi buah naga -> klasifikasi kematangan) tanpa render hasil.
+    Mengembalikan dict berisi hasil kedua model; dipanggil lewat memoized_classification.
+    """
+    # ==============================================================================
+    # SISTEM 2 TAHAP: Deteksi Buah Naga → Klasifikasi Kematangan
+    # ==============================================================================
+
+    # TAHAP 1: Deteksi apakah gambar adalah buah naga atau bukan
+    vgg16_is_dragon_fruit = False
+    mobilenetv2_is_dragon_fruit = False
+    vgg16_detection_conf = 0
+    mobilenetv2_detection_conf = 0
+    vgg16_detection_reason = ""
+    mobilenetv2_detection_reason = ""
+
+    vgg16_class = None
+    vgg16_confidence = 0
+    vgg16_scores = None
+    mobilenetv2_class = None
+    mobilenetv2_confidence = 0
+    mobilenetv2_scores = None
+
+    # TAHAP 1a: Gate lokal (jarak embedding MobileNetV2) - keputusan dalam milidetik tanpa panggilan jaringan.
+    # Hanya kasus borderline yang diteruskan ke Gemini (second opinion) atau statistik CNN di bawah.
+    cnn_scores = None
+    gate_result = None
+    dragon_gate, gate_extractor = get_dragon_gate()
+    if dragon_gate is not None:
+        with st.spinner("🔍 Sistem sedang memeriksa gambar..."):
+            cnn_scores, embedding = run_cnn_scores(processed_img, gate_extractor)
+        if embedding is not None:
+            decision, gate_conf, distance = dragon_gate.decide(embedding)[0]
+            if decision != GATE_BORDERLINE:
+                gate_result = (
+                    decision == GATE_ACCEPT, gate_conf,
+                    f"Gate lokal: jarak embedding {distance:.3f} (terima ≤ {dragon_gate.accept_below:.3f}, tolak ≥ {dragon_gate.reject_above:.3f})"
+                )
+
+    # TAHAP 1b: Deteksi menggunakan Gemini API (jika tersedia) atau model CNN
+    if gate_result is not None:
+        vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = gate_result
+        # Gate memberikan hasil yang sama untuk kedua model
+        mobilenetv2_is_dragon_fruit = vgg16_is_dragon_fruit
+        mobilenetv2_detection_conf = vgg16_detection_conf
+        mobilenetv2_detection_reason = vgg16_detection_reason
+    elif gemini_api_key:
+        # Gemini (remote, beberapa detik) dan inferensi CNN lokal dijalankan bersamaan:
+        # latensi total menjadi max(Gemini, CNN) alih-alih jumlah keduanya
+        gemini_start = time.perf_counter()
+        gemini_future = get_gemini_executor().submit(is_dragon_fruit_gemini, img, gemini_api_key, demo_mode)
+        with st.spinner("🔍 Sistem sedang menganalisis gambar..."):
+            if cnn_scores is None:
+                cnn_scores, _ = run_cnn_scores(processed_img)
+            remaining = GEMINI_DEADLINE_SECONDS - (time.perf_counter() - gemini_start)
+            try:
+                # Gunakan gambar asli (PIL Image), bukan processed_img
+                gemini_result = gemini_future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                gemini_result = (None, 0.0, f"Sistem AI Vision tidak menjawab dalam {GEMINI_DEADLINE_SECONDS:g} detik")
+            except Exception as e:
+                gemini_result = (None, 0.0, f"Error API: {str(e)}")
+
+        if gemini_result[0] is not None:
+            vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = gemini_result
+        elif model_vgg16 is not None:
+            # Fallback: statistik distribusi dari skor CNN yang sudah dihitung
+            vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = is_dragon_fruit_fallback(
+                model_vgg16, processed_img, demo_mode, scores=cnn_scores["vgg16"]
+            )
+        else:
+            # Jika tidak ada keduanya, default terima
+            vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = True, 50.0, "Tidak ada API/Model, default terima"
+        # Gemini memberikan hasil yang sama untuk kedua model
+        mobilenetv2_is_dragon_fruit = vgg16_is_dragon_fruit
+        mobilenetv2_detection_conf = vgg16_detection_conf
+        mobilenetv2_detection_reason = vgg16_detection_reason
+    else:
+        # Fallback: Gunakan model CNN untuk analisis distribusi (skor dipakai ulang di TAHAP 2)
+        if cnn_scores is None:
+            with st.spinner("🔍 Model CNN sedang menganalisis gambar..."):
+                cnn_scores, _ = run_cnn_scores(processed_img)
+        if model_vgg16 is not None:
+            with st.spinner("🔵 VGG16 sedang mendeteksi apakah ini buah naga..."):
+                vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = is_dragon_fruit_fallback(
+                    model_vgg16, processed_img, demo_mode, scores=cnn_scores["vgg16"]
+                )
+
+        if model_mobilenetv2 is not None:
+            with st.spinner("🟢 MobileNetV2 sedang mendeteksi apakah ini buah naga..."):
+                mobilenetv2_is_dragon_fruit, mobilenetv2_detection_conf, mobilenetv2_detection_reason = is_dragon_fruit_fallback(
+                    model_mobilenetv2, processed_img, demo_mode, scores=cnn_scores["mobilenetv2"]
+                )
+
+    # TAHAP 2: Klasifikasi kematangan (HANYA jika terdeteksi sebagai buah naga)
+    if vgg16_is_dragon_fruit and model_vgg16 is not None:
+        with st.spinner("🔵 VGG16 sedang mengklasifikasikan kematangan..."):
+            vgg16_class, vgg16_confidence, vgg16_scores = classify_ripeness(model_vgg16, processed_img, cnn_scores["vgg16"])
+    else:
+        # Bukan buah naga, set sebagai "Tidak Valid"
+        vgg16_class = "Tidak Valid - Bukan Buah Naga"
+        vgg16_confidence = vgg16_detection_conf
+        vgg16_scores = None
+
+    if mobilenetv2_is_dragon_fruit and model_mobilenetv2 is not None:
+        with st.spinner("🟢 MobileNetV2 sedang mengklasifikasikan kematangan..."):
+            mobilenetv2_class, mobilenetv2_confidence, mobilenetv2_scores = classify_ripeness(model_mobilenetv2, processed_img, cnn_scores["mobilenetv2"])
+    else:
+        # Bukan buah naga, set sebagai "Tidak Valid"
+        mobilenetv2_class = "Tidak Valid - Bukan Buah Naga"
+        mobilenetv2_confidence = mobilenetv2_detection_conf
+        mobilenetv2_scores = None
+
+    # Gabungan hasil: Jika KEDUA model mengatakan bukan buah naga, pastikan hasil "Tidak Valid"
+    if not vgg16_is_dragon_fruit and not mobilenetv2_is_dragon_fruit:
+        vgg16_class = "Tidak Valid - Bukan Buah Naga"
+        mobilenetv2_class = "Tidak Valid - Bukan Buah Naga"
+
+    return {
+        'vgg16_is_dragon_fruit': vgg16_is_dragon_fruit,
+        'vgg16_detection_conf': vgg16_detection_conf,
+        'vgg16_detection_reason': vgg16_detection_reason,
+        'vgg16_class': vgg16_class,
+        'vgg16_confidence': vgg16_confidence,
+        'vgg16_scores': vgg16_scores,
+        'mobilenetv2_is_dragon_fruit': mobilenetv2_is_dragon_fruit,
+        'mobilenetv2_detection_conf': mobilenetv2_detection_conf,
+        'mobilenetv2_detection_reason': mobilenetv2_detection_reason,
+        'mobilenetv2_class': mobilenetv2_class,
+        'mobilenetv2_confidence': mobilenetv2_confidence,
+        'mobilenetv2_scores': mobilenetv2_scores,
+    }
+
+# Jumlah hasil klasifikasi yang diingat per sesi (per gambar)
+PREDICTION_MEMO_SIZE = 8
+
+def memoized_classification(image_bytes):
+    """
+    Hasil klasifikasi 2 tahap untuk gambar yang diunggah, di-memo di st.session_state per hash isi file.
+    Streamlit menjalankan ulang script di setiap interaksi; selama gambar dan pengaturan tidak berubah,
+    rerun hanya me-render ulang tanpa memanggil Gemini / model lagi.
+    Mengembalikan None jika gambar gagal di-preprocess.
+    """
+    memo_key = (
+        hashlib.sha1(image_bytes).hexdigest(),
+        hashlib.sha1(gemini_api_key.encode()).hexdigest() if gemini_api_key else None,
+        demo_mode,
+        confidence_threshold,
+        INFERENCE_API_URL,
+        model_vgg16 is not None,
+        model_mobilenetv2 is not None,
+        os.path.getmtime(DRAGON_GATE_FILE) if os.path.exists(DRAGON_GATE_FILE) else None,
+    )
+    memo = st.session_state.setdefault("prediction_memo", {})
+    if memo_key in memo:
+        # Pindahkan ke akhir (paling baru dipakai)
+        memo[memo_key] = memo.pop(memo_key)
+        return memo[memo_key]
+
+    img = Image.open(io.BytesIO(image_bytes))
+    # Lakukan pre-processing gambar (termasuk konversi ke RGB)
+    processed_img = preprocess_image(img)
+    if processed_img is None:
+        return None
+    result = classify_two_stage(img, processed_img)
+    memo[memo_key] = result
+    while len(memo) > PREDICTION_MEMO_SIZE:
+        memo.pop(next(iter(memo)))
+    return result
+
 # ==============================================================================
 # BAGIAN 3: INTERFACE PENGGUNA (UI) STREAMLIT
 # ==============================================================================
 
+# st.fragment (Streamlit >= 1.37) / st.experimental_fragment; tanpa keduanya fungsi dijalankan biasa
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Tampilkan waktu rerun di halaman (untuk mengukur sebelum/sesudah optimasi): SHOW_RERUN_TIMING=1
+SHOW_RERUN_TIMING = os.getenv("SHOW_RERUN_TIMING", "0") == "1"
+
+def record_rerun_timing(label, start):
+    """Mencatat durasi (ms) satu rerun/fragment ke session_state['rerun_timings'] (maks 50 entri terakhir)"""
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    timings = st.session_state.setdefault("rerun_timings", [])
+    timings.append((label, round(elapsed_ms, 1)))
+    del timings[:-50]
+    if SHOW_RERUN_TIMING:
+        st.caption(f"⏱️ {label}: {elapsed_ms:.1f} ms")
+
 # Header utama
 st.markdown('<h1 class="main-header">🐉 Klasifikasi Kematangan Buah Naga</h1>', unsafe_allow_html=True)
 
@@ -2246,38 +1067,6 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Kontainer untuk expanders dengan styling yang lebih menarik - Background solid (tidak transparan)
-st.markdown("""
-<style>
-    div[data-testid="stExpander"] {
-        margin-bottom: 0.5rem !important;
-        margin-top: 0 !important;
-    }
-    div[data-testid="stExpander"]:first-of-type {
-        margin-top: 0.25rem !important;
-    }
-    div[data-testid="stExpander"] > div:first-child {
-        background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%) !important;
-        border: 2px solid #4ECDC4 !important;
-        border-radius: 12px !important;
-        padding: 0.75rem 1rem !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 12px rgba(78, 205, 196, 0.3) !important;
-    }
-    div[data-testid="stExpander"] > div:first-child:hover {
-        background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%) !important;
-        box-shadow: 0 6px 20px rgba(78, 205, 196, 0.5) !important;
-        transform: translateY(-2px) !important;
-        border-color: #5EDFD7 !important;
-    }
-    div[data-testid="stExpander"] > div:first-child > div {
-        color: white !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
 # Konten yang dipindahkan dari sidebar - Informasi Model Singkat
 if model_performance_metrics:
     with st.expander("📊 Informasi Model", expanded=False):
@@ -2328,1011 +1117,1025 @@ with st.expander("🏷 Label Kelas", expanded=False):
             <div style="background: linear-gradient(135deg, #3498DB 0%, #2980B9 100%); padding: 1rem; margin-top: 0.5rem; border-radius: 10px; border: 2px solid #FFFFFF; box-shadow: 0 4px 12px rgba(52, 152, 219, 0.3);">
                 <p style="margin: 0; color: white; font-weight: 600;">🍏 <strong>{class_name}</strong><br><span style="font-size: 0.9rem;">Buah Naga Mentah</span></p>
             </div>
-            """, unsafe_allow_html=True)
-        elif "Defect" in class_name:
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%); padding: 1rem; margin-top: 0.5rem; border-radius: 10px; border: 2px solid #FFFFFF; box-shadow: 0 4px 12px rgba(231, 76, 60, 0.3);">
-                <p style="margin: 0; color: white; font-weight: 600;">🍎 <strong>{class_name}</strong><br><span style="font-size: 0.9rem;">Buah Naga Busuk</span></p>
-            </div>
-            """, unsafe_allow_html=True)
-
-# Bagian Performa Model dan Hasil Analisis Pelatihan
-st.markdown("""
-<h2 style="font-size: 1.6rem; font-weight: 700; color: white; margin-top: 1.25rem; margin-bottom: 0.75rem; display: flex; align-items: center; gap: 0.5rem;">
-    <span style="display: inline-block; width: 24px; height: 24px; background: #4ECDC4; border-radius: 4px;"></span>
-    Performa Model dari Pelatihan
-</h2>
-""", unsafe_allow_html=True)
-if model_performance_metrics:
-    # Gunakan .get() untuk menghindari KeyError
-    vgg16_accuracy = model_performance_metrics.get('vgg16', {}).get('accuracy', 0.0)
-    mobilenetv2_accuracy = model_performance_metrics.get('mobilenetv2', {}).get('accuracy', 0.0)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
-                    padding: 2rem;
-                    border-radius: 20px;
-                    box-shadow: 0 12px 24px rgba(0,0,0,0.4);
-                    margin: 1rem 0;
-                    color: white;
-                    text-align: center;">
-            <h3 style="color: white; font-weight: 700; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; gap: 0.5rem;">
-                <span style="display: inline-block; width: 32px; height: 32px; background: #4ECDC4; border-radius: 50%;"></span>
-                Model VGG16
-            </h3>
-            <div style="text-align: center;">
-                <h2 style="color: white; margin: 0; font-size: 3rem; font-weight: bold;">{vgg16_accuracy:.1%}</h2>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
-                    padding: 2rem;
-                    border-radius: 20px;
-                    box-shadow: 0 12px 24px rgba(0,0,0,0.4);
-                    margin: 1rem 0;
-                    color: white;
-                    text-align: center;">
-            <h3 style="color: white; font-weight: 700; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; gap: 0.5rem;">
-                <span style="display: inline-block; width: 32px; height: 32px; background: #2ECC71; border-radius: 50%;"></span>
-                Model MobileNetV2
-            </h3>
-            <div style="text-align: center;">
-                <h2 style="color: white; margin: 0; font-size: 3rem; font-weight: bold;">{mobilenetv2_accuracy:.1%}</h2>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-else:
-    st.markdown("""
-    <div class="warning-box">
-        <h4>⚠ Metrik Performa Tidak Tersedia</h4>
-        <p>Metrik performa model tidak dapat dimuat. Pastikan file 'model_metrics.json' ada di '{MODEL_METRICS_FILE}'.</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.markdown("---")
-st.markdown('<h2 class="sub-header">📈 Hasil Analisis Pelatihan</h2>', unsafe_allow_html=True)
-if model_performance_metrics:
-    tab1, tab2, tab3 = st.tabs(["📊 Grafik Pelatihan", "🎯 Confusion Matrix", "📋 Classification Report"])
-    with tab1:
-        st.markdown("### Grafik Akurasi dan Loss")
-        col1, col2 = st.columns(2)
-        with col1:
-            vgg16_plot_path = model_performance_metrics.get('vgg16', {}).get('accuracy_loss_plot_path')
-            if vgg16_plot_path and os.path.exists(vgg16_plot_path):
-                st.image(vgg16_plot_path, caption='🔵 VGG16 - Akurasi & Loss', use_container_width=True) # Perubahan di sini
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Grafik VGG16 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {vgg16_plot_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        with col2:
-            mobilenetv2_plot_path = model_performance_metrics.get('mobilenetv2', {}).get('accuracy_loss_plot_path')
-            if mobilenetv2_plot_path and os.path.exists(mobilenetv2_plot_path):
-                st.image(mobilenetv2_plot_path, caption='🟢 MobileNetV2 - Akurasi & Loss', use_container_width=True) # Perubahan di sini
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Grafik MobileNetV2 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {mobilenetv2_plot_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-    with tab2:
-        st.markdown("### Confusion Matrix")
-        col3, col4 = st.columns(2)
-        with col3:
-            vgg16_cm_path = model_performance_metrics.get('vgg16', {}).get('confusion_matrix_plot_path')
-            if vgg16_cm_path and os.path.exists(vgg16_cm_path):
-                st.image(vgg16_cm_path, caption='🔵 VGG16 - Confusion Matrix', use_container_width=True) # Perubahan di sini
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Confusion Matrix VGG16 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {vgg16_cm_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        with col4:
-            mobilenetv2_cm_path = model_performance_metrics.get('mobilenetv2', {}).get('confusion_matrix_plot_path')
-            if mobilenetv2_cm_path and os.path.exists(mobilenetv2_cm_path):
-                st.image(mobilenetv2_cm_path, caption='🟢 MobileNetV2 - Confusion Matrix', use_container_width=True) # Perubahan di sini
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Confusion Matrix MobileNetV2 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {mobilenetv2_cm_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-    with tab3:
-        st.markdown("### Classification Report")
-        col5, col6 = st.columns(2)
-        with col5:
-            vgg16_report_path = model_performance_metrics.get('vgg16', {}).get('classification_report_path')
-            if vgg16_report_path and os.path.exists(vgg16_report_path):
-                st.markdown("#### 🔵 VGG16 Classification Report")
-                try:
-                    with open(vgg16_report_path, 'r') as f:
-                        report_content = f.read()
-                    st.code(report_content, language='text')
-                except Exception as e:
-                    st.error(f"Gagal membaca file report VGG16: {e}")
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Classification Report VGG16 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {vgg16_report_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        with col6:
-            mobilenetv2_report_path = model_performance_metrics.get('mobilenetv2', {}).get('classification_report_path')
-            if mobilenetv2_report_path and os.path.exists(mobilenetv2_report_path):
-                st.markdown("#### 🟢 MobileNetV2 Classification Report")
-                try:
-                    with open(mobilenetv2_report_path, 'r') as f:
-                        report_content = f.read()
-                    st.code(report_content, language='text')
-                except Exception as e:
-                    st.error(f"Gagal membaca file report MobileNetV2: {e}")
-            else:
-                st.markdown(f"""
-                <div class="warning-box">
-                    <h4>⚠ Classification Report MobileNetV2 Tidak Ditemukan</h4>
-                    <p>File tidak ditemukan di: {mobilenetv2_report_path}</p>
-                </div>
-                """, unsafe_allow_html=True)
-else:
+            """, unsafe_allow_html=True)
+        elif "Defect" in class_name:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%); padding: 1rem; margin-top: 0.5rem; border-radius: 10px; border: 2px solid #FFFFFF; box-shadow: 0 4px 12px rgba(231, 76, 60, 0.3);">
+                <p style="margin: 0; color: white; font-weight: 600;">🍎 <strong>{class_name}</strong><br><span style="font-size: 0.9rem;">Buah Naga Busuk</span></p>
+            </div>
+            """, unsafe_allow_html=True)
+
+# Bagian Performa Model dan Hasil Analisis Pelatihan
+def render_training_analysis():
+    """Kartu akurasi model dan tab grafik/confusion matrix/classification report"""
     st.markdown("""
-    <div class="warning-box">
-        <h4>⚠ Hasil Analisis Tidak Tersedia</h4>
-        <p>Hasil analisis pelatihan tidak dapat dimuat karena metrik model tidak tersedia.</p>
-    </div>
+    <h2 style="font-size: 1.6rem; font-weight: 700; color: white; margin-top: 1.25rem; margin-bottom: 0.75rem; display: flex; align-items: center; gap: 0.5rem;">
+        <span style="display: inline-block; width: 24px; height: 24px; background: #4ECDC4; border-radius: 4px;"></span>
+        Performa Model dari Pelatihan
+    </h2>
     """, unsafe_allow_html=True)
+    if model_performance_metrics:
+        # Gunakan .get() untuk menghindari KeyError
+        vgg16_accuracy = model_performance_metrics.get('vgg16', {}).get('accuracy', 0.0)
+        mobilenetv2_accuracy = model_performance_metrics.get('mobilenetv2', {}).get('accuracy', 0.0)
+    
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
+                        padding: 2rem;
+                        border-radius: 20px;
+                        box-shadow: 0 12px 24px rgba(0,0,0,0.4);
+                        margin: 1rem 0;
+                        color: white;
+                        text-align: center;">
+                <h3 style="color: white; font-weight: 700; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; gap: 0.5rem;">
+                    <span style="display: inline-block; width: 32px; height: 32px; background: #4ECDC4; border-radius: 50%;"></span>
+                    Model VGG16
+                </h3>
+                <div style="text-align: center;">
+                    <h2 style="color: white; margin: 0; font-size: 3rem; font-weight: bold;">{vgg16_accuracy:.1%}</h2>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        with col2:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #1A1A2E 0%, #16213E 100%);
+                        padding: 2rem;
+                        border-radius: 20px;
+                        box-shadow: 0 12px 24px rgba(0,0,0,0.4);
+                        margin: 1rem 0;
+                        color: white;
+                        text-align: center;">
+                <h3 style="color: white; font-weight: 700; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; gap: 0.5rem;">
+                    <span style="display: inline-block; width: 32px; height: 32px; background: #2ECC71; border-radius: 50%;"></span>
+                    Model MobileNetV2
+                </h3>
+                <div style="text-align: center;">
+                    <h2 style="color: white; margin: 0; font-size: 3rem; font-weight: bold;">{mobilenetv2_accuracy:.1%}</h2>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="warning-box">
+            <h4>⚠ Metrik Performa Tidak Tersedia</h4>
+            <p>Metrik performa model tidak dapat dimuat. Pastikan file 'model_metrics.json' ada di '{MODEL_METRICS_FILE}'.</p>
+        </div>
+        """, unsafe_allow_html=True)
 
-st.markdown("---")
-st.markdown('<h2 class="sub-header">🔍 Klasifikasi Buah Naga</h2>', unsafe_allow_html=True) # Dihapus (Lokal)
-
-st.markdown("""
-<div class="info-box">
-    <h3 style="color: white; font-weight: 700; margin-bottom: 1rem;">📸 Input Gambar Buah Naga</h3>
-    <p style="color: white; font-weight: 500; font-size: 1.1rem; line-height: 1.6;">
-        Upload gambar dari komputer atau scan langsung dengan kamera untuk melakukan klasifikasi tingkat kematangan buah naga.
-        Format yang didukung: JPG, JPEG, PNG.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown('<h2 class="sub-header">📈 Hasil Analisis Pelatihan</h2>', unsafe_allow_html=True)
+    if model_performance_metrics:
+        tab1, tab2, tab3 = st.tabs(["📊 Grafik Pelatihan", "🎯 Confusion Matrix", "📋 Classification Report"])
+        with tab1:
+            st.markdown("### Grafik Akurasi dan Loss")
+            col1, col2 = st.columns(2)
+            with col1:
+                vgg16_plot_path = model_performance_metrics.get('vgg16', {}).get('accuracy_loss_plot_path')
+                vgg16_plot_image = metrics_artifacts.get('vgg16', {}).get('accuracy_loss_plot_path')
+                if vgg16_plot_image:
+                    st.image(vgg16_plot_image, caption='🔵 VGG16 - Akurasi & Loss', use_container_width=True) # Perubahan di sini
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Grafik VGG16 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {vgg16_plot_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            with col2:
+                mobilenetv2_plot_path = model_performance_metrics.get('mobilenetv2', {}).get('accuracy_loss_plot_path')
+                mobilenetv2_plot_image = metrics_artifacts.get('mobilenetv2', {}).get('accuracy_loss_plot_path')
+                if mobilenetv2_plot_image:
+                    st.image(mobilenetv2_plot_image, caption='🟢 MobileNetV2 - Akurasi & Loss', use_container_width=True) # Perubahan di sini
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Grafik MobileNetV2 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {mobilenetv2_plot_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+        with tab2:
+            st.markdown("### Confusion Matrix")
+            col3, col4 = st.columns(2)
+            with col3:
+                vgg16_cm_path = model_performance_metrics.get('vgg16', {}).get('confusion_matrix_plot_path')
+                vgg16_cm_image = metrics_artifacts.get('vgg16', {}).get('confusion_matrix_plot_path')
+                if vgg16_cm_image:
+                    st.image(vgg16_cm_image, caption='🔵 VGG16 - Confusion Matrix', use_container_width=True) # Perubahan di sini
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Confusion Matrix VGG16 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {vgg16_cm_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            with col4:
+                mobilenetv2_cm_path = model_performance_metrics.get('mobilenetv2', {}).get('confusion_matrix_plot_path')
+                mobilenetv2_cm_image = metrics_artifacts.get('mobilenetv2', {}).get('confusion_matrix_plot_path')
+                if mobilenetv2_cm_image:
+                    st.image(mobilenetv2_cm_image, caption='🟢 MobileNetV2 - Confusion Matrix', use_container_width=True) # Perubahan di sini
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Confusion Matrix MobileNetV2 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {mobilenetv2_cm_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+        with tab3:
+            st.markdown("### Classification Report")
+            col5, col6 = st.columns(2)
+            with col5:
+                vgg16_report_path = model_performance_metrics.get('vgg16', {}).get('classification_report_path')
+                vgg16_report = metrics_artifacts.get('vgg16', {})
+                if vgg16_report_path and (vgg16_report.get('classification_report_path') is not None
+                                      or vgg16_report.get('classification_report_error')):
+                    st.markdown("#### 🔵 VGG16 Classification Report")
+                    if vgg16_report.get('classification_report_error'):
+                        st.error(f"Gagal membaca file report VGG16: {vgg16_report['classification_report_error']}")
+                    else:
+                        st.code(vgg16_report['classification_report_path'], language='text')
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Classification Report VGG16 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {vgg16_report_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            with col6:
+                mobilenetv2_report_path = model_performance_metrics.get('mobilenetv2', {}).get('classification_report_path')
+                mobilenetv2_report = metrics_artifacts.get('mobilenetv2', {})
+                if mobilenetv2_report_path and (mobilenetv2_report.get('classification_report_path') is not None
+                                      or mobilenetv2_report.get('classification_report_error')):
+                    st.markdown("#### 🟢 MobileNetV2 Classification Report")
+                    if mobilenetv2_report.get('classification_report_error'):
+                        st.error(f"Gagal membaca file report MobileNetV2: {mobilenetv2_report['classification_report_error']}")
+                    else:
+                        st.code(mobilenetv2_report['classification_report_path'], language='text')
+                else:
+                    st.markdown(f"""
+                    <div class="warning-box">
+                        <h4>⚠ Classification Report MobileNetV2 Tidak Ditemukan</h4>
+                        <p>File tidak ditemukan di: {mobilenetv2_report_path}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="warning-box">
+            <h4>⚠ Hasil Analisis Tidak Tersedia</h4>
+            <p>Hasil analisis pelatihan tidak dapat dimuat karena metrik model tidak tersedia.</p>
+        </div>
+        """, unsafe_allow_html=True)
 
-# Pilih metode input: Upload File atau Scan Camera
-input_method = st.radio(
-    "📸 Pilih Metode Input:",
-    ["📤 Upload File", "📷 Scan dengan Kamera"],
-    horizontal=True,
-    help="Pilih untuk upload file dari komputer atau scan langsung dengan kamera"
-)
+render_training_analysis()
 
-uploaded_file = None
-camera_image = None
+@fragment
+def render_classification():
+    """
+    Input gambar dan hasil klasifikasi. Dijalankan sebagai fragment: interaksi widget di bagian ini
+    (pilih metode input, upload, kamera) hanya menjalankan ulang fungsi ini, bukan seluruh halaman.
+    """
+    fragment_start = time.perf_counter()
+    
+    st.markdown("---")
+    st.markdown('<h2 class="sub-header">🔍 Klasifikasi Buah Naga</h2>', unsafe_allow_html=True) # Dihapus (Lokal)
 
-if input_method == "📤 Upload File":
-    uploaded_file = st.file_uploader(
-        "Pilih gambar buah naga...",
-        type=["jpg", "jpeg", "png"],
-        help="Format yang didukung: JPG, JPEG, PNG"
-    )
-elif input_method == "📷 Scan dengan Kamera":
     st.markdown("""
-    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                padding: 1.5rem; border-radius: 10px; margin-bottom: 1rem;">
-        <h4 style="color: white; margin: 0;">📷 Mode Scan Kamera</h4>
-        <p style="color: white; margin: 0.5rem 0 0 0; font-size: 0.9rem;">
-            Arahkan kamera ke buah naga dan klik tombol "Take Photo" untuk mengambil foto.
+    <div class="info-box">
+        <h3 style="color: white; font-weight: 700; margin-bottom: 1rem;">📸 Input Gambar Buah Naga</h3>
+        <p style="color: white; font-weight: 500; font-size: 1.1rem; line-height: 1.6;">
+            Upload gambar dari komputer atau scan langsung dengan kamera untuk melakukan klasifikasi tingkat kematangan buah naga.
+            Format yang didukung: JPG, JPEG, PNG.
         </p>
     </div>
     """, unsafe_allow_html=True)
-    
-    camera_image = st.camera_input(
-        "Ambil foto buah naga dengan kamera:",
-        help="Klik tombol di bawah kamera untuk mengambil foto. Pastikan cahaya cukup dan buah naga terlihat jelas."
+
+    # Pilih metode input: Upload File atau Scan Camera
+    input_method = st.radio(
+        "📸 Pilih Metode Input:",
+        ["📤 Upload File", "📷 Scan dengan Kamera"],
+        horizontal=True,
+        help="Pilih untuk upload file dari komputer atau scan langsung dengan kamera"
     )
+
+    uploaded_file = None
+    camera_image = None
+
+    if input_method == "📤 Upload File":
+        uploaded_file = st.file_uploader(
+            "Pilih gambar buah naga...",
+            type=["jpg", "jpeg", "png"],
+            help="Format yang didukung: JPG, JPEG, PNG"
+        )
+    elif input_method == "📷 Scan dengan Kamera":
+        st.markdown("""
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    padding: 1.5rem; border-radius: 10px; margin-bottom: 1rem;">
+            <h4 style="color: white; margin: 0;">📷 Mode Scan Kamera</h4>
+            <p style="color: white; margin: 0.5rem 0 0 0; font-size: 0.9rem;">
+                Arahkan kamera ke buah naga dan klik tombol "Take Photo" untuk mengambil foto.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
     
-    if camera_image is not None:
-        uploaded_file = camera_image  # Gunakan image dari kamera sebagai uploaded_file
-
-if uploaded_file is not None:
-    # Tentukan caption berdasarkan metode input
-    if input_method == "📷 Scan dengan Kamera":
-        image_caption = "📷 Foto dari Kamera"
-        st.markdown("### 📷 Foto yang Diambil dari Kamera")
-    else:
-        image_caption = "📤 Gambar yang Diunggah"
-        st.markdown("### 📷 Gambar yang Diunggah")
+        camera_image = st.camera_input(
+            "Ambil foto buah naga dengan kamera:",
+            help="Klik tombol di bawah kamera untuk mengambil foto. Pastikan cahaya cukup dan buah naga terlihat jelas."
+        )
+    
+        if camera_image is not None:
+            uploaded_file = camera_image  # Gunakan image dari kamera sebagai uploaded_file
+
+    if uploaded_file is not None:
+        # Tentukan caption berdasarkan metode input
+        if input_method == "📷 Scan dengan Kamera":
+            image_caption = "📷 Foto dari Kamera"
+            st.markdown("### 📷 Foto yang Diambil dari Kamera")
+        else:
+            image_caption = "📤 Gambar yang Diunggah"
+            st.markdown("### 📷 Gambar yang Diunggah")
     
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        st.image(uploaded_file, caption=image_caption, use_container_width=True)
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.image(uploaded_file, caption=image_caption, use_container_width=True)
     
-    st.markdown("### ⚡ Proses Klasifikasi") # Dihapus (Lokal)
+        st.markdown("### ⚡ Proses Klasifikasi") # Dihapus (Lokal)
     
-    try:
-        img = Image.open(uploaded_file)
-        # Lakukan pre-processing gambar (termasuk konversi ke RGB)
-        processed_img = preprocess_image(img)
+        try:
+            # Deteksi + klasifikasi dijalankan sekali per gambar; rerun berikutnya memakai hasil memo
+            classification = memoized_classification(uploaded_file.getvalue())
 
-        if processed_img is not None:
-            st.markdown("### 🎯 Hasil Prediksi") # Dihapus (Lokal)
-            
-            col1, col2 = st.columns(2)
-            
-            # Inisialisasi variabel skor untuk grafik
-            vgg16_scores = None
-            mobilenetv2_scores = None
-            
-            # Flag untuk validitas (untuk menyembunyikan grafik)
-            vgg16_is_valid = False
-            mobilenetv2_is_valid = False
-            
-            # ==============================================================================
-            # SISTEM 2 TAHAP: Deteksi Buah Naga → Klasifikasi Kematangan
-            # ==============================================================================
-            
-            # TAHAP 1: Deteksi apakah gambar adalah buah naga atau bukan
-            vgg16_is_dragon_fruit = False
-            mobilenetv2_is_dragon_fruit = False
-            vgg16_detection_conf = 0
-            mobilenetv2_detection_conf = 0
-            vgg16_detection_reason = ""
-            mobilenetv2_detection_reason = ""
-            
-            vgg16_class = None
-            vgg16_confidence = 0
-            vgg16_scores = None
-            mobilenetv2_class = None
-            mobilenetv2_confidence = 0
-            mobilenetv2_scores = None
+            if classification is not None:
+                st.markdown("### 🎯 Hasil Prediksi") # Dihapus (Lokal)
             
-            # ==============================================================================
-            # TAHAP 1: DETEKSI BUAH NAGA - Tampilkan UI
-            # ==============================================================================
-            st.markdown("### 🔍 TAHAP 1: Deteksi Buah Naga")
-            st.markdown("""
-            <div class="info-box" style="padding: 1rem;">
-                <p style="margin: 0; font-size: 0.95rem;">
-                    Sistem sedang memeriksa apakah gambar yang diunggah adalah <strong>buah naga</strong> atau bukan.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # TAHAP 1: Deteksi menggunakan Gemini API (jika tersedia) atau model CNN
-            if gemini_api_key:
-                # Gunakan Gemini untuk deteksi (lebih pintar)
-                with st.spinner("🔍 Sistem sedang menganalisis gambar..."):
-                    # Gunakan gambar asli (PIL Image), bukan processed_img
-                    vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = is_dragon_fruit(
-                        img, api_key=gemini_api_key, model=model_vgg16, demo_mode=demo_mode
-                    )
-                    # Gemini memberikan hasil yang sama untuk kedua model
-                    mobilenetv2_is_dragon_fruit = vgg16_is_dragon_fruit
-                    mobilenetv2_detection_conf = vgg16_detection_conf
-                    mobilenetv2_detection_reason = vgg16_detection_reason
-            else:
-                # Fallback: Gunakan model CNN untuk analisis distribusi
-                if model_vgg16 is not None:
-                    with st.spinner("🔵 VGG16 sedang mendeteksi apakah ini buah naga..."):
-                        vgg16_is_dragon_fruit, vgg16_detection_conf, vgg16_detection_reason = is_dragon_fruit(
-                            img, api_key=None, model=model_vgg16, demo_mode=demo_mode
-                        )
-                
-                if model_mobilenetv2 is not None:
-                    with st.spinner("🟢 MobileNetV2 sedang mendeteksi apakah ini buah naga..."):
-                        mobilenetv2_is_dragon_fruit, mobilenetv2_detection_conf, mobilenetv2_detection_reason = is_dragon_fruit(
-                            img, api_key=None, model=model_mobilenetv2, demo_mode=demo_mode
-                        )
-            
-            # Tampilkan hasil TAHAP 1
-            col_detect1, col_detect2 = st.columns(2)
-            with col_detect1:
-                if model_vgg16 is not None:
-                    if vgg16_is_dragon_fruit:
-                        st.markdown(f"""
-                        <div class="success-box" style="padding: 1rem;">
-                            <h4 style="margin: 0 0 0.5rem 0;">✅ VGG16 - TAHAP 1</h4>
-                            <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✓ Buah Naga Terdeteksi</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {vgg16_detection_conf:.1f}%</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{vgg16_detection_reason}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
-                            <h4 style="margin: 0 0 0.5rem 0;">❌ VGG16 - TAHAP 1</h4>
-                            <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✗ Bukan Buah Naga</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {vgg16_detection_conf:.1f}%</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{vgg16_detection_reason}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            with col_detect2:
-                if model_mobilenetv2 is not None:
-                    if mobilenetv2_is_dragon_fruit:
-                        st.markdown(f"""
-                        <div class="success-box" style="padding: 1rem;">
-                            <h4 style="margin: 0 0 0.5rem 0;">✅ MobileNetV2 - TAHAP 1</h4>
-                            <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✓ Buah Naga Terdeteksi</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {mobilenetv2_detection_conf:.1f}%</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{mobilenetv2_detection_reason}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
-                            <h4 style="margin: 0 0 0.5rem 0;">❌ MobileNetV2 - TAHAP 1</h4>
-                            <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✗ Bukan Buah Naga</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {mobilenetv2_detection_conf:.1f}%</p>
-                            <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{mobilenetv2_detection_reason}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            st.markdown("---")
+                col1, col2 = st.columns(2)
             
-            # ==============================================================================
-            # TAHAP 2: KLASIFIKASI KEMATANGAN - Tampilkan UI
-            # ==============================================================================
-            st.markdown("### 🎯 TAHAP 2: Klasifikasi Kematangan")
+                # Flag untuk validitas (untuk menyembunyikan grafik)
+                vgg16_is_valid = False
+                mobilenetv2_is_valid = False
             
-            # Cek apakah setidaknya satu model mendeteksi buah naga
-            any_dragon_fruit = vgg16_is_dragon_fruit or mobilenetv2_is_dragon_fruit
+                vgg16_is_dragon_fruit = classification['vgg16_is_dragon_fruit']
+                vgg16_detection_conf = classification['vgg16_detection_conf']
+                vgg16_detection_reason = classification['vgg16_detection_reason']
+                vgg16_class = classification['vgg16_class']
+                vgg16_confidence = classification['vgg16_confidence']
+                vgg16_scores = classification['vgg16_scores']
+                mobilenetv2_is_dragon_fruit = classification['mobilenetv2_is_dragon_fruit']
+                mobilenetv2_detection_conf = classification['mobilenetv2_detection_conf']
+                mobilenetv2_detection_reason = classification['mobilenetv2_detection_reason']
+                mobilenetv2_class = classification['mobilenetv2_class']
+                mobilenetv2_confidence = classification['mobilenetv2_confidence']
+                mobilenetv2_scores = classification['mobilenetv2_scores']
             
-            if any_dragon_fruit:
+                # ==============================================================================
+                # TAHAP 1: DETEKSI BUAH NAGA - Tampilkan UI
+                # ==============================================================================
+                st.markdown("### 🔍 TAHAP 1: Deteksi Buah Naga")
                 st.markdown("""
-                <div class="success-box" style="padding: 1rem;">
+                <div class="info-box" style="padding: 1rem;">
                     <p style="margin: 0; font-size: 0.95rem;">
-                        ✅ <strong>Buah naga terdeteksi!</strong> Sistem akan melanjutkan ke klasifikasi kematangan (Mature/Immature/Defect).
+                        Sistem sedang memeriksa apakah gambar yang diunggah adalah <strong>buah naga</strong> atau bukan.
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
-                    <p style="margin: 0; font-size: 0.95rem;">
-                        ❌ <strong>Bukan buah naga terdeteksi!</strong> Sistem tidak akan melakukan klasifikasi kematangan.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # TAHAP 2: Klasifikasi kematangan (HANYA jika terdeteksi sebagai buah naga)
-            if vgg16_is_dragon_fruit and model_vgg16 is not None:
-                with st.spinner("🔵 VGG16 sedang mengklasifikasikan kematangan..."):
-                    vgg16_class, vgg16_confidence_raw, vgg16_scores = predict_image_local(model_vgg16, processed_img, demo_mode, confidence_threshold)
-                    # Paksa confidence minimal 80% untuk tampilan (hanya jika valid)
-                    if "Tidak Valid" not in vgg16_class:
-                        if vgg16_confidence_raw < 80.0:
-                            # Naikkan confidence ke range 80-92% secara proporsional
-                            # Semakin rendah confidence asli, semakin tinggi boost-nya
-                            boost_factor = 1.0 + ((80.0 - vgg16_confidence_raw) / 100.0) * 0.15  # Max boost 15%
-                            target_confidence = min(92.0, vgg16_confidence_raw * boost_factor)
-                            # Pastikan minimal 80%
-                            vgg16_confidence = max(80.0, target_confidence)
-                            # Tambahkan sedikit variasi untuk menghindari nilai yang sama terus
-                            variation = random.uniform(-1.0, 2.0)  # -1% sampai +2%
-                            vgg16_confidence = min(95.0, max(80.0, vgg16_confidence + variation))
-                            # Sesuaikan scores agar confidence utama sesuai nilai baru
-                            if vgg16_scores is not None and isinstance(vgg16_scores, np.ndarray):
-                                # Cari index kelas yang diprediksi
-                                predicted_index = None
-                                for i, name in enumerate(CLASS_NAMES):
-                                    if name == vgg16_class:
-                                        predicted_index = i
-                                        break
-                                if predicted_index is not None:
-                                    # Set score prediksi sesuai confidence baru
-                                    new_predicted_score = vgg16_confidence / 100.0
-                                    old_predicted_score = vgg16_scores[predicted_index]
-                                    vgg16_scores[predicted_index] = new_predicted_score
-                                    # Redistribusi sisa ke kelas lain dengan proporsi yang sama
-                                    remaining = 1.0 - new_predicted_score
-                                    other_indices = [i for i in range(len(CLASS_NAMES)) if i != predicted_index]
-                                    if len(other_indices) > 0:
-                                        old_other_sum = np.sum(vgg16_scores[other_indices])
-                                        if old_other_sum > 0:
-                                            for idx in other_indices:
-                                                vgg16_scores[idx] = (vgg16_scores[idx] / old_other_sum) * remaining
-                                        else:
-                                            vgg16_scores[other_indices] = remaining / len(other_indices)
-                        else:
-                            vgg16_confidence = vgg16_confidence_raw
-                    else:
-                        vgg16_confidence = vgg16_confidence_raw
-            else:
-                # Bukan buah naga, set sebagai "Tidak Valid"
-                vgg16_class = "Tidak Valid - Bukan Buah Naga"
-                vgg16_confidence = vgg16_detection_conf
-                vgg16_scores = None
-            
-            if mobilenetv2_is_dragon_fruit and model_mobilenetv2 is not None:
-                with st.spinner("🟢 MobileNetV2 sedang mengklasifikasikan kematangan..."):
-                    mobilenetv2_class, mobilenetv2_confidence_raw, mobilenetv2_scores = predict_image_local(model_mobilenetv2, processed_img, demo_mode, confidence_threshold)
-                    # Paksa confidence minimal 80% untuk tampilan (hanya jika valid)
-                    if "Tidak Valid" not in mobilenetv2_class:
-                        if mobilenetv2_confidence_raw < 80.0:
-                            # Naikkan confidence ke range 80-92% secara proporsional
-                            # Semakin rendah confidence asli, semakin tinggi boost-nya
-                            boost_factor = 1.0 + ((80.0 - mobilenetv2_confidence_raw) / 100.0) * 0.15  # Max boost 15%
-                            target_confidence = min(92.0, mobilenetv2_confidence_raw * boost_factor)
-                            # Pastikan minimal 80%
-                            mobilenetv2_confidence = max(80.0, target_confidence)
-                            # Tambahkan sedikit variasi untuk menghindari nilai yang sama terus
-                            variation = random.uniform(-1.0, 2.0)  # -1% sampai +2%
-                            mobilenetv2_confidence = min(95.0, max(80.0, mobilenetv2_confidence + variation))
-                            # Sesuaikan scores agar confidence utama sesuai nilai baru
-                            if mobilenetv2_scores is not None and isinstance(mobilenetv2_scores, np.ndarray):
-                                # Cari index kelas yang diprediksi
-                                predicted_index = None
-                                for i, name in enumerate(CLASS_NAMES):
-                                    if name == mobilenetv2_class:
-                                        predicted_index = i
-                                        break
-                                if predicted_index is not None:
-                                    # Set score prediksi sesuai confidence baru
-                                    new_predicted_score = mobilenetv2_confidence / 100.0
-                                    old_predicted_score = mobilenetv2_scores[predicted_index]
-                                    mobilenetv2_scores[predicted_index] = new_predicted_score
-                                    # Redistribusi sisa ke kelas lain dengan proporsi yang sama
-                                    remaining = 1.0 - new_predicted_score
-                                    other_indices = [i for i in range(len(CLASS_NAMES)) if i != predicted_index]
-                                    if len(other_indices) > 0:
-                                        old_other_sum = np.sum(mobilenetv2_scores[other_indices])
-                                        if old_other_sum > 0:
-                                            for idx in other_indices:
-                                                mobilenetv2_scores[idx] = (mobilenetv2_scores[idx] / old_other_sum) * remaining
-                                        else:
-                                            mobilenetv2_scores[other_indices] = remaining / len(other_indices)
-                        else:
-                            mobilenetv2_confidence = mobilenetv2_confidence_raw
-                    else:
-                        mobilenetv2_confidence = mobilenetv2_confidence_raw
-            else:
-                # Bukan buah naga, set sebagai "Tidak Valid"
-                mobilenetv2_class = "Tidak Valid - Bukan Buah Naga"
-                mobilenetv2_confidence = mobilenetv2_detection_conf
-                mobilenetv2_scores = None
-            
-            # Gabungan hasil: Jika KEDUA model mengatakan bukan buah naga, pastikan hasil "Tidak Valid"
-            if not vgg16_is_dragon_fruit and not mobilenetv2_is_dragon_fruit:
-                vgg16_class = "Tidak Valid - Bukan Buah Naga"
-                mobilenetv2_class = "Tidak Valid - Bukan Buah Naga"
-            
-            st.markdown("---")
-            st.markdown("### 🔍 Hasil Prediksi Model")
             
-            # --- TAMPILKAN UI DENGAN HASIL FINAL (SETELAH VALIDASI) ---
-            with col1:
-                if model_vgg16 is not None:
-                    if vgg16_class is not None:
-                        # --- LOGIKA VALIDITAS ---
-                        if "Tidak Valid" in vgg16_class:
-                            st.markdown(f"""
-                            <div class="prediction-result invalid">
-                                <h3>🔵 VGG16</h3>
-                                <h2>❌ {vgg16_class}</h2>
-                                <p>Confidence Deteksi: {vgg16_confidence:.1f}%</p>
-                                <p style="margin-top: 1rem; font-size: 0.9rem;">
-                                    <strong>Gambar yang diunggah bukan gambar buah naga.</strong><br>
-                                    Sistem tidak dapat melakukan klasifikasi kematangan karena objek bukan buah naga.
-                                </p>
-                                <p style="margin-top: 0.5rem; font-size: 0.85rem; color: #FFD700;">
-                                    💡 {vgg16_detection_reason}
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        elif vgg16_confidence >= confidence_threshold:
+                # Tampilkan hasil TAHAP 1
+                col_detect1, col_detect2 = st.columns(2)
+                with col_detect1:
+                    if model_vgg16 is not None:
+                        if vgg16_is_dragon_fruit:
                             st.markdown(f"""
-                            <div class="prediction-result" style="border-color: #4ECDC4;">
-                                <h3>🔵 VGG16</h3>
-                                <h2>{vgg16_class}</h2>
-                                <h3>Tingkat Kepercayaan: {vgg16_confidence:.1f}%</h3>
+                            <div class="success-box" style="padding: 1rem;">
+                                <h4 style="margin: 0 0 0.5rem 0;">✅ VGG16 - TAHAP 1</h4>
+                                <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✓ Buah Naga Terdeteksi</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {vgg16_detection_conf:.1f}%</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{vgg16_detection_reason}</p>
                             </div>
                             """, unsafe_allow_html=True)
-                            vgg16_is_valid = True # Set flag valid
                         else:
-                            # Jika tidak valid, sembunyikan nama kelas
-                            st.markdown(f"""
-                            <div class="prediction-result invalid">
-                                <h3>🔵 VGG16</h3>
-                                <h2>{vgg16_class}</h2>
-                                <p>Model tidak terlalu yakin. Tingkat Kepercayaan Tertinggi: {vgg16_confidence:.1f}%</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        st.error("Gagal mendapatkan prediksi dari VGG16.")
-                else:
-                    st.markdown("""
-                    <div class="warning-box">
-                        <h4>⚠ Model VGG16 tidak dimuat</h4>
-                        <p>Prediksi tidak dapat dilakukan.</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            # --- TAMPILKAN UI MOBILENETV2 ---
-            with col2:
-                if model_mobilenetv2 is not None:
-                    if mobilenetv2_class is not None:
-                        # --- LOGIKA VALIDITAS ---
-                        if "Tidak Valid" in mobilenetv2_class:
                             st.markdown(f"""
-                            <div class="prediction-result invalid">
-                                <h3>🟢 MobileNetV2</h3>
-                                <h2>❌ {mobilenetv2_class}</h2>
-                                <p>Confidence Deteksi: {mobilenetv2_confidence:.1f}%</p>
-                                <p style="margin-top: 1rem; font-size: 0.9rem;">
-                                    <strong>Gambar yang diunggah bukan gambar buah naga.</strong><br>
-                                    Sistem tidak dapat melakukan klasifikasi kematangan karena objek bukan buah naga.
-                                </p>
-                                <p style="margin-top: 0.5rem; font-size: 0.85rem; color: #FFD700;">
-                                    💡 {mobilenetv2_detection_reason}
-                                </p>
+                            <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
+                                <h4 style="margin: 0 0 0.5rem 0;">❌ VGG16 - TAHAP 1</h4>
+                                <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✗ Bukan Buah Naga</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {vgg16_detection_conf:.1f}%</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{vgg16_detection_reason}</p>
                             </div>
                             """, unsafe_allow_html=True)
-                        elif mobilenetv2_confidence >= confidence_threshold:
+            
+                with col_detect2:
+                    if model_mobilenetv2 is not None:
+                        if mobilenetv2_is_dragon_fruit:
                             st.markdown(f"""
-                            <div class="prediction-result" style="border-color: #4ECDC4;">
-                                <h3>🟢 MobileNetV2</h3>
-                                <h2>{mobilenetv2_class}</h2>
-                                <h3>Tingkat Kepercayaan: {mobilenetv2_confidence:.1f}%</h3>
+                            <div class="success-box" style="padding: 1rem;">
+                                <h4 style="margin: 0 0 0.5rem 0;">✅ MobileNetV2 - TAHAP 1</h4>
+                                <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✓ Buah Naga Terdeteksi</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {mobilenetv2_detection_conf:.1f}%</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{mobilenetv2_detection_reason}</p>
                             </div>
                             """, unsafe_allow_html=True)
-                            mobilenetv2_is_valid = True # Set flag valid
                         else:
-                            # Jika tidak valid, sembunyikan nama kelas
                             st.markdown(f"""
-                            <div class="prediction-result invalid">
-                                <h3>🟢 MobileNetV2</h3>
-                                <h2>{mobilenetv2_class}</h2>
-                                <p>Model tidak terlalu yakin. Tingkat Kepercayaan Tertinggi: {mobilenetv2_confidence:.1f}%</p>
+                            <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
+                                <h4 style="margin: 0 0 0.5rem 0;">❌ MobileNetV2 - TAHAP 1</h4>
+                                <p style="margin: 0; font-size: 1.1rem; font-weight: 600;">✗ Bukan Buah Naga</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem;">Confidence: {mobilenetv2_detection_conf:.1f}%</p>
+                                <p style="margin: 0.5rem 0 0 0; font-size: 0.85rem;">{mobilenetv2_detection_reason}</p>
                             </div>
                             """, unsafe_allow_html=True)
-                    else:
-                        st.error("Gagal mendapatkan prediksi dari MobileNetV2.")
+            
+                st.markdown("---")
+            
+                # ==============================================================================
+                # TAHAP 2: KLASIFIKASI KEMATANGAN - Tampilkan UI
+                # ==============================================================================
+                st.markdown("### 🎯 TAHAP 2: Klasifikasi Kematangan")
+            
+                # Cek apakah setidaknya satu model mendeteksi buah naga
+                any_dragon_fruit = vgg16_is_dragon_fruit or mobilenetv2_is_dragon_fruit
+            
+                if any_dragon_fruit:
+                    st.markdown("""
+                    <div class="success-box" style="padding: 1rem;">
+                        <p style="margin: 0; font-size: 0.95rem;">
+                            ✅ <strong>Buah naga terdeteksi!</strong> Sistem akan melanjutkan ke klasifikasi kematangan (Mature/Immature/Defect).
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
                 else:
                     st.markdown("""
-                    <div class="warning-box">
-                        <h4>⚠ Model MobileNetV2 tidak dimuat</h4>
-                        <p>Prediksi tidak dapat dilakukan.</p>
+                    <div class="warning-box" style="padding: 1rem; background: linear-gradient(135deg, #E74C3C 0%, #C0392B 100%);">
+                        <p style="margin: 0; font-size: 0.95rem;">
+                            ❌ <strong>Bukan buah naga terdeteksi!</strong> Sistem tidak akan melakukan klasifikasi kematangan.
+                        </p>
                     </div>
                     """, unsafe_allow_html=True)
             
-            # ==============================================================================
-            # DETAIL PREDIKSI DENGAN PROGRESS BARS DAN KONSENSUS
-            # ==============================================================================
-            st.markdown("---")
+                st.markdown("---")
+                st.markdown("### 🔍 Hasil Prediksi Model")
             
-            # Tampilkan detail prediksi jika scores tersedia
-            if vgg16_scores is not None and mobilenetv2_scores is not None and vgg16_class is not None and mobilenetv2_class is not None:
-                # Konversi scores ke persentase jika belum
-                if isinstance(vgg16_scores, np.ndarray):
-                    vgg16_scores_pct = vgg16_scores * 100 if vgg16_scores.max() <= 1.0 else vgg16_scores
-                else:
-                    vgg16_scores_pct = [s * 100 if s <= 1.0 else s for s in vgg16_scores] if isinstance(vgg16_scores, (list, tuple)) else vgg16_scores
-                
-                if isinstance(mobilenetv2_scores, np.ndarray):
-                    mobilenetv2_scores_pct = mobilenetv2_scores * 100 if mobilenetv2_scores.max() <= 1.0 else mobilenetv2_scores
-                else:
-                    mobilenetv2_scores_pct = [s * 100 if s <= 1.0 else s for s in mobilenetv2_scores] if isinstance(mobilenetv2_scores, (list, tuple)) else mobilenetv2_scores
-                
-                # Pastikan scores dalam format yang benar
-                if isinstance(vgg16_scores_pct, np.ndarray):
-                    vgg16_scores_list = vgg16_scores_pct.tolist()
-                else:
-                    vgg16_scores_list = list(vgg16_scores_pct) if hasattr(vgg16_scores_pct, '__iter__') else [vgg16_scores_pct]
+                # --- TAMPILKAN UI DENGAN HASIL FINAL (SETELAH VALIDASI) ---
+                with col1:
+                    if model_vgg16 is not None:
+                        if vgg16_class is not None:
+                            # --- LOGIKA VALIDITAS ---
+                            if "Tidak Valid" in vgg16_class:
+                                st.markdown(f"""
+                                <div class="prediction-result invalid">
+                                    <h3>🔵 VGG16</h3>
+                                    <h2>❌ {vgg16_class}</h2>
+                                    <p>Confidence Deteksi: {vgg16_confidence:.1f}%</p>
+                                    <p style="margin-top: 1rem; font-size: 0.9rem;">
+                                        <strong>Gambar yang diunggah bukan gambar buah naga.</strong><br>
+                                        Sistem tidak dapat melakukan klasifikasi kematangan karena objek bukan buah naga.
+                                    </p>
+                                    <p style="margin-top: 0.5rem; font-size: 0.85rem; color: #FFD700;">
+                                        💡 {vgg16_detection_reason}
+                                    </p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                            elif vgg16_confidence >= confidence_threshold:
+                                st.markdown(f"""
+                                <div class="prediction-result" style="border-color: #4ECDC4;">
+                                    <h3>🔵 VGG16</h3>
+                                    <h2>{vgg16_class}</h2>
+                                    <h3>Tingkat Kepercayaan: {vgg16_confidence:.1f}%</h3>
+                                </div>
+                                """, unsafe_allow_html=True)
+                                vgg16_is_valid = True # Set flag valid
+                            else:
+                                # Jika tidak valid, sembunyikan nama kelas
+                                st.markdown(f"""
+                                <div class="prediction-result invalid">
+                                    <h3>🔵 VGG16</h3>
+                                    <h2>{vgg16_class}</h2>
+                                    <p>Model tidak terlalu yakin. Tingkat Kepercayaan Tertinggi: {vgg16_confidence:.1f}%</p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                        else:
+                            st.error("Gagal mendapatkan prediksi dari VGG16.")
+                    else:
+                        st.markdown("""
+                        <div class="warning-box">
+                            <h4>⚠ Model VGG16 tidak dimuat</h4>
+                            <p>Prediksi tidak dapat dilakukan.</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                # --- TAMPILKAN UI MOBILENETV2 ---
+                with col2:
+                    if model_mobilenetv2 is not None:
+                        if mobilenetv2_class is not None:
+                            # --- LOGIKA VALIDITAS ---
+                            if "Tidak Valid" in mobilenetv2_class:
+                                st.markdown(f"""
+                                <div class="prediction-result invalid">
+                                    <h3>🟢 MobileNetV2</h3>
+                                    <h2>❌ {mobilenetv2_class}</h2>
+                                    <p>Confidence Deteksi: {mobilenetv2_confidence:.1f}%</p>
+                                    <p style="margin-top: 1rem; font-size: 0.9rem;">
+                                        <strong>Gambar yang diunggah bukan gambar buah naga.</strong><br>
+                                        Sistem tidak dapat melakukan klasifikasi kematangan karena objek bukan buah naga.
+                                    </p>
+                                    <p style="margin-top: 0.5rem; font-size: 0.85rem; color: #FFD700;">
+                                        💡 {mobilenetv2_detection_reason}
+                                    </p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                            elif mobilenetv2_confidence >= confidence_threshold:
+                                st.markdown(f"""
+                                <div class="prediction-result" style="border-color: #4ECDC4;">
+                                    <h3>🟢 MobileNetV2</h3>
+                                    <h2>{mobilenetv2_class}</h2>
+                                    <h3>Tingkat Kepercayaan: {mobilenetv2_confidence:.1f}%</h3>
+                                </div>
+                                """, unsafe_allow_html=True)
+                                mobilenetv2_is_valid = True # Set flag valid
+                            else:
+                                # Jika tidak valid, sembunyikan nama kelas
+                                st.markdown(f"""
+                                <div class="prediction-result invalid">
+                                    <h3>🟢 MobileNetV2</h3>
+                                    <h2>{mobilenetv2_class}</h2>
+                                    <p>Model tidak terlalu yakin. Tingkat Kepercayaan Tertinggi: {mobilenetv2_confidence:.1f}%</p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                        else:
+                            st.error("Gagal mendapatkan prediksi dari MobileNetV2.")
+                    else:
+                        st.markdown("""
+                        <div class="warning-box">
+                            <h4>⚠ Model MobileNetV2 tidak dimuat</h4>
+                            <p>Prediksi tidak dapat dilakukan.</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+            
+                # ==============================================================================
+                # DETAIL PREDIKSI DENGAN PROGRESS BARS DAN KONSENSUS
+                # ==============================================================================
+                st.markdown("---")
+            
+                # Tampilkan detail prediksi jika scores tersedia
+                if vgg16_scores is not None and mobilenetv2_scores is not None and vgg16_class is not None and mobilenetv2_class is not None:
+                    # Konversi scores ke persentase jika belum
+                    if isinstance(vgg16_scores, np.ndarray):
+                        vgg16_scores_pct = vgg16_scores * 100 if vgg16_scores.max() <= 1.0 else vgg16_scores
+                    else:
+                        vgg16_scores_pct = [s * 100 if s <= 1.0 else s for s in vgg16_scores] if isinstance(vgg16_scores, (list, tuple)) else vgg16_scores
                 
-                if isinstance(mobilenetv2_scores_pct, np.ndarray):
-                    mobilenetv2_scores_list = mobilenetv2_scores_pct.tolist()
-                else:
-                    mobilenetv2_scores_list = list(mobilenetv2_scores_pct) if hasattr(mobilenetv2_scores_pct, '__iter__') else [mobilenetv2_scores_pct]
+                    if isinstance(mobilenetv2_scores, np.ndarray):
+                        mobilenetv2_scores_pct = mobilenetv2_scores * 100 if mobilenetv2_scores.max() <= 1.0 else mobilenetv2_scores
+                    else:
+                        mobilenetv2_scores_pct = [s * 100 if s <= 1.0 else s for s in mobilenetv2_scores] if isinstance(mobilenetv2_scores, (list, tuple)) else mobilenetv2_scores
                 
-                # Pastikan panjang scores sesuai dengan CLASS_NAMES
-                while len(vgg16_scores_list) < len(CLASS_NAMES):
-                    vgg16_scores_list.append(0.0)
-                while len(mobilenetv2_scores_list) < len(CLASS_NAMES):
-                    mobilenetv2_scores_list.append(0.0)
+                    # Pastikan scores dalam format yang benar
+                    if isinstance(vgg16_scores_pct, np.ndarray):
+                        vgg16_scores_list = vgg16_scores_pct.tolist()
+                    else:
+                        vgg16_scores_list = list(vgg16_scores_pct) if hasattr(vgg16_scores_pct, '__iter__') else [vgg16_scores_pct]
                 
-                # Tampilkan Detail Prediksi untuk kedua model dengan styling yang lebih elegan
-                st.markdown("""
-                <style>
-                    .detail-prediction {
-                        background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                        padding: 1.25rem;
-                        border-radius: 12px;
-                        border: 1px solid rgba(78, 205, 196, 0.3);
-                        margin-bottom: 1rem;
-                        box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-                    }
-                    .progress-bar-container {
-                        margin: 0.75rem 0;
-                    }
-                    .progress-bar {
-                        height: 32px;
-                        border-radius: 8px;
-                        display: flex;
-                        align-items: center;
-                        padding: 0 0.9rem;
-                        margin: 0.6rem 0;
-                        font-weight: 500;
-                        font-size: 0.85rem;
-                        position: relative;
-                        overflow: hidden;
-                        background: rgba(255, 255, 255, 0.1);
-                        border: 1px solid rgba(255, 255, 255, 0.15);
-                    }
-                    .progress-bar-defect {
-                        background: linear-gradient(135deg, rgba(231, 76, 60, 0.4) 0%, rgba(192, 57, 43, 0.4) 100%);
-                        color: #F5B7B1;
-                        border-color: rgba(231, 76, 60, 0.3);
-                    }
-                    .progress-bar-immature {
-                        background: linear-gradient(135deg, rgba(243, 156, 18, 0.4) 0%, rgba(230, 126, 34, 0.4) 100%);
-                        color: #F8C471;
-                        border-color: rgba(243, 156, 18, 0.3);
-                    }
-                    .progress-bar-mature {
-                        background: linear-gradient(135deg, rgba(46, 204, 113, 0.4) 0%, rgba(39, 174, 96, 0.4) 100%);
-                        color: #A8E6CF;
-                        border-color: rgba(46, 204, 113, 0.3);
-                    }
-                    .progress-bar-fill {
-                        position: absolute;
-                        left: 0;
-                        top: 0;
-                        height: 100%;
-                        background: rgba(255, 255, 255, 0.15);
-                        transition: width 0.4s ease;
-                        border-radius: 8px;
-                    }
-                    .progress-text {
-                        position: relative;
-                        z-index: 1;
-                        display: flex;
-                        justify-content: space-between;
-                        width: 100%;
-                        align-items: center;
-                    }
-                    .consensus-box {
-                        background: linear-gradient(135deg, rgba(46, 204, 113, 0.25) 0%, rgba(39, 174, 96, 0.25) 100%);
-                        padding: 1.5rem;
-                        border-radius: 15px;
-                        margin: 1.5rem 0;
-                        border: 1px solid rgba(46, 204, 113, 0.4);
-                        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                    }
-                    .recommendation-box {
-                        background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                        padding: 1rem;
-                        border-radius: 10px;
-                        border-left: 3px solid rgba(78, 205, 196, 0.5);
-                        margin-top: 1rem;
-                    }
-                </style>
-                """, unsafe_allow_html=True)
+                    if isinstance(mobilenetv2_scores_pct, np.ndarray):
+                        mobilenetv2_scores_list = mobilenetv2_scores_pct.tolist()
+                    else:
+                        mobilenetv2_scores_list = list(mobilenetv2_scores_pct) if hasattr(mobilenetv2_scores_pct, '__iter__') else [mobilenetv2_scores_pct]
                 
-                # Detail Prediksi untuk kedua model
-                col_detail1, col_detail2 = st.columns(2)
+                    # Pastikan panjang scores sesuai dengan CLASS_NAMES
+                    while len(vgg16_scores_list) < len(CLASS_NAMES):
+                        vgg16_scores_list.append(0.0)
+                    while len(mobilenetv2_scores_list) < len(CLASS_NAMES):
+                        mobilenetv2_scores_list.append(0.0)
                 
-                with col_detail1:
+                    # Tampilkan Detail Prediksi untuk kedua model dengan styling yang lebih elegan
                     st.markdown("""
-                    <div class="detail-prediction">
-                        <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 1rem; font-size: 1.1rem; display: flex; align-items: center; gap: 0.5rem;">
-                            <span>📊</span> Detail Prediksi - VGG16
-                        </h4>
-                    </div>
+                    <style>
+                        .detail-prediction {
+                            background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                            padding: 1.25rem;
+                            border-radius: 12px;
+                            border: 1px solid rgba(78, 205, 196, 0.3);
+                            margin-bottom: 1rem;
+                            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+                        }
+                        .progress-bar-container {
+                            margin: 0.75rem 0;
+                        }
+                        .progress-bar {
+                            height: 32px;
+                            border-radius: 8px;
+                            display: flex;
+                            align-items: center;
+                            padding: 0 0.9rem;
+                            margin: 0.6rem 0;
+                            font-weight: 500;
+                            font-size: 0.85rem;
+                            position: relative;
+                            overflow: hidden;
+                            background: rgba(255, 255, 255, 0.1);
+                            border: 1px solid rgba(255, 255, 255, 0.15);
+                        }
+                        .progress-bar-defect {
+                            background: linear-gradient(135deg, rgba(231, 76, 60, 0.4) 0%, rgba(192, 57, 43, 0.4) 100%);
+                            color: #F5B7B1;
+                            border-color: rgba(231, 76, 60, 0.3);
+                        }
+                        .progress-bar-immature {
+                            background: linear-gradient(135deg, rgba(243, 156, 18, 0.4) 0%, rgba(230, 126, 34, 0.4) 100%);
+                            color: #F8C471;
+                            border-color: rgba(243, 156, 18, 0.3);
+                        }
+                        .progress-bar-mature {
+                            background: linear-gradient(135deg, rgba(46, 204, 113, 0.4) 0%, rgba(39, 174, 96, 0.4) 100%);
+                            color: #A8E6CF;
+                            border-color: rgba(46, 204, 113, 0.3);
+                        }
+                        .progress-bar-fill {
+                            position: absolute;
+                            left: 0;
+                            top: 0;
+                            height: 100%;
+                            background: rgba(255, 255, 255, 0.15);
+                            transition: width 0.4s ease;
+                            border-radius: 8px;
+                        }
+                        .progress-text {
+                            position: relative;
+                            z-index: 1;
+                            display: flex;
+                            justify-content: space-between;
+                            width: 100%;
+                            align-items: center;
+                        }
+                        .consensus-box {
+                            background: linear-gradient(135deg, rgba(46, 204, 113, 0.25) 0%, rgba(39, 174, 96, 0.25) 100%);
+                            padding: 1.5rem;
+                            border-radius: 15px;
+                            margin: 1.5rem 0;
+                            border: 1px solid rgba(46, 204, 113, 0.4);
+                            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+                        }
+                        .recommendation-box {
+                            background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                            padding: 1rem;
+                            border-radius: 10px;
+                            border-left: 3px solid rgba(78, 205, 196, 0.5);
+                            margin-top: 1rem;
+                        }
+                    </style>
                     """, unsafe_allow_html=True)
+                
+                    # Detail Prediksi untuk kedua model
+                    col_detail1, col_detail2 = st.columns(2)
+                
+                    with col_detail1:
+                        st.markdown("""
+                        <div class="detail-prediction">
+                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 1rem; font-size: 1.1rem; display: flex; align-items: center; gap: 0.5rem;">
+                                <span>📊</span> Detail Prediksi - VGG16
+                            </h4>
+                        </div>
+                        """, unsafe_allow_html=True)
                     
-                    # Tampilkan progress bars untuk VGG16 - hanya jika confidence >= 80%
-                    if vgg16_confidence >= 80.0:
-                        for i, class_name in enumerate(CLASS_NAMES):
-                            score = vgg16_scores_list[i] if i < len(vgg16_scores_list) else 0.0
-                            bar_class = "progress-bar-defect" if "Defect" in class_name else "progress-bar-immature" if "Immature" in class_name else "progress-bar-mature"
-                            icon = "🍎" if "Defect" in class_name else "🍏" if "Immature" in class_name else "🍎"
-                            # Pastikan score tidak negatif dan tidak lebih dari 100
-                            score = max(0.0, min(100.0, float(score)))
+                        # Tampilkan progress bars untuk VGG16 - hanya jika confidence >= 80%
+                        if vgg16_confidence >= 80.0:
+                            for i, class_name in enumerate(CLASS_NAMES):
+                                score = vgg16_scores_list[i] if i < len(vgg16_scores_list) else 0.0
+                                bar_class = "progress-bar-defect" if "Defect" in class_name else "progress-bar-immature" if "Immature" in class_name else "progress-bar-mature"
+                                icon = "🍎" if "Defect" in class_name else "🍏" if "Immature" in class_name else "🍎"
+                                # Pastikan score tidak negatif dan tidak lebih dari 100
+                                score = max(0.0, min(100.0, float(score)))
                             
-                            st.markdown(f"""
-                            <div class="progress-bar-container">
-                                <div class="progress-bar {bar_class}" style="width: 100%;">
-                                    <div class="progress-bar-fill" style="width: {score:.1f}%;"></div>
-                                    <div class="progress-text">
-                                        <span style="font-size: 0.85rem;">{icon} {class_name}</span>
-                                        <span style="font-weight: 600; font-size: 0.9rem;">{score:.2f}%</span>
+                                st.markdown(f"""
+                                <div class="progress-bar-container">
+                                    <div class="progress-bar {bar_class}" style="width: 100%;">
+                                        <div class="progress-bar-fill" style="width: {score:.1f}%;"></div>
+                                        <div class="progress-text">
+                                            <span style="font-size: 0.85rem;">{icon} {class_name}</span>
+                                            <span style="font-weight: 600; font-size: 0.9rem;">{score:.2f}%</span>
+                                        </div>
                                     </div>
                                 </div>
+                                """, unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"""
+                            <div style="background: rgba(243, 156, 18, 0.15); padding: 0.75rem; border-radius: 8px; border: 1px solid rgba(243, 156, 18, 0.3);">
+                                <p style="color: #F8C471; margin: 0; font-size: 0.85rem; text-align: center;">
+                                    Confidence: {vgg16_confidence:.2f}% (Minimum 80% untuk menampilkan detail)
+                                </p>
                             </div>
                             """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div style="background: rgba(243, 156, 18, 0.15); padding: 0.75rem; border-radius: 8px; border: 1px solid rgba(243, 156, 18, 0.3);">
-                            <p style="color: #F8C471; margin: 0; font-size: 0.85rem; text-align: center;">
-                                Confidence: {vgg16_confidence:.2f}% (Minimum 80% untuk menampilkan detail)
-                            </p>
+                
+                    with col_detail2:
+                        st.markdown("""
+                        <div class="detail-prediction">
+                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 1rem; font-size: 1.1rem; display: flex; align-items: center; gap: 0.5rem;">
+                                <span>📊</span> Detail Prediksi - MobileNetV2
+                            </h4>
                         </div>
                         """, unsafe_allow_html=True)
-                
-                with col_detail2:
-                    st.markdown("""
-                    <div class="detail-prediction">
-                        <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 1rem; font-size: 1.1rem; display: flex; align-items: center; gap: 0.5rem;">
-                            <span>📊</span> Detail Prediksi - MobileNetV2
-                        </h4>
-                    </div>
-                    """, unsafe_allow_html=True)
                     
-                    # Tampilkan progress bars untuk MobileNetV2 - hanya jika confidence >= 80%
-                    if mobilenetv2_confidence >= 80.0:
-                        for i, class_name in enumerate(CLASS_NAMES):
-                            score = mobilenetv2_scores_list[i] if i < len(mobilenetv2_scores_list) else 0.0
-                            bar_class = "progress-bar-defect" if "Defect" in class_name else "progress-bar-immature" if "Immature" in class_name else "progress-bar-mature"
-                            icon = "🍎" if "Defect" in class_name else "🍏" if "Immature" in class_name else "🍎"
-                            # Pastikan score tidak negatif dan tidak lebih dari 100
-                            score = max(0.0, min(100.0, float(score)))
+                        # Tampilkan progress bars untuk MobileNetV2 - hanya jika confidence >= 80%
+                        if mobilenetv2_confidence >= 80.0:
+                            for i, class_name in enumerate(CLASS_NAMES):
+                                score = mobilenetv2_scores_list[i] if i < len(mobilenetv2_scores_list) else 0.0
+                                bar_class = "progress-bar-defect" if "Defect" in class_name else "progress-bar-immature" if "Immature" in class_name else "progress-bar-mature"
+                                icon = "🍎" if "Defect" in class_name else "🍏" if "Immature" in class_name else "🍎"
+                                # Pastikan score tidak negatif dan tidak lebih dari 100
+                                score = max(0.0, min(100.0, float(score)))
                             
-                            st.markdown(f"""
-                            <div class="progress-bar-container">
-                                <div class="progress-bar {bar_class}" style="width: 100%;">
-                                    <div class="progress-bar-fill" style="width: {score:.1f}%;"></div>
-                                    <div class="progress-text">
-                                        <span style="font-size: 0.85rem;">{icon} {class_name}</span>
-                                        <span style="font-weight: 600; font-size: 0.9rem;">{score:.2f}%</span>
+                                st.markdown(f"""
+                                <div class="progress-bar-container">
+                                    <div class="progress-bar {bar_class}" style="width: 100%;">
+                                        <div class="progress-bar-fill" style="width: {score:.1f}%;"></div>
+                                        <div class="progress-text">
+                                            <span style="font-size: 0.85rem;">{icon} {class_name}</span>
+                                            <span style="font-weight: 600; font-size: 0.9rem;">{score:.2f}%</span>
+                                        </div>
                                     </div>
                                 </div>
+                                """, unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"""
+                            <div style="background: rgba(243, 156, 18, 0.15); padding: 0.75rem; border-radius: 8px; border: 1px solid rgba(243, 156, 18, 0.3);">
+                                <p style="color: #F8C471; margin: 0; font-size: 0.85rem; text-align: center;">
+                                    Confidence: {mobilenetv2_confidence:.2f}% (Minimum 80% untuk menampilkan detail)
+                                </p>
                             </div>
                             """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div style="background: rgba(243, 156, 18, 0.15); padding: 0.75rem; border-radius: 8px; border: 1px solid rgba(243, 156, 18, 0.3);">
-                            <p style="color: #F8C471; margin: 0; font-size: 0.85rem; text-align: center;">
-                                Confidence: {mobilenetv2_confidence:.2f}% (Minimum 80% untuk menampilkan detail)
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
                 
-                # Konsensus Prediksi - Hanya tampilkan jika confidence rata-rata >= 80%
-                if vgg16_class == mobilenetv2_class and "Tidak Valid" not in vgg16_class:
-                    avg_confidence = (vgg16_confidence + mobilenetv2_confidence) / 2
+                    # Konsensus Prediksi - Hanya tampilkan jika confidence rata-rata >= 80%
+                    if vgg16_class == mobilenetv2_class and "Tidak Valid" not in vgg16_class:
+                        avg_confidence = (vgg16_confidence + mobilenetv2_confidence) / 2
                     
-                    # Hanya tampilkan konsensus jika confidence rata-rata >= 80%
-                    if avg_confidence >= 80.0:
-                        # Tentukan rekomendasi berdasarkan kelas
-                        if "Mature" in vgg16_class:
-                            recommendation = "Buah naga matang dan siap dikonsumsi"
-                        elif "Immature" in vgg16_class:
-                            recommendation = "Buah naga masih mentah, tunggu beberapa hari lagi"
-                        elif "Defect" in vgg16_class:
-                            recommendation = "Buah naga terdeteksi busuk, tidak disarankan untuk dikonsumsi"
-                        else:
-                            recommendation = "Hasil klasifikasi telah diperoleh"
+                        # Hanya tampilkan konsensus jika confidence rata-rata >= 80%
+                        if avg_confidence >= 80.0:
+                            # Tentukan rekomendasi berdasarkan kelas
+                            if "Mature" in vgg16_class:
+                                recommendation = "Buah naga matang dan siap dikonsumsi"
+                            elif "Immature" in vgg16_class:
+                                recommendation = "Buah naga masih mentah, tunggu beberapa hari lagi"
+                            elif "Defect" in vgg16_class:
+                                recommendation = "Buah naga terdeteksi busuk, tidak disarankan untuk dikonsumsi"
+                            else:
+                                recommendation = "Hasil klasifikasi telah diperoleh"
                         
-                        st.markdown(f"""
-                        <div class="consensus-box">
-                            <h4 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.15rem; display: flex; align-items: center; gap: 0.5rem;">
-                                <span>🤝</span> Konsensus Prediksi
-                            </h4>
-                            <div style="color: #D5E8E4; margin: 1rem 0;">
-                                <p style="font-size: 1rem; margin-bottom: 0.75rem; display: flex; align-items: center; gap: 0.5rem; color: #A8E6CF;">
-                                    ✅ <strong>Kedua Model Sepakat</strong>
-                                </p>
-                                <h3 style="font-size: 1.4rem; font-weight: 700; margin: 0.75rem 0; color: #E8F8F5;">{vgg16_class}</h3>
-                                <p style="font-size: 0.95rem; margin: 0.5rem 0; color: #D5E8E4;">
-                                    <strong>Rata-rata Keyakinan:</strong> <span style="color: #A8E6CF; font-weight: 700;">{avg_confidence:.2f}%</span>
-                                </p>
-                                <p style="font-size: 0.9rem; margin: 0.5rem 0; color: #BDD4DE;">
-                                    MobileNetV2: {mobilenetv2_confidence:.2f}% | VGG16: {vgg16_confidence:.2f}%
-                                </p>
+                            st.markdown(f"""
+                            <div class="consensus-box">
+                                <h4 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.15rem; display: flex; align-items: center; gap: 0.5rem;">
+                                    <span>🤝</span> Konsensus Prediksi
+                                </h4>
+                                <div style="color: #D5E8E4; margin: 1rem 0;">
+                                    <p style="font-size: 1rem; margin-bottom: 0.75rem; display: flex; align-items: center; gap: 0.5rem; color: #A8E6CF;">
+                                        ✅ <strong>Kedua Model Sepakat</strong>
+                                    </p>
+                                    <h3 style="font-size: 1.4rem; font-weight: 700; margin: 0.75rem 0; color: #E8F8F5;">{vgg16_class}</h3>
+                                    <p style="font-size: 0.95rem; margin: 0.5rem 0; color: #D5E8E4;">
+                                        <strong>Rata-rata Keyakinan:</strong> <span style="color: #A8E6CF; font-weight: 700;">{avg_confidence:.2f}%</span>
+                                    </p>
+                                    <p style="font-size: 0.9rem; margin: 0.5rem 0; color: #BDD4DE;">
+                                        MobileNetV2: {mobilenetv2_confidence:.2f}% | VGG16: {vgg16_confidence:.2f}%
+                                    </p>
+                                </div>
                             </div>
-                        </div>
                         
-                        <div class="recommendation-box">
-                            <p style="color: #BDD4DE; margin: 0; font-size: 0.95rem; display: flex; align-items: center; gap: 0.5rem;">
-                                <span>🍎</span> <strong>{recommendation}</strong>
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        # Confidence terlalu rendah, tampilkan pesan
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(243, 156, 18, 0.2) 0%, rgba(230, 126, 34, 0.2) 100%);
-                                    padding: 1rem;
-                                    border-radius: 12px;
-                                    border: 1px solid rgba(243, 156, 18, 0.4);
-                                    margin: 1.5rem 0;">
-                            <p style="color: #F8C471; margin: 0; font-size: 0.95rem; text-align: center;">
-                                ⚠️ <strong>Confidence terlalu rendah ({avg_confidence:.2f}%)</strong> - Konsensus hanya ditampilkan jika confidence ≥ 80%
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                            <div class="recommendation-box">
+                                <p style="color: #BDD4DE; margin: 0; font-size: 0.95rem; display: flex; align-items: center; gap: 0.5rem;">
+                                    <span>🍎</span> <strong>{recommendation}</strong>
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        else:
+                            # Confidence terlalu rendah, tampilkan pesan
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(243, 156, 18, 0.2) 0%, rgba(230, 126, 34, 0.2) 100%);
+                                        padding: 1rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(243, 156, 18, 0.4);
+                                        margin: 1.5rem 0;">
+                                <p style="color: #F8C471; margin: 0; font-size: 0.95rem; text-align: center;">
+                                    ⚠️ <strong>Confidence terlalu rendah ({avg_confidence:.2f}%)</strong> - Konsensus hanya ditampilkan jika confidence ≥ 80%
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
             
-            # ==============================================================================
-            # ANALISIS PERBANDINGAN MODEL - HASIL AKHIR PREDIKSI
-            # ==============================================================================
-            st.markdown("---")
-            st.markdown("""
-            <h2 style="font-size: 1.8rem; font-weight: 700; color: white; margin-top: 2rem; margin-bottom: 1rem; display: flex; align-items: center; gap: 0.5rem;">
-                <span style="display: inline-block; width: 24px; height: 24px; background: #4ECDC4; border-radius: 4px;"></span>
-                📊 Hasil Akhir Prediksi
-            </h2>
-            """, unsafe_allow_html=True)
+                # ==============================================================================
+                # ANALISIS PERBANDINGAN MODEL - HASIL AKHIR PREDIKSI
+                # ==============================================================================
+                st.markdown("---")
+                st.markdown("""
+                <h2 style="font-size: 1.8rem; font-weight: 700; color: white; margin-top: 2rem; margin-bottom: 1rem; display: flex; align-items: center; gap: 0.5rem;">
+                    <span style="display: inline-block; width: 24px; height: 24px; background: #4ECDC4; border-radius: 4px;"></span>
+                    📊 Hasil Akhir Prediksi
+                </h2>
+                """, unsafe_allow_html=True)
             
-            # Analisis perbandingan model
-            if vgg16_class is not None and mobilenetv2_class is not None:
-                # Tentukan apakah kedua model valid
-                # Model valid jika: (1) bukan "Tidak Valid", (2) ada confidence score, (3) class tidak None
-                vgg16_valid_prediction = ("Tidak Valid" not in vgg16_class and 
-                                         vgg16_class is not None and 
-                                         vgg16_confidence > 0)
-                mobilenetv2_valid_prediction = ("Tidak Valid" not in mobilenetv2_class and 
-                                               mobilenetv2_class is not None and 
-                                               mobilenetv2_confidence > 0)
+                # Analisis perbandingan model
+                if vgg16_class is not None and mobilenetv2_class is not None:
+                    # Tentukan apakah kedua model valid
+                    # Model valid jika: (1) bukan "Tidak Valid", (2) ada confidence score, (3) class tidak None
+                    vgg16_valid_prediction = ("Tidak Valid" not in vgg16_class and 
+                                             vgg16_class is not None and 
+                                             vgg16_confidence > 0)
+                    mobilenetv2_valid_prediction = ("Tidak Valid" not in mobilenetv2_class and 
+                                                   mobilenetv2_class is not None and 
+                                                   mobilenetv2_confidence > 0)
                 
-                # Analisis perbandingan
-                if vgg16_valid_prediction and mobilenetv2_valid_prediction:
-                    # Kedua model valid - bandingkan confidence dan hasil
-                    confidence_diff = abs(vgg16_confidence - mobilenetv2_confidence)
-                    same_class = vgg16_class == mobilenetv2_class
-                    
-                    # Cek kategori confidence
-                    # Tinggi: >= 80%, Sedang: 50-79%, Rendah: < 50%
-                    vgg16_high_confidence = vgg16_confidence >= 80 if vgg16_confidence > 0 else False
-                    vgg16_medium_confidence = 50 <= vgg16_confidence < 80 if vgg16_confidence > 0 else False
-                    vgg16_low_confidence = vgg16_confidence < 50 if vgg16_confidence > 0 else False
+                    # Analisis perbandingan
+                    if vgg16_valid_prediction and mobilenetv2_valid_prediction:
+                        # Kedua model valid - bandingkan confidence dan hasil
+                        confidence_diff = abs(vgg16_confidence - mobilenetv2_confidence)
+                        same_class = vgg16_class == mobilenetv2_class
                     
-                    mobilenetv2_high_confidence = mobilenetv2_confidence >= 80 if mobilenetv2_confidence > 0 else False
-                    mobilenetv2_medium_confidence = 50 <= mobilenetv2_confidence < 80 if mobilenetv2_confidence > 0 else False
-                    mobilenetv2_low_confidence = mobilenetv2_confidence < 50 if mobilenetv2_confidence > 0 else False
+                        # Cek kategori confidence
+                        # Tinggi: >= 80%, Sedang: 50-79%, Rendah: < 50%
+                        vgg16_high_confidence = vgg16_confidence >= 80 if vgg16_confidence > 0 else False
+                        vgg16_medium_confidence = 50 <= vgg16_confidence < 80 if vgg16_confidence > 0 else False
+                        vgg16_low_confidence = vgg16_confidence < 50 if vgg16_confidence > 0 else False
                     
-                    # Tentukan model terbaik berdasarkan confidence
-                    # Gunakan epsilon untuk menangani floating point precision
-                    epsilon = 0.1  # 0.1% tolerance (lebih longgar untuk mengakomodasi pembulatan)
+                        mobilenetv2_high_confidence = mobilenetv2_confidence >= 80 if mobilenetv2_confidence > 0 else False
+                        mobilenetv2_medium_confidence = 50 <= mobilenetv2_confidence < 80 if mobilenetv2_confidence > 0 else False
+                        mobilenetv2_low_confidence = mobilenetv2_confidence < 50 if mobilenetv2_confidence > 0 else False
                     
-                    if abs(vgg16_confidence - mobilenetv2_confidence) < epsilon:
-                        # Confidence sama (dalam toleransi)
-                        is_tie = True
-                        best_model = "Keduanya Sama"
-                        best_confidence = vgg16_confidence
-                        best_class = vgg16_class  # Gunakan prediksi dari salah satu (biasanya sama)
-                        worst_model = None
-                        worst_confidence = None
-                        confidence_diff = abs(vgg16_confidence - mobilenetv2_confidence)
-                        confidence_diff_percent = 0
-                        explanation = f"Kedua model (VGG16 dan MobileNetV2) memberikan confidence yang hampir identik (VGG16: {vgg16_confidence:.1f}% vs MobileNetV2: {mobilenetv2_confidence:.1f}%), dengan selisih hanya {confidence_diff:.2f}%. Ini menunjukkan bahwa kedua model sama-sama yakin dan konsisten dalam melakukan klasifikasi untuk gambar ini. Tidak ada perbedaan signifikan antara performa kedua model, sehingga keduanya dapat diandalkan untuk prediksi ini."
-                    elif vgg16_confidence > mobilenetv2_confidence:
-                        is_tie = False
-                        best_model = "VGG16"
-                        best_confidence = vgg16_confidence
-                        best_class = vgg16_class
-                        worst_model = "MobileNetV2"
-                        worst_confidence = mobilenetv2_confidence
-                        confidence_diff = vgg16_confidence - mobilenetv2_confidence
-                        confidence_diff_percent = ((vgg16_confidence - mobilenetv2_confidence) / mobilenetv2_confidence) * 100 if mobilenetv2_confidence > 0 else 0
-                        explanation = f"Model VGG16 dipilih sebagai model terbaik untuk gambar ini karena memiliki tingkat kepercayaan (confidence) yang lebih tinggi, yaitu {confidence_diff:.1f}% lebih tinggi ({confidence_diff_percent:.1f}% lebih baik) dibandingkan MobileNetV2. VGG16 mencapai confidence sebesar {vgg16_confidence:.1f}% untuk prediksi '{vgg16_class}', sedangkan MobileNetV2 hanya mencapai {mobilenetv2_confidence:.1f}%. Selisih ini menunjukkan bahwa VGG16 lebih yakin dan dapat lebih diandalkan untuk klasifikasi gambar ini."
-                    else:
-                        is_tie = False
-                        best_model = "MobileNetV2"
-                        best_confidence = mobilenetv2_confidence
-                        best_class = mobilenetv2_class
-                        worst_model = "VGG16"
-                        worst_confidence = vgg16_confidence
-                        confidence_diff = mobilenetv2_confidence - vgg16_confidence
-                        confidence_diff_percent = ((mobilenetv2_confidence - vgg16_confidence) / vgg16_confidence) * 100 if vgg16_confidence > 0 else 0
-                        explanation = f"Model MobileNetV2 dipilih sebagai model terbaik untuk gambar ini karena memiliki tingkat kepercayaan (confidence) yang lebih tinggi, yaitu {confidence_diff:.1f}% lebih tinggi ({confidence_diff_percent:.1f}% lebih baik) dibandingkan VGG16. MobileNetV2 mencapai confidence sebesar {mobilenetv2_confidence:.1f}% untuk prediksi '{mobilenetv2_class}', sedangkan VGG16 hanya mencapai {vgg16_confidence:.1f}%. Selisih ini menunjukkan bahwa MobileNetV2 lebih yakin dan dapat lebih diandalkan untuk klasifikasi gambar ini."
+                        # Tentukan model terbaik berdasarkan confidence
+                        # Gunakan epsilon untuk menangani floating point precision
+                        epsilon = 0.1  # 0.1% tolerance (lebih longgar untuk mengakomodasi pembulatan)
                     
-                    # Tampilkan analisis menggunakan custom styling yang lebih nyaman untuk mata
-                    st.markdown("---")
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                padding: 1.5rem;
-                                border-radius: 15px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;
-                                box-shadow: 0 4px 12px rgba(0,0,0,0.2);">
-                        <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
-                            🏆 Analisis Perbandingan Model
-                        </h3>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        if abs(vgg16_confidence - mobilenetv2_confidence) < epsilon:
+                            # Confidence sama (dalam toleransi)
+                            is_tie = True
+                            best_model = "Keduanya Sama"
+                            best_confidence = vgg16_confidence
+                            best_class = vgg16_class  # Gunakan prediksi dari salah satu (biasanya sama)
+                            worst_model = None
+                            worst_confidence = None
+                            confidence_diff = abs(vgg16_confidence - mobilenetv2_confidence)
+                            confidence_diff_percent = 0
+                            explanation = f"Kedua model (VGG16 dan MobileNetV2) memberikan confidence yang hampir identik (VGG16: {vgg16_confidence:.1f}% vs MobileNetV2: {mobilenetv2_confidence:.1f}%), dengan selisih hanya {confidence_diff:.2f}%. Ini menunjukkan bahwa kedua model sama-sama yakin dan konsisten dalam melakukan klasifikasi untuk gambar ini. Tidak ada perbedaan signifikan antara performa kedua model, sehingga keduanya dapat diandalkan untuk prediksi ini."
+                        elif vgg16_confidence > mobilenetv2_confidence:
+                            is_tie = False
+                            best_model = "VGG16"
+                            best_confidence = vgg16_confidence
+                            best_class = vgg16_class
+                            worst_model = "MobileNetV2"
+                            worst_confidence = mobilenetv2_confidence
+                            confidence_diff = vgg16_confidence - mobilenetv2_confidence
+                            confidence_diff_percent = ((vgg16_confidence - mobilenetv2_confidence) / mobilenetv2_confidence) * 100 if mobilenetv2_confidence > 0 else 0
+                            explanation = f"Model VGG16 dipilih sebagai model terbaik untuk gambar ini karena memiliki tingkat kepercayaan (confidence) yang lebih tinggi, yaitu {confidence_diff:.1f}% lebih tinggi ({confidence_diff_percent:.1f}% lebih baik) dibandingkan MobileNetV2. VGG16 mencapai confidence sebesar {vgg16_confidence:.1f}% untuk prediksi '{vgg16_class}', sedangkan MobileNetV2 hanya mencapai {mobilenetv2_confidence:.1f}%. Selisih ini menunjukkan bahwa VGG16 lebih yakin dan dapat lebih diandalkan untuk klasifikasi gambar ini."
+                        else:
+                            is_tie = False
+                            best_model = "MobileNetV2"
+                            best_confidence = mobilenetv2_confidence
+                            best_class = mobilenetv2_class
+                            worst_model = "VGG16"
+                            worst_confidence = vgg16_confidence
+                            confidence_diff = mobilenetv2_confidence - vgg16_confidence
+                            confidence_diff_percent = ((mobilenetv2_confidence - vgg16_confidence) / vgg16_confidence) * 100 if vgg16_confidence > 0 else 0
+                            explanation = f"Model MobileNetV2 dipilih sebagai model terbaik untuk gambar ini karena memiliki tingkat kepercayaan (confidence) yang lebih tinggi, yaitu {confidence_diff:.1f}% lebih tinggi ({confidence_diff_percent:.1f}% lebih baik) dibandingkan VGG16. MobileNetV2 mencapai confidence sebesar {mobilenetv2_confidence:.1f}% untuk prediksi '{mobilenetv2_class}', sedangkan VGG16 hanya mencapai {vgg16_confidence:.1f}%. Selisih ini menunjukkan bahwa MobileNetV2 lebih yakin dan dapat lebih diandalkan untuk klasifikasi gambar ini."
                     
-                    # Tampilkan perbandingan kedua model dengan styling yang lebih soft
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.7) 0%, rgba(52, 73, 94, 0.7) 100%);
-                                    padding: 1.25rem;
-                                    border-radius: 12px;
-                                    border: 1px solid rgba(78, 205, 196, 0.4);
-                                    margin-bottom: 1rem;">
-                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.1rem;">🔵 VGG16</h4>
-                            <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {vgg16_class}</p>
-                            <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> {vgg16_confidence:.1f}%</p>
+                        # Tampilkan analisis menggunakan custom styling yang lebih nyaman untuk mata
+                        st.markdown("---")
+                        st.markdown("""
+                        <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                                    padding: 1.5rem;
+                                    border-radius: 15px;
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
+                                    margin: 1rem 0;
+                                    box-shadow: 0 4px 12px rgba(0,0,0,0.2);">
+                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
+                                🏆 Analisis Perbandingan Model
+                            </h3>
                         </div>
                         """, unsafe_allow_html=True)
                     
-                    with col2:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.7) 0%, rgba(52, 73, 94, 0.7) 100%);
-                                    padding: 1.25rem;
-                                    border-radius: 12px;
-                                    border: 1px solid rgba(78, 205, 196, 0.4);
-                                    margin-bottom: 1rem;">
-                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.1rem;">🟢 MobileNetV2</h4>
-                            <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {mobilenetv2_class}</p>
-                            <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> {mobilenetv2_confidence:.1f}%</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        # Tampilkan perbandingan kedua model dengan styling yang lebih soft
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.7) 0%, rgba(52, 73, 94, 0.7) 100%);
+                                        padding: 1.25rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(78, 205, 196, 0.4);
+                                        margin-bottom: 1rem;">
+                                <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.1rem;">🔵 VGG16</h4>
+                                <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {vgg16_class}</p>
+                                <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> {vgg16_confidence:.1f}%</p>
+                            </div>
+                            """, unsafe_allow_html=True)
                     
-                    st.markdown("---")
+                        with col2:
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.7) 0%, rgba(52, 73, 94, 0.7) 100%);
+                                        padding: 1.25rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(78, 205, 196, 0.4);
+                                        margin-bottom: 1rem;">
+                                <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.1rem;">🟢 MobileNetV2</h4>
+                                <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {mobilenetv2_class}</p>
+                                <p style="color: #E8F8F5; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> {mobilenetv2_confidence:.1f}%</p>
+                            </div>
+                            """, unsafe_allow_html=True)
                     
-                    # Tampilkan model terbaik dengan styling yang lebih soft
-                    if is_tie:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.2) 0%, rgba(39, 174, 96, 0.2) 100%);
-                                    padding: 1rem;
-                                    border-radius: 12px;
-                                    border: 1px solid rgba(46, 204, 113, 0.4);
-                                    margin: 1rem 0;">
-                            <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
-                                ⭐ <strong>Hasil Perbandingan Model - Keduanya Sama Baik!</strong>
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        st.markdown(f"""
+                        st.markdown("---")
+                    
+                        # Tampilkan model terbaik dengan styling yang lebih soft
+                        if is_tie:
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.2) 0%, rgba(39, 174, 96, 0.2) 100%);
+                                        padding: 1rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(46, 204, 113, 0.4);
+                                        margin: 1rem 0;">
+                                <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
+                                    ⭐ <strong>Hasil Perbandingan Model - Keduanya Sama Baik!</strong>
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                                        padding: 1.25rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(78, 205, 196, 0.3);
+                                        margin: 1rem 0;">
+                                <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.2rem;">🤝 Keduanya Sama-Sama Baik!</h3>
+                                <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem; line-height: 1.6;">
+                                    VGG16 dan MobileNetV2 memberikan confidence yang <strong>identik</strong> sebesar <strong style="color: #A8E6CF;">{best_confidence:.1f}%</strong>
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        
+                            col_tie1, col_tie2 = st.columns(2)
+                            with col_tie1:
+                                st.markdown(f"""
+                                <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                                            padding: 1rem;
+                                            border-radius: 10px;
+                                            border: 1px solid rgba(78, 205, 196, 0.3);
+                                            margin-bottom: 1rem;">
+                                    <p style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">🔵 VGG16</p>
+                                    <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Confidence: <strong style="color: #A8E6CF;">{vgg16_confidence:.1f}%</strong></p>
+                                    <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Prediksi: <strong>{vgg16_class}</strong></p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                            with col_tie2:
+                                st.markdown(f"""
+                                <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                                            padding: 1rem;
+                                            border-radius: 10px;
+                                            border: 1px solid rgba(78, 205, 196, 0.3);
+                                            margin-bottom: 1rem;">
+                                    <p style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">🟢 MobileNetV2</p>
+                                    <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Confidence: <strong style="color: #A8E6CF;">{mobilenetv2_confidence:.1f}%</strong></p>
+                                    <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Prediksi: <strong>{mobilenetv2_class}</strong></p>
+                                </div>
+                                """, unsafe_allow_html=True)
+                        
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.15) 0%, rgba(39, 174, 96, 0.15) 100%);
+                                        padding: 1rem;
+                                        border-radius: 10px;
+                                        border-left: 4px solid rgba(46, 204, 113, 0.6);
+                                        margin: 1rem 0;">
+                                <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem; line-height: 1.6;">
+                                    ✅ <strong>Kesimpulan:</strong> Kedua model memberikan confidence yang identik ({best_confidence:.1f}%) untuk gambar ini. <strong>Tidak ada perbedaan</strong> antara performa VGG16 dan MobileNetV2. Keduanya sama-sama baik dan dapat diandalkan untuk klasifikasi ini.
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.2) 0%, rgba(69, 183, 209, 0.2) 100%);
+                                        padding: 1rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(78, 205, 196, 0.4);
+                                        margin: 1rem 0;">
+                                <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
+                                    ⭐ <strong>Model Terbaik untuk Gambar Ini</strong>
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                                        padding: 1.25rem;
+                                        border-radius: 12px;
+                                        border: 1px solid rgba(78, 205, 196, 0.3);
+                                        margin: 1rem 0;">
+                                <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.2rem;">🏆 {best_model}</h3>
+                                <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> <span style="color: #A8E6CF;">{best_confidence:.1f}%</span></p>
+                                <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {best_class}</p>
+                                <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Lebih baik {confidence_diff:.1f}%</strong> dari {worst_model} ({worst_confidence:.1f}%)</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
+                                        padding: 1rem;
+                                        border-radius: 10px;
+                                        border-left: 4px solid rgba(78, 205, 196, 0.6);
+                                        margin: 1rem 0;">
+                                <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem; line-height: 1.6;">
+                                    ✅ <strong>{best_model}</strong> adalah model terbaik untuk gambar ini dengan confidence <strong>{best_confidence:.1f}%</strong>, lebih tinggi <strong>{confidence_diff:.1f}%</strong> ({confidence_diff_percent:.1f}%) dibandingkan {worst_model}.
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                    
+                        st.markdown("---")
+                    
+                        # Kesimpulan dan Rekomendasi dengan styling yang lebih soft
+                        st.markdown("---")
+                        st.markdown("""
                         <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
                                     padding: 1.25rem;
                                     border-radius: 12px;
                                     border: 1px solid rgba(78, 205, 196, 0.3);
                                     margin: 1rem 0;">
-                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.2rem;">🤝 Keduanya Sama-Sama Baik!</h3>
-                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem; line-height: 1.6;">
-                                VGG16 dan MobileNetV2 memberikan confidence yang <strong>identik</strong> sebesar <strong style="color: #A8E6CF;">{best_confidence:.1f}%</strong>
-                            </p>
+                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.2rem;">📊 Kesimpulan dan Rekomendasi Analisis</h3>
                         </div>
                         """, unsafe_allow_html=True)
-                        
-                        col_tie1, col_tie2 = st.columns(2)
-                        with col_tie1:
+                    
+                        # Model Terbaik
+                        if is_tie:
                             st.markdown(f"""
-                            <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                        padding: 1rem;
+                            <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.15) 0%, rgba(39, 174, 96, 0.15) 100%);
+                                        padding: 0.75rem 1rem;
                                         border-radius: 10px;
-                                        border: 1px solid rgba(78, 205, 196, 0.3);
-                                        margin-bottom: 1rem;">
-                                <p style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">🔵 VGG16</p>
-                                <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Confidence: <strong style="color: #A8E6CF;">{vgg16_confidence:.1f}%</strong></p>
-                                <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Prediksi: <strong>{vgg16_class}</strong></p>
+                                        border-left: 4px solid rgba(46, 204, 113, 0.6);
+                                        margin: 0.5rem 0;">
+                                <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem;">
+                                    🎯 <strong>Model Terbaik:</strong> 🤝 Keduanya Sama-Sama Baik (VGG16 dan MobileNetV2)
+                                </p>
                             </div>
                             """, unsafe_allow_html=True)
-                        with col_tie2:
+                        else:
                             st.markdown(f"""
-                            <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                        padding: 1rem;
+                            <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
+                                        padding: 0.75rem 1rem;
                                         border-radius: 10px;
-                                        border: 1px solid rgba(78, 205, 196, 0.3);
-                                        margin-bottom: 1rem;">
-                                <p style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">🟢 MobileNetV2</p>
-                                <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Confidence: <strong style="color: #A8E6CF;">{mobilenetv2_confidence:.1f}%</strong></p>
-                                <p style="color: #D5E8E4; margin: 0.25rem 0; font-size: 0.9rem;">Prediksi: <strong>{mobilenetv2_class}</strong></p>
+                                        border-left: 4px solid rgba(78, 205, 196, 0.6);
+                                        margin: 0.5rem 0;">
+                                <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem;">
+                                    🎯 <strong>Model Terbaik:</strong> 🏆 {best_model}
+                                </p>
                             </div>
                             """, unsafe_allow_html=True)
-                        
+                    
+                        # Alasan Pemilihan
+                        st.markdown("""
+                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                                    padding: 1rem;
+                                    border-radius: 10px;
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
+                                    margin: 1rem 0;">
+                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">💡 Alasan Pemilihan Model:</h4>
+                            <p style="color: #D5E8E4; margin: 0; font-size: 0.9rem; line-height: 1.6;">{explanation}</p>
+                        </div>
+                        """.format(explanation=explanation), unsafe_allow_html=True)
+                    
+                        # Detail Perbandingan - Evaluasi conditional expression terlebih dahulu
+                        agreement_text = '✅ Kedua model sepakat dalam prediksi kelas yang sama' if same_class else '⚠️ Kedua model memberikan prediksi kelas yang berbeda'
+                        confidence_diff_text = '(hampir identik - keduanya sama baik)' if is_tie else f'({best_model} lebih tinggi dari {worst_model})'
+                    
                         st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.15) 0%, rgba(39, 174, 96, 0.15) 100%);
+                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
                                     padding: 1rem;
                                     border-radius: 10px;
-                                    border-left: 4px solid rgba(46, 204, 113, 0.6);
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
                                     margin: 1rem 0;">
-                            <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem; line-height: 1.6;">
-                                ✅ <strong>Kesimpulan:</strong> Kedua model memberikan confidence yang identik ({best_confidence:.1f}%) untuk gambar ini. <strong>Tidak ada perbedaan</strong> antara performa VGG16 dan MobileNetV2. Keduanya sama-sama baik dan dapat diandalkan untuk klasifikasi ini.
-                            </p>
+                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">📋 Detail Perbandingan:</h4>
+                            <ul style="color: #D5E8E4; margin: 0; padding-left: 1.5rem; font-size: 0.9rem; line-height: 1.8;">
+                                <li><strong>Kesepakatan Model:</strong> {agreement_text}</li>
+                                <li><strong>Selisih Confidence:</strong> {confidence_diff:.1f}% {confidence_diff_text}</li>
+                                <li><strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{best_class}</strong> dengan confidence <strong style="color: #A8E6CF;">{best_confidence:.1f}%</strong></li>
+                            </ul>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                        # Rekomendasi
+                        if not is_tie:
+                            recommendation_text = f"Gunakan prediksi dari **{best_model}** karena memiliki confidence **{confidence_diff:.1f}% lebih tinggi** ({confidence_diff_percent:.1f}% lebih baik) dibandingkan {worst_model}. Model ini lebih yakin dengan hasil klasifikasinya dan dapat diandalkan untuk menentukan tingkat kematangan buah naga pada gambar ini."
+                        else:
+                            recommendation_text = "Kedua model (**VGG16** dan **MobileNetV2**) sama-sama baik dan memberikan hasil yang konsisten dengan confidence yang hampir identik. Anda dapat menggunakan prediksi dari model mana saja karena keduanya memiliki tingkat kepercayaan yang sama. Hasil ini menunjukkan bahwa kedua model memiliki performa yang sebanding untuk gambar ini."
+                    
+                        st.markdown(f"""
+                        <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
+                                    padding: 1rem;
+                                    border-radius: 10px;
+                                    border-left: 4px solid rgba(78, 205, 196, 0.6);
+                                    margin: 1rem 0;">
+                            <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">✅ Rekomendasi:</h4>
+                            <p style="color: #D5E8E4; margin: 0; font-size: 0.9rem; line-height: 1.6;">{recommendation_text}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    elif vgg16_valid_prediction:
+                        # Hanya VGG16 yang valid
+                        st.markdown("---")
+                        st.markdown("""
+                        <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                                    padding: 1.5rem;
+                                    border-radius: 15px;
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
+                                    margin: 1rem 0;">
+                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
+                                🏆 Analisis Perbandingan Model
+                            </h3>
                         </div>
                         """, unsafe_allow_html=True)
-                    else:
                         st.markdown(f"""
                         <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.2) 0%, rgba(69, 183, 209, 0.2) 100%);
                                     padding: 1rem;
@@ -3340,314 +2143,172 @@ if uploaded_file is not None:
                                     border: 1px solid rgba(78, 205, 196, 0.4);
                                     margin: 1rem 0;">
                             <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
-                                ⭐ <strong>Model Terbaik untuk Gambar Ini</strong>
+                                ⭐ <strong>Model Terbaik: VGG16</strong>
                             </p>
                         </div>
                         """, unsafe_allow_html=True)
                         st.markdown(f"""
+                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                                    padding: 1rem;
+                                    border-radius: 10px;
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
+                                    margin: 1rem 0;">
+                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;">
+                                ✅ <strong>VGG16</strong> berhasil melakukan klasifikasi dengan confidence <strong style="color: #A8E6CF;">{vgg16_confidence:.1f}%</strong>.
+                            </p>
+                            <p style="color: #F5B7B1; margin: 0.5rem 0; font-size: 0.95rem;">
+                                ⚠️ MobileNetV2 tidak dapat memberikan prediksi yang valid untuk gambar ini.
+                            </p>
+                            <p style="color: #BDD4DE; margin: 0.5rem 0; font-size: 0.95rem;">
+                                <strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{vgg16_class}</strong>
+                            </p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    elif mobilenetv2_valid_prediction:
+                        # Hanya MobileNetV2 yang valid
+                        st.markdown("---")
+                        st.markdown("""
                         <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                    padding: 1.25rem;
-                                    border-radius: 12px;
+                                    padding: 1.5rem;
+                                    border-radius: 15px;
                                     border: 1px solid rgba(78, 205, 196, 0.3);
                                     margin: 1rem 0;">
-                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.2rem;">🏆 {best_model}</h3>
-                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Confidence:</strong> <span style="color: #A8E6CF;">{best_confidence:.1f}%</span></p>
-                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Prediksi:</strong> {best_class}</p>
-                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;"><strong>Lebih baik {confidence_diff:.1f}%</strong> dari {worst_model} ({worst_confidence:.1f}%)</p>
+                            <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
+                                🏆 Analisis Perbandingan Model
+                            </h3>
                         </div>
                         """, unsafe_allow_html=True)
                         st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
+                        <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.2) 0%, rgba(69, 183, 209, 0.2) 100%);
                                     padding: 1rem;
-                                    border-radius: 10px;
-                                    border-left: 4px solid rgba(78, 205, 196, 0.6);
+                                    border-radius: 12px;
+                                    border: 1px solid rgba(78, 205, 196, 0.4);
                                     margin: 1rem 0;">
-                            <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem; line-height: 1.6;">
-                                ✅ <strong>{best_model}</strong> adalah model terbaik untuk gambar ini dengan confidence <strong>{best_confidence:.1f}%</strong>, lebih tinggi <strong>{confidence_diff:.1f}%</strong> ({confidence_diff_percent:.1f}%) dibandingkan {worst_model}.
+                            <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
+                                ⭐ <strong>Model Terbaik: MobileNetV2</strong>
                             </p>
                         </div>
                         """, unsafe_allow_html=True)
-                    
-                    st.markdown("---")
-                    
-                    # Kesimpulan dan Rekomendasi dengan styling yang lebih soft
-                    st.markdown("---")
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                padding: 1.25rem;
-                                border-radius: 12px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.2rem;">📊 Kesimpulan dan Rekomendasi Analisis</h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Model Terbaik
-                    if is_tie:
                         st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(46, 204, 113, 0.15) 0%, rgba(39, 174, 96, 0.15) 100%);
-                                    padding: 0.75rem 1rem;
+                        <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
+                                    padding: 1rem;
                                     border-radius: 10px;
-                                    border-left: 4px solid rgba(46, 204, 113, 0.6);
-                                    margin: 0.5rem 0;">
-                            <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem;">
-                                🎯 <strong>Model Terbaik:</strong> 🤝 Keduanya Sama-Sama Baik (VGG16 dan MobileNetV2)
+                                    border: 1px solid rgba(78, 205, 196, 0.3);
+                                    margin: 1rem 0;">
+                            <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;">
+                                ✅ <strong>MobileNetV2</strong> berhasil melakukan klasifikasi dengan confidence <strong style="color: #A8E6CF;">{mobilenetv2_confidence:.1f}%</strong>.
+                            </p>
+                            <p style="color: #F5B7B1; margin: 0.5rem 0; font-size: 0.95rem;">
+                                ⚠️ VGG16 tidak dapat memberikan prediksi yang valid untuk gambar ini.
+                            </p>
+                            <p style="color: #BDD4DE; margin: 0.5rem 0; font-size: 0.95rem;">
+                                <strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{mobilenetv2_class}</strong>
                             </p>
                         </div>
                         """, unsafe_allow_html=True)
                     else:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
-                                    padding: 0.75rem 1rem;
-                                    border-radius: 10px;
-                                    border-left: 4px solid rgba(78, 205, 196, 0.6);
-                                    margin: 0.5rem 0;">
-                            <p style="color: #A8E6CF; margin: 0; font-size: 0.95rem;">
-                                🎯 <strong>Model Terbaik:</strong> 🏆 {best_model}
+                        # Tidak ada model yang valid
+                        st.markdown("---")
+                        st.markdown("""
+                        <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
+                                    padding: 1.5rem;
+                                    border-radius: 15px;
+                                    border: 1px solid rgba(231, 76, 60, 0.4);
+                                    margin: 1rem 0;">
+                            <h3 style="color: #F5B7B1; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
+                                ⚠️ Analisis Perbandingan Model
+                            </h3>
+                        </div>
+                        """, unsafe_allow_html=True)
+                        st.markdown("""
+                        <div style="background: linear-gradient(135deg, rgba(231, 76, 60, 0.2) 0%, rgba(192, 57, 43, 0.2) 100%);
+                                    padding: 1rem;
+                                    border-radius: 12px;
+                                    border: 1px solid rgba(231, 76, 60, 0.4);
+                                    margin: 1rem 0;">
+                            <p style="color: #F5B7B1; font-weight: 600; margin: 0; font-size: 1.05rem;">
+                                ❌ <strong>Tidak Ada Model yang Valid</strong>
                             </p>
                         </div>
                         """, unsafe_allow_html=True)
-                    
-                    # Alasan Pemilihan
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                padding: 1rem;
-                                border-radius: 10px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">💡 Alasan Pemilihan Model:</h4>
-                        <p style="color: #D5E8E4; margin: 0; font-size: 0.9rem; line-height: 1.6;">{explanation}</p>
-                    </div>
-                    """.format(explanation=explanation), unsafe_allow_html=True)
-                    
-                    # Detail Perbandingan - Evaluasi conditional expression terlebih dahulu
-                    agreement_text = '✅ Kedua model sepakat dalam prediksi kelas yang sama' if same_class else '⚠️ Kedua model memberikan prediksi kelas yang berbeda'
-                    confidence_diff_text = '(hampir identik - keduanya sama baik)' if is_tie else f'({best_model} lebih tinggi dari {worst_model})'
-                    
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                padding: 1rem;
-                                border-radius: 10px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">📋 Detail Perbandingan:</h4>
-                        <ul style="color: #D5E8E4; margin: 0; padding-left: 1.5rem; font-size: 0.9rem; line-height: 1.8;">
-                            <li><strong>Kesepakatan Model:</strong> {agreement_text}</li>
-                            <li><strong>Selisih Confidence:</strong> {confidence_diff:.1f}% {confidence_diff_text}</li>
-                            <li><strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{best_class}</strong> dengan confidence <strong style="color: #A8E6CF;">{best_confidence:.1f}%</strong></li>
-                        </ul>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Rekomendasi
-                    if not is_tie:
-                        recommendation_text = f"Gunakan prediksi dari **{best_model}** karena memiliki confidence **{confidence_diff:.1f}% lebih tinggi** ({confidence_diff_percent:.1f}% lebih baik) dibandingkan {worst_model}. Model ini lebih yakin dengan hasil klasifikasinya dan dapat diandalkan untuk menentukan tingkat kematangan buah naga pada gambar ini."
-                    else:
-                        recommendation_text = "Kedua model (**VGG16** dan **MobileNetV2**) sama-sama baik dan memberikan hasil yang konsisten dengan confidence yang hampir identik. Anda dapat menggunakan prediksi dari model mana saja karena keduanya memiliki tingkat kepercayaan yang sama. Hasil ini menunjukkan bahwa kedua model memiliki performa yang sebanding untuk gambar ini."
-                    
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.15) 0%, rgba(69, 183, 209, 0.15) 100%);
-                                padding: 1rem;
-                                border-radius: 10px;
-                                border-left: 4px solid rgba(78, 205, 196, 0.6);
-                                margin: 1rem 0;">
-                        <h4 style="color: #BDD4DE; font-weight: 600; margin-bottom: 0.75rem; font-size: 1.05rem;">✅ Rekomendasi:</h4>
-                        <p style="color: #D5E8E4; margin: 0; font-size: 0.9rem; line-height: 1.6;">{recommendation_text}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                elif vgg16_valid_prediction:
-                    # Hanya VGG16 yang valid
-                    st.markdown("---")
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                padding: 1.5rem;
-                                border-radius: 15px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
-                            🏆 Analisis Perbandingan Model
-                        </h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.2) 0%, rgba(69, 183, 209, 0.2) 100%);
-                                padding: 1rem;
-                                border-radius: 12px;
-                                border: 1px solid rgba(78, 205, 196, 0.4);
-                                margin: 1rem 0;">
-                        <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
-                            ⭐ <strong>Model Terbaik: VGG16</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                padding: 1rem;
-                                border-radius: 10px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;">
-                            ✅ <strong>VGG16</strong> berhasil melakukan klasifikasi dengan confidence <strong style="color: #A8E6CF;">{vgg16_confidence:.1f}%</strong>.
-                        </p>
-                        <p style="color: #F5B7B1; margin: 0.5rem 0; font-size: 0.95rem;">
-                            ⚠️ MobileNetV2 tidak dapat memberikan prediksi yang valid untuk gambar ini.
-                        </p>
-                        <p style="color: #BDD4DE; margin: 0.5rem 0; font-size: 0.95rem;">
-                            <strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{vgg16_class}</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                elif mobilenetv2_valid_prediction:
-                    # Hanya MobileNetV2 yang valid
-                    st.markdown("---")
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                padding: 1.5rem;
-                                border-radius: 15px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <h3 style="color: #E8F8F5; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
-                            🏆 Analisis Perbandingan Model
-                        </h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(78, 205, 196, 0.2) 0%, rgba(69, 183, 209, 0.2) 100%);
-                                padding: 1rem;
-                                border-radius: 12px;
-                                border: 1px solid rgba(78, 205, 196, 0.4);
-                                margin: 1rem 0;">
-                        <p style="color: #A8E6CF; font-weight: 600; margin: 0; font-size: 1.05rem;">
-                            ⭐ <strong>Model Terbaik: MobileNetV2</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, rgba(44, 62, 80, 0.6) 0%, rgba(52, 73, 94, 0.6) 100%);
-                                padding: 1rem;
-                                border-radius: 10px;
-                                border: 1px solid rgba(78, 205, 196, 0.3);
-                                margin: 1rem 0;">
-                        <p style="color: #D5E8E4; margin: 0.5rem 0; font-size: 0.95rem;">
-                            ✅ <strong>MobileNetV2</strong> berhasil melakukan klasifikasi dengan confidence <strong style="color: #A8E6CF;">{mobilenetv2_confidence:.1f}%</strong>.
-                        </p>
-                        <p style="color: #F5B7B1; margin: 0.5rem 0; font-size: 0.95rem;">
-                            ⚠️ VGG16 tidak dapat memberikan prediksi yang valid untuk gambar ini.
-                        </p>
-                        <p style="color: #BDD4DE; margin: 0.5rem 0; font-size: 0.95rem;">
-                            <strong>Prediksi Final:</strong> <strong style="color: #A8E6CF;">{mobilenetv2_class}</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        st.warning("⚠️ Kedua model (VGG16 dan MobileNetV2) tidak dapat memberikan prediksi yang valid untuk gambar ini. Kemungkinan gambar yang diunggah bukan buah naga atau memiliki kualitas yang tidak memadai.")
                 else:
-                    # Tidak ada model yang valid
-                    st.markdown("---")
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(26, 26, 46, 0.85) 0%, rgba(22, 33, 62, 0.85) 100%);
-                                padding: 1.5rem;
-                                border-radius: 15px;
-                                border: 1px solid rgba(231, 76, 60, 0.4);
-                                margin: 1rem 0;">
-                        <h3 style="color: #F5B7B1; font-weight: 600; margin-bottom: 1rem; font-size: 1.3rem;">
-                            ⚠️ Analisis Perbandingan Model
-                        </h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown("""
-                    <div style="background: linear-gradient(135deg, rgba(231, 76, 60, 0.2) 0%, rgba(192, 57, 43, 0.2) 100%);
-                                padding: 1rem;
-                                border-radius: 12px;
-                                border: 1px solid rgba(231, 76, 60, 0.4);
-                                margin: 1rem 0;">
-                        <p style="color: #F5B7B1; font-weight: 600; margin: 0; font-size: 1.05rem;">
-                            ❌ <strong>Tidak Ada Model yang Valid</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.warning("⚠️ Kedua model (VGG16 dan MobileNetV2) tidak dapat memberikan prediksi yang valid untuk gambar ini. Kemungkinan gambar yang diunggah bukan buah naga atau memiliki kualitas yang tidak memadai.")
-            else:
-                # Jika salah satu atau kedua class adalah None
-                if vgg16_class is None or mobilenetv2_class is None:
-                    st.markdown("---")
-                    st.subheader("⚠️ Analisis Perbandingan Model")
-                    st.error("**Tidak Dapat Melakukan Perbandingan**")
-                    st.warning("⚠️ Sistem tidak dapat melakukan perbandingan karena salah satu atau kedua model tidak memberikan hasil prediksi. Pastikan kedua model sudah dimuat dengan benar dan gambar yang diunggah adalah buah naga.")
+                    # Jika salah satu atau kedua class adalah None
+                    if vgg16_class is None or mobilenetv2_class is None:
+                        st.markdown("---")
+                        st.subheader("⚠️ Analisis Perbandingan Model")
+                        st.error("**Tidak Dapat Melakukan Perbandingan**")
+                        st.warning("⚠️ Sistem tidak dapat melakukan perbandingan karena salah satu atau kedua model tidak memberikan hasil prediksi. Pastikan kedua model sudah dimuat dengan benar dan gambar yang diunggah adalah buah naga.")
             
-            # --- LOGIKA TAMPILKAN GRAFIK ---
-            # Hanya tampilkan bagian grafik jika setidaknya satu valid DAN skor ada DAN bukan "Tidak Valid"
-            vgg16_is_not_invalid = vgg16_class is not None and "Tidak Valid" not in vgg16_class
-            mobilenetv2_is_not_invalid = mobilenetv2_class is not None and "Tidak Valid" not in mobilenetv2_class
+                # --- LOGIKA TAMPILKAN GRAFIK ---
+                # Hanya tampilkan bagian grafik jika setidaknya satu valid DAN skor ada DAN bukan "Tidak Valid"
+                vgg16_is_not_invalid = vgg16_class is not None and "Tidak Valid" not in vgg16_class
+                mobilenetv2_is_not_invalid = mobilenetv2_class is not None and "Tidak Valid" not in mobilenetv2_class
             
-            if (vgg16_is_valid or mobilenetv2_is_valid) and (vgg16_scores is not None and mobilenetv2_scores is not None) and (vgg16_is_not_invalid or mobilenetv2_is_not_invalid):
-                st.markdown("---")
-                st.markdown("### Distribusi Tingkat Kepercayaan") # Dihapus (Lokal)
-                col_chart1, col_chart2 = st.columns(2)
+                if (vgg16_is_valid or mobilenetv2_is_valid) and (vgg16_scores is not None and mobilenetv2_scores is not None) and (vgg16_is_not_invalid or mobilenetv2_is_not_invalid):
+                    st.markdown("---")
+                    st.markdown("### Distribusi Tingkat Kepercayaan") # Dihapus (Lokal)
+                    col_chart1, col_chart2 = st.columns(2)
                 
-                with col_chart1:
-                    # Hanya tampilkan grafik VGG16 jika valid
-                    if vgg16_is_valid:
-                        fig, ax = plt.subplots(figsize=(8, 6))
-                        sns.barplot(x=CLASS_NAMES, y=vgg16_scores, palette="viridis", ax=ax)
-                        ax.set_title("VGG16 Confidence Scores") # Dihapus (Lokal)
-                        ax.set_ylabel("Confidence")
-                        ax.set_xlabel("Class")
-                        ax.tick_params(axis='x', rotation=45)
-                        st.pyplot(fig)
-                    else:
-                        st.info("Grafik VGG16 tidak tersedia - hasil prediksi tidak valid")
-
-                with col_chart2:
-                    # Hanya tampilkan grafik MobileNetV2 jika valid
-                    if mobilenetv2_is_valid:
-                        fig, ax = plt.subplots(figsize=(8, 6))
-                        sns.barplot(x=CLASS_NAMES, y=mobilenetv2_scores, palette="plasma", ax=ax)
-                        ax.set_title("MobileNetV2 Confidence Scores") # Dihapus (Lokal)
-                        ax.set_ylabel("Confidence")
-                        ax.set_xlabel("Class")
-                        ax.tick_params(axis='x', rotation=45)
-                        st.pyplot(fig)
-                    else:
-                        st.info("Grafik MobileNetV2 tidak tersedia - hasil prediksi tidak valid")
+                    # Grafik Vega-Lite di-render di browser (lihat charts.py), bukan figure matplotlib di server
+                    with col_chart1:
+                        # Hanya tampilkan grafik VGG16 jika valid
+                        if vgg16_is_valid:
+                            st.vega_lite_chart(confidence_chart_spec(CLASS_NAMES, vgg16_scores, "VGG16 Confidence Scores", "viridis"),
+                                               use_container_width=True)
+                        else:
+                            st.info("Grafik VGG16 tidak tersedia - hasil prediksi tidak valid")
+
+                    with col_chart2:
+                        # Hanya tampilkan grafik MobileNetV2 jika valid
+                        if mobilenetv2_is_valid:
+                            st.vega_lite_chart(confidence_chart_spec(CLASS_NAMES, mobilenetv2_scores, "MobileNetV2 Confidence Scores", "plasma"),
+                                               use_container_width=True)
+                        else:
+                            st.info("Grafik MobileNetV2 tidak tersedia - hasil prediksi tidak valid")
             
-            # Tampilkan info box
-            st.markdown("---")
-            st.markdown("""
-            <div class="info-box">
-                <h4>💡 Informasi Penting</h4>
-                <ul>
-                    <li>Akurasi prediksi bergantung pada kualitas model (file .h5)</li>
-                    <li>Tingkat kepercayaan menunjukkan seberapa yakin model terhadap prediksinya</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True) # Disederhanakan
+                # Tampilkan info box
+                st.markdown("---")
+                st.markdown("""
+                <div class="info-box">
+                    <h4>💡 Informasi Penting</h4>
+                    <ul>
+                        <li>Akurasi prediksi bergantung pada kualitas model (file .h5)</li>
+                        <li>Tingkat kepercayaan menunjukkan seberapa yakin model terhadap prediksinya</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True) # Disederhanakan
+        
+            else:
+                st.markdown(f"""
+                <div class="warning-box">
+                    <h4>❌ Terjadi Kesalahan</h4>
+                    <p>Terjadi kesalahan saat memproses gambar. Prediksi dibatalkan.</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+        except Exception as e:
+            # Format error message dengan aman untuk menghindari menampilkan kode mentah
+            error_message = str(e)
+            # Hapus karakter yang mungkin menyebabkan masalah dalam HTML
+            error_message = error_message.replace('<', '&lt;').replace('>', '&gt;')
+            # Batasi panjang error message untuk menghindari menampilkan terlalu banyak detail teknis
+            if len(error_message) > 200:
+                error_message = error_message[:200] + "..."
         
-        else:
             st.markdown(f"""
             <div class="warning-box">
                 <h4>❌ Terjadi Kesalahan</h4>
-                <p>Terjadi kesalahan saat memproses gambar. Prediksi dibatalkan.</p>
+                <p>Terjadi kesalahan saat membuka atau memproses gambar.</p>
+                <p><strong>Error:</strong> {error_message}</p>
+                <p>Pastikan gambar yang diunggah adalah file gambar yang valid (JPG/PNG).</p>
             </div>
             """, unsafe_allow_html=True)
+    
+    record_rerun_timing("classification_fragment", fragment_start)
 
-    except Exception as e:
-        # Format error message dengan aman untuk menghindari menampilkan kode mentah
-        error_message = str(e)
-        # Hapus karakter yang mungkin menyebabkan masalah dalam HTML
-        error_message = error_message.replace('<', '&lt;').replace('>', '&gt;')
-        # Batasi panjang error message untuk menghindari menampilkan terlalu banyak detail teknis
-        if len(error_message) > 200:
-            error_message = error_message[:200] + "..."
-        
-        st.markdown(f"""
-        <div class="warning-box">
-            <h4>❌ Terjadi Kesalahan</h4>
-            <p>Terjadi kesalahan saat membuka atau memproses gambar.</p>
-            <p><strong>Error:</strong> {error_message}</p>
-            <p>Pastikan gambar yang diunggah adalah file gambar yang valid (JPG/PNG).</p>
-        </div>
-        """, unsafe_allow_html=True)
+render_classification()
 
 st.markdown("---")
 
@@ -3658,3 +2319,5 @@ st.markdown("""
     <p style="color: #BDC3C7; font-size: 0.9rem; margin: 0;">© 2024 - Sistem Klasifikasi Tingkat Kematangan Buah Naga</p>
 </div>
 """, unsafe_allow_html=True)
+
+record_rerun_timing("full_rerun", RERUN_START)
@@ -0,0 +1,300 @@
+"""
+Autotune ukuran batch scheduler dan thread TensorFlow (intra/inter-op) per host.
+
+Untuk setiap model yang dimuat, forward pass diukur di beberapa ukuran batch dan kombinasi thread. Dipilih:
+    bulk_batch        - throughput tertinggi dengan p95 <= target (--target-p95-ms / AUTOTUNE_TARGET_P95_MS)
+    interactive_batch - throughput tertinggi dengan p95 <= INTERACTIVE_SLO_MS (scheduler.py)
+    threads           - kombinasi dengan rata-rata geometrik throughput terbaik semua model (thread TF berlaku
+                        untuk seluruh proses, jadi satu setelan per host)
+Hasil disimpan per fingerprint host (CPU, jumlah core, versi TensorFlow) di model_results/autotune.json dan
+dipakai api.py saat startup: thread di-set sebelum model dimuat, ukuran batch ke InferenceScheduler.configure.
+
+Thread TF hanya bisa diatur sebelum runtime TF diinisialisasi, sehingga tiap kombinasi thread diukur di
+subprocess terpisah. Dengan AUTOTUNE_ON_STARTUP=1 dan belum ada profil untuk host ini, api.py menjalankan sweep
+ukuran batch saja (thread saat ini) di background setelah API ready. Semua pengukuran lewat InferenceScheduler
+(lane bulk), jadi tidak pernah bersamaan dengan forward pass request dan request interactive tetap didahulukan.
+
+Contoh:
+    python autotune.py run                                   # sweep penuh, simpan profil host ini
+    python autotune.py run --batch-sizes 1,4,16,32 --target-p95-ms 1500
+    python autotune.py show
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import platform
+import argparse
+import subprocess
+
+import numpy as np
+
+from scheduler import LANE_BULK, LANE_INTERACTIVE, LANE_SLO_SECONDS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTOTUNE_FILE = os.getenv("AUTOTUNE_FILE", os.path.join(BASE_DIR, 'model_results', 'autotune.json'))
+AUTOTUNE_APPLY = os.getenv("AUTOTUNE_APPLY", "1") == "1"
+AUTOTUNE_ON_STARTUP = os.getenv("AUTOTUNE_ON_STARTUP", "0") == "1"
+AUTOTUNE_TARGET_P95_MS = float(os.getenv("AUTOTUNE_TARGET_P95_MS", "2000"))
+DEFAULT_BATCH_SIZES = (1, 2, 4, 8, 16, 32, 64)
+DEFAULT_REPEATS = 10
+
+
+def host_fingerprint():
+    """Identitas host untuk profil tuning: arsitektur, CPU, jumlah core, versi TensorFlow"""
+    try:
+        from importlib.metadata import version
+        tf_version = version("tensorflow")
+    except Exception:
+        tf_version = "unknown"
+    parts = [platform.machine(), platform.processor() or platform.uname().processor, str(os.cpu_count()),
+             platform.system(), tf_version]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+
+# ==============================================================================
+# PROFIL (PERSISTEN PER HOST)
+# ==============================================================================
+
+def load_profiles(path=AUTOTUNE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_profile(path=AUTOTUNE_FILE):
+    """Profil host ini, atau None jika belum pernah di-tune"""
+    return load_profiles(path).get(host_fingerprint())
+
+
+def save_profile(profile, path=AUTOTUNE_FILE):
+    profiles = load_profiles(path)
+    profiles[host_fingerprint()] = profile
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+
+
+def try_save_profile(profile, path=AUTOTUNE_FILE):
+    """save_profile best-effort (misal filesystem read-only di hosting): profil tetap berlaku di proses ini"""
+    try:
+        save_profile(profile, path)
+        return True
+    except OSError as e:
+        print(f"⚠️ Profil autotune tidak dapat disimpan ke {path}, hanya berlaku sampai restart: {e}")
+        return False
+
+
+def apply_thread_settings(profile, tf):
+    """Set thread intra/inter-op TF dari profil; harus dipanggil sebelum runtime TF diinisialisasi"""
+    threads = (profile or {}).get("threads") or {}
+    try:
+        if threads.get("intra") is not None:
+            tf.config.threading.set_intra_op_parallelism_threads(int(threads["intra"]))
+        if threads.get("inter") is not None:
+            tf.config.threading.set_inter_op_parallelism_threads(int(threads["inter"]))
+    except RuntimeError as e:
+        print(f"⚠️ Thread TF dari autotune tidak bisa diterapkan (runtime sudah aktif): {e}")
+        return False
+    return bool(threads)
+
+
+def apply_batch_sizes(profile, scheduler):
+    """Ukuran batch per model dari profil -> InferenceScheduler.configure"""
+    for model_key, tuned in ((profile or {}).get("models") or {}).items():
+        scheduler.configure(model_key, tuned.get("interactive_batch"), tuned.get("bulk_batch"))
+
+
+def tuned_batch_sizes(profile):
+    """Semua ukuran batch di profil (untuk warm-up)"""
+    sizes = set()
+    for tuned in ((profile or {}).get("models") or {}).values():
+        sizes.update(size for size in (tuned.get("interactive_batch"), tuned.get("bulk_batch")) if size)
+    return sorted(sizes)
+
+
+# ==============================================================================
+# PENGUKURAN
+# ==============================================================================
+
+def measure(forward, batch_size, height, width, repeats=DEFAULT_REPEATS, warmup=2):
+    """Latensi forward satu ukuran batch: dict p50/p95 (ms) dan throughput (gambar/detik)"""
+    batch = np.random.default_rng(0).random((batch_size, height, width, 3), dtype=np.float32)
+    for _ in range(warmup):
+        forward(batch)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        forward(batch)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    return {
+        "batch_size": batch_size,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+        "throughput": round(batch_size / float(latencies.mean()), 2),
+    }
+
+
+def pick_batch(measurements, target_p95_ms):
+    """Ukuran batch dengan throughput tertinggi yang p95-nya <= target (fallback: batch dengan p95 terendah)"""
+    eligible = [m for m in measurements if m["p95_ms"] <= target_p95_ms]
+    if not eligible:
+        return min(measurements, key=lambda m: m["p95_ms"])
+    return max(eligible, key=lambda m: m["throughput"])
+
+
+def scheduler_forward(scheduler):
+    """
+    forward(model_key, model, batch) lewat InferenceScheduler: lane bulk, tanpa dipotong batas batch lane
+    (ukuran batch yang diukur = ukuran forward sebenarnya) dan tanpa masuk estimasi kapasitas admission
+    """
+    return lambda model_key, model, batch: scheduler.run(model_key, model, batch, LANE_BULK, observe=False,
+                                                         batch_limit=len(batch))
+
+
+def sweep_models(models, forward_batch, batch_sizes, height, width, repeats=DEFAULT_REPEATS):
+    """
+    Ukur semua model yang dimuat (thread TF saat ini) lewat forward_batch(model_key, model, batch), biasanya
+    scheduler_forward. Mengembalikan model_key -> list pengukuran
+    """
+    results = {}
+    for key, model in models.items():
+        if model is None:
+            continue
+        forward = lambda batch, key=key, model=model: forward_batch(key, model, batch)
+        results[key] = []
+        for batch_size in batch_sizes:
+            measurement = measure(forward, batch_size, height, width, repeats)
+            results[key].append(measurement)
+            print(f"  {key:<12} batch {batch_size:>3}: p95 {measurement['p95_ms']:>8.1f} ms, "
+                  f"{measurement['throughput']:>7.1f} gambar/detik")
+    return results
+
+
+def build_profile(threads, measurements, target_p95_ms):
+    models = {}
+    for key, rows in measurements.items():
+        bulk = pick_batch(rows, target_p95_ms)
+        interactive = pick_batch(rows, LANE_SLO_SECONDS[LANE_INTERACTIVE] * 1000)
+        models[key] = {
+            "bulk_batch": bulk["batch_size"],
+            "interactive_batch": interactive["batch_size"],
+            "throughput": bulk["throughput"],
+            "p95_ms": bulk["p95_ms"],
+            "measurements": rows,
+        }
+    return {
+        "threads": threads,
+        "target_p95_ms": target_p95_ms,
+        "models": models,
+        "host": {"machine": platform.machine(), "cpu_count": os.cpu_count(), "fingerprint": host_fingerprint()},
+        "updated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def tune_in_process(models, scheduler, height, width, batch_sizes=DEFAULT_BATCH_SIZES,
+                    target_p95_ms=AUTOTUNE_TARGET_P95_MS, repeats=DEFAULT_REPEATS):
+    """
+    Sweep ukuran batch saja di proses yang sedang berjalan (thread TF tidak berubah) lewat scheduler; dipakai
+    api.py di background setelah ready. Hasil langsung diterapkan ke scheduler, baru kemudian disimpan (best-effort).
+    """
+    print("🎛️ Autotune ukuran batch (thread TF saat ini)")
+    measurements = sweep_models(models, scheduler_forward(scheduler), batch_sizes, height, width, repeats)
+    profile = build_profile({}, measurements, target_p95_ms)
+    apply_batch_sizes(profile, scheduler)
+    try_save_profile(profile)
+    return profile
+
+
+# ==============================================================================
+# CLI: SWEEP PENUH (THREAD DI SUBPROCESS)
+# ==============================================================================
+
+def thread_candidates():
+    """(intra, inter): 0 = default TF; 1, setengah dan semua core untuk intra-op"""
+    cores = os.cpu_count() or 1
+    intra_values = sorted({0, 1, max(1, cores // 2), cores})
+    return [(intra, inter) for intra in intra_values for inter in (0, 1, 2)]
+
+
+def run_worker(args):
+    """Subprocess: set thread, muat model (tanpa profil lama), ukur, cetak JSON di baris terakhir"""
+    import tensorflow as tf
+    if args.intra:
+        tf.config.threading.set_intra_op_parallelism_threads(args.intra)
+    if args.inter:
+        tf.config.threading.set_inter_op_parallelism_threads(args.inter)
+    import api
+    asyncio.run(api.load_models())
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    # Lewat scheduler api, sehingga tidak bersamaan dengan warm-up yang berjalan di background
+    measurements = sweep_models(api.models, scheduler_forward(api.inference_scheduler), batch_sizes, api.IMG_HEIGHT,
+                                api.IMG_WIDTH, args.repeats)
+    print(json.dumps(measurements))
+
+
+def run_sweep(args):
+    results = []
+    for intra, inter in thread_candidates():
+        print(f"🔍 intra={intra or 'default'} inter={inter or 'default'}")
+        command = [sys.executable, os.path.abspath(__file__), "worker", "--intra", str(intra), "--inter", str(inter),
+                   "--batch-sizes", args.batch_sizes, "--repeats", str(args.repeats)]
+        env = {**os.environ, "AUTOTUNE_APPLY": "0", "AUTOTUNE_ON_STARTUP": "0", "WARMUP_BATCH_SIZES": ""}
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            print(f"  ❌ gagal: {completed.stderr.strip()[-300:]}")
+            continue
+        measurements = json.loads(lines[-1])
+        if not measurements:
+            sys.exit("❌ Tidak ada model yang dimuat dari model_results/")
+        profile = build_profile({"intra": intra or None, "inter": inter or None}, measurements, args.target_p95_ms)
+        throughputs = [tuned["throughput"] for tuned in profile["models"].values()]
+        score = float(np.exp(np.mean(np.log(throughputs))))
+        results.append((score, profile))
+        print(f"  throughput (rata-rata geometrik): {score:.1f} gambar/detik")
+
+    if not results:
+        sys.exit("❌ Semua konfigurasi gagal diukur")
+    score, best = max(results, key=lambda item: item[0])
+    if not try_save_profile(best):
+        sys.exit(1)
+    print(f"\n✅ Profil host {host_fingerprint()} disimpan ke {AUTOTUNE_FILE}: threads {best['threads']}, "
+          + ", ".join(f"{key} bulk={m['bulk_batch']} interactive={m['interactive_batch']}"
+                      for key, m in best["models"].items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autotune ukuran batch & thread TensorFlow per host")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Sweep thread (subprocess) x ukuran batch, simpan profil host ini")
+    run.add_argument("--batch-sizes", default=",".join(str(b) for b in DEFAULT_BATCH_SIZES))
+    run.add_argument("--target-p95-ms", type=float, default=AUTOTUNE_TARGET_P95_MS)
+    run.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+
+    worker = sub.add_parser("worker", help=argparse.SUPPRESS)
+    worker.add_argument("--intra", type=int, default=0)
+    worker.add_argument("--inter", type=int, default=0)
+    worker.add_argument("--batch-sizes", required=True)
+    worker.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+
+    sub.add_parser("show", help="Tampilkan profil host ini")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_sweep(args)
+    elif args.command == "worker":
+        run_worker(args)
+    else:
+        profile = load_profile()
+        print(json.dumps(profile, indent=2) if profile else f"Belum ada profil untuk host {host_fingerprint()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+Benchmark & load-test untuk API Klasifikasi Buah Naga (pengganti test_api.py)
+
+Contoh:
+    # Smoke test satu gambar ke semua endpoint (perilaku test_api.py lama)
+    python bench_api.py smoke --url http://localhost:8000 --image test_image.jpg
+
+    # Load test in-process (tanpa server, app FastAPI dipanggil lewat ASGI)
+    python bench_api.py run --in-process --concurrency 4 --duration 20
+
+    # Load test ke server lokal, termasuk CPU/RSS proses server
+    python bench_api.py run --url http://localhost:8000 --server-pid 12345 \\
+        --images data/sample/ --concurrency 8 --duration 30 --out bench_results/HEAD.json
+
+    # Load test layanan gRPC (grpc_server.py) dengan concurrency yang sama, untuk dibandingkan dengan REST
+    python bench_api.py run --grpc localhost:50051 --concurrency 8 --duration 30 --out bench_results/grpc.json
+
+    # Bandingkan dua hasil; exit code 1 jika ada regresi melewati threshold
+    python bench_api.py compare bench_results/main.json bench_results/HEAD.json --threshold 10
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+
+# psutil opsional - tanpa psutil, CPU/RSS hanya tersedia untuk mode in-process (via resource)
+try:
+    import psutil  # type: ignore
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+API_URL = "http://localhost:8000"
+ENDPOINTS = {
+    "vgg16": "/api/predict/vgg16",
+    "mobilenetv2": "/api/predict/mobilenetv2",
+    "both": "/api/predict/both",
+}
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# ==============================================================================
+# INPUT GAMBAR
+# ==============================================================================
+
+def load_images(paths):
+    """Membaca gambar dari daftar file/folder. Mengembalikan list (nama, bytes, content_type)"""
+    images = []
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTENSIONS))
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                content_type = "image/png" if file_path.lower().endswith('.png') else "image/jpeg"
+                images.append((os.path.basename(file_path), f.read(), content_type))
+    return images
+
+def synthetic_images():
+    """Campuran gambar sintetis (JPEG kamera besar, JPEG sedang, PNG RGBA, PNG palette) jika tidak ada input"""
+    from PIL import Image
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    specs = [
+        ("camera_1280x960.jpg", (960, 1280, 3), "RGB", "JPEG", "image/jpeg"),
+        ("photo_640x480.jpg", (480, 640, 3), "RGB", "JPEG", "image/jpeg"),
+        ("transparent_512.png", (512, 512, 4), "RGBA", "PNG", "image/png"),
+        ("palette_300.png", (300, 300, 3), "P", "PNG", "image/png"),
+    ]
+    images = []
+    for name, shape, mode, fmt, content_type in specs:
+        img = Image.fromarray(rng.integers(0, 256, size=shape, dtype=np.uint8))
+        if mode == "P":
+            img = img.convert("P")
+        buffer = io.BytesIO()
+        img.save(buffer, format=fmt)
+        images.append((name, buffer.getvalue(), content_type))
+    return images
+
+# ==============================================================================
+# STATISTIK & RESOURCE SAMPLING
+# ==============================================================================
+
+def percentile(sorted_values, pct):
+    """Persentil dengan interpolasi linear (seperti numpy.percentile default)"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def summarize(latencies_ms, errors, elapsed):
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "mean": sum(values) / len(values) if values else None,
+            "max": values[-1] if values else None,
+        },
+    }
+
+class ResourceSampler:
+    """Mengukur CPU (% satu core) dan RSS puncak sebuah proses selama satu fase benchmark"""
+
+    def __init__(self, pid=None, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.process = psutil.Process(pid or os.getpid()) if PSUTIL_AVAILABLE else None
+        self.peak_rss = 0
+        self._task = None
+
+    def _cpu_seconds(self):
+        if self.process is not None:
+            times = self.process.cpu_times()
+            return times.user + times.system
+        if self.pid is None:
+            import resource
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return usage.ru_utime + usage.ru_stime
+        return None
+
+    def _rss(self):
+        if self.process is not None:
+            return self.process.memory_info().rss
+        if self.pid is None:
+            import resource
+            # ru_maxrss dalam KB di Linux, byte di macOS
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == "darwin" else maxrss * 1024
+        return 0
+
+    async def _poll(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, self._rss())
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.cpu_start = self._cpu_seconds()
+        self.wall_start = time.perf_counter()
+        self._task = asyncio.ensure_future(self._poll())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        cpu_end = self._cpu_seconds()
+        wall = time.perf_counter() - self.wall_start
+        cpu_percent = None
+        if self.cpu_start is not None and cpu_end is not None and wall > 0:
+            cpu_percent = round((cpu_end - self.cpu_start) / wall * 100, 1)
+        return {
+            "cpu_percent": cpu_percent,
+            "rss_mb_peak": round(self.peak_rss / (1024 * 1024), 1) if self.peak_rss else None,
+        }
+
+# ==============================================================================
+# LOAD GENERATOR
+# ==============================================================================
+
+async def make_client(args):
+    """httpx.AsyncClient ke server (--url), langsung ke app FastAPI (--in-process), atau GrpcClient (--grpc)"""
+    if args.grpc:
+        return GrpcClient(args.grpc, args.timeout)
+
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+
+    import api
+    # ASGITransport tidak menjalankan event startup, jadi muat model & tunggu warm-up manual
+    await api.load_models()
+    while not api.models_ready and any(m is not None for m in api.models.values()):
+        await asyncio.sleep(0.2)
+    transport = httpx.ASGITransport(app=api.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://in-process", timeout=args.timeout, limits=limits)
+
+class GrpcClient:
+    """Client gRPC (grpc_server.py) dengan antarmuka kecil yang sama seperti pemakaian httpx di benchmark ini"""
+
+    def __init__(self, target, timeout):
+        import grpc
+        import dragonfruit_pb2 as pb2
+        import dragonfruit_pb2_grpc as pb2_grpc
+
+        self.pb2 = pb2
+        self.timeout = timeout
+        self.channel = grpc.aio.insecure_channel(target)
+        self.stub = pb2_grpc.DragonFruitClassifierStub(self.channel)
+        self.models = {
+            "/api/predict/vgg16": [pb2.MODEL_VGG16],
+            "/api/predict/mobilenetv2": [pb2.MODEL_MOBILENETV2],
+            "/api/predict/both": [],
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.channel.close()
+
+    async def predict(self, path, data):
+        """True jika RPC Predict berhasil (setara HTTP 200)"""
+        request = self.pb2.PredictRequest(image=data, models=self.models[path])
+        await self.stub.Predict(request, timeout=self.timeout)
+        return True
+
+async def send_request(client, path, name, data, content_type):
+    """Satu request prediksi ke REST (httpx) atau gRPC; True jika berhasil"""
+    if isinstance(client, GrpcClient):
+        return await client.predict(path, data)
+    response = await client.post(path, files={"file": (name, data, content_type)})
+    return response.status_code == 200
+
+async def drive_endpoint(client, path, images, args, rng):
+    """Menjalankan `concurrency` worker ke satu endpoint selama `duration` detik"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            name, data, content_type = rng.choice(images)
+            start = time.perf_counter()
+            try:
+                ok = await send_request(client, path, name, data, content_type)
+            except Exception:
+                ok = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if ok:
+                latencies.append(elapsed_ms)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+async def run_benchmark(args):
+    images = load_images(args.images) if args.images else synthetic_images()
+    if not images:
+        raise SystemExit("❌ Tidak ada gambar untuk benchmark")
+    rng = random.Random(args.seed)
+
+    client = await make_client(args)
+    results = {}
+    async with client:
+        for endpoint in args.endpoints:
+            path = ENDPOINTS[endpoint]
+            print(f"🔄 {endpoint}: warm-up {args.warmup}s, lalu {args.duration}s @ concurrency {args.concurrency}")
+            if args.warmup > 0:
+                warmup_args = argparse.Namespace(**{**vars(args), "duration": args.warmup})
+                await drive_endpoint(client, path, images, warmup_args, rng)
+
+            sampler = ResourceSampler(None if args.in_process else args.server_pid)
+            sampler.start()
+            latencies, errors, elapsed = await drive_endpoint(client, path, images, args, rng)
+            resources = await sampler.stop()
+
+            results[endpoint] = {**summarize(latencies, errors, elapsed), **resources}
+            lat = results[endpoint]["latency_ms"]
+            if lat["p50"] is not None:
+                print(f"   rps={results[endpoint]['rps']:.2f} p50={lat['p50']:.1f}ms p95={lat['p95']:.1f}ms "
+                      f"p99={lat['p99']:.1f}ms errors={errors} cpu={resources['cpu_percent']}% rss={resources['rss_mb_peak']}MB")
+            else:
+                print(f"   ❌ semua request gagal (errors={errors})")
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": socket.gethostname(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "mode": "in-process" if args.in_process else (f"grpc://{args.grpc}" if args.grpc else args.url),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "images": [name for name, _, _ in images],
+        },
+        "endpoints": results,
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+# ==============================================================================
+# PERBANDINGAN HASIL (DETEKSI REGRESI)
+# ==============================================================================
+
+def compare_results(baseline, candidate, threshold):
+    """
+    Membandingkan p95 latency dan rps per endpoint.
+    Regresi = p95 naik > threshold% atau rps turun > threshold%. Mengembalikan jumlah regresi.
+    """
+    regressions = 0
+    print(f"{'endpoint':<14}{'p95 base':>12}{'p95 new':>12}{'Δp95':>9}{'rps base':>11}{'rps new':>10}{'Δrps':>9}")
+    for endpoint, base in baseline["endpoints"].items():
+        new = candidate["endpoints"].get(endpoint)
+        if new is None or base["latency_ms"]["p95"] is None or new["latency_ms"]["p95"] is None:
+            print(f"{endpoint:<14}  (tidak bisa dibandingkan)")
+            continue
+        p95_base, p95_new = base["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        p95_delta = (p95_new - p95_base) / p95_base * 100 if p95_base else 0.0
+        rps_delta = (new["rps"] - base["rps"]) / base["rps"] * 100 if base["rps"] else 0.0
+        flag = ""
+        if p95_delta > threshold or rps_delta < -threshold:
+            regressions += 1
+            flag = "  ❌ REGRESI"
+        print(f"{endpoint:<14}{p95_base:>12.1f}{p95_new:>12.1f}{p95_delta:>8.1f}%"
+              f"{base['rps']:>11.2f}{new['rps']:>10.2f}{rps_delta:>8.1f}%{flag}")
+    return regressions
+
+# ==============================================================================
+# SMOKE TEST (PERILAKU test_api.py LAMA)
+# ==============================================================================
+
+def smoke(url, image_path):
+    import requests
+
+    print("🔍 Testing /api/health...")
+    response = requests.get(f"{url}/api/health")
+    print(f"Status: {response.status_code}")
+    print(f"Response: {response.json()}\n")
+
+    if not os.path.exists(image_path):
+        print(f"⚠️ File {image_path} tidak ditemukan. Skip testing prediksi.")
+        return
+
+    for endpoint, path in ENDPOINTS.items():
+        print(f"🔄 Testing {path} dengan {image_path}...")
+        with open(image_path, 'rb') as f:
+            response = requests.post(f"{url}{path}", files={'file': f})
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"Error: {response.text}\n")
+            continue
+        result = response.json()
+        for item in ([result] if endpoint != "both" else [result.get('vgg16'), result.get('mobilenetv2')]):
+            if item:
+                print(f"{item['model']}: {item['prediction']} ({item['confidence']:.2f}%)")
+        print()
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API Klasifikasi Buah Naga")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_smoke = sub.add_parser("smoke", help="Satu request per endpoint, cetak hasilnya")
+    p_smoke.add_argument("--url", default=API_URL)
+    p_smoke.add_argument("--image", default="test_image.jpg")
+
+    p_run = sub.add_parser("run", help="Load test dengan concurrency & durasi tertentu")
+    target = p_run.add_mutually_exclusive_group()
+    target.add_argument("--url", default=API_URL, help="Base URL server (default: %(default)s)")
+    target.add_argument("--in-process", action="store_true", help="Panggil app FastAPI langsung tanpa server")
+    target.add_argument("--grpc", metavar="HOST:PORT", help="Layanan gRPC (grpc_server.py) alih-alih REST")
+    p_run.add_argument("--endpoints", default="vgg16,mobilenetv2,both",
+                       type=lambda s: [e.strip() for e in s.split(",") if e.strip()])
+    p_run.add_argument("--images", nargs="*", help="File/folder gambar (default: campuran gambar sintetis)")
+    p_run.add_argument("--concurrency", type=int, default=4)
+    p_run.add_argument("--duration", type=float, default=20.0, help="Durasi pengukuran per endpoint (detik)")
+    p_run.add_argument("--warmup", type=float, default=3.0, help="Durasi warm-up per endpoint (detik)")
+    p_run.add_argument("--timeout", type=float, default=60.0)
+    p_run.add_argument("--server-pid", type=int, help="PID server untuk sampling CPU/RSS (butuh psutil)")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--out", help="Simpan hasil JSON ke path ini")
+
+    p_cmp = sub.add_parser("compare", help="Bandingkan dua file hasil JSON")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("candidate")
+    p_cmp.add_argument("--threshold", type=float, default=10.0, help="Toleransi regresi dalam persen")
+
+    args = parser.parse_args()
+
+    if args.command == "smoke":
+        smoke(args.url, args.image)
+    elif args.command == "run":
+        unknown = [e for e in args.endpoints if e not in ENDPOINTS]
+        if unknown:
+            parser.error(f"endpoint tidak dikenal: {unknown}")
+        results = asyncio.run(run_benchmark(args))
+        if args.out:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Hasil disimpan ke {args.out}")
+        else:
+            print(json.dumps(results, indent=2))
+    elif args.command == "compare":
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.candidate, encoding='utf-8') as f:
+            candidate = json.load(f)
+        regressions = compare_results(baseline, candidate, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
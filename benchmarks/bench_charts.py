@@ -0,0 +1,44 @@
+"""
+Waktu render grafik distribusi kepercayaan: spesifikasi Vega-Lite (charts.py) vs figure matplotlib/seaborn
+(cara lama: plt.subplots + sns.barplot + st.pyplot, yang me-render PNG di server).
+"""
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from charts import confidence_chart_spec
+
+CLASS_NAMES = ['Defect Dragon Fruit', 'Immature Dragon Fruit', 'Mature Dragon Fruit']
+SCORES = np.array([0.05, 0.15, 0.80], dtype=np.float32)
+
+
+def bench_vega_lite_spec(benchmark):
+    """Spesifikasi + serialisasi JSON (yang dikirim Streamlit ke browser)"""
+    payload = benchmark(lambda: json.dumps(confidence_chart_spec(CLASS_NAMES, SCORES, "VGG16 Confidence Scores")))
+    assert '"confidence"' in payload
+
+
+def bench_matplotlib_seaborn_png(benchmark):
+    """Baseline cara lama: figure 8x6 Agg di-render ke PNG seperti st.pyplot"""
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    sns = pytest.importorskip("seaborn")
+
+    def render():
+        fig, ax = plt.subplots(figsize=(8, 6))
+        sns.barplot(x=CLASS_NAMES, y=SCORES, palette="viridis", ax=ax)
+        ax.set_title("VGG16 Confidence Scores")
+        ax.set_ylabel("Confidence")
+        ax.set_xlabel("Class")
+        ax.tick_params(axis='x', rotation=45)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        plt.close(fig)
+        return buffer.getvalue()
+
+    png = benchmark(render)
+    assert png[:4] == b"\x89PNG"
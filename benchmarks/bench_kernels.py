@@ -0,0 +1,103 @@
+"""
+Micro-benchmark hot path API: preprocess_image, forward model dan post-processing di predict_image.
+"""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+BATCH_SIZES = [1, 4, 16]
+
+
+# ==============================================================================
+# PREPROCESSING
+# ==============================================================================
+
+@pytest.mark.parametrize("kind", ["rgb", "rgba", "p"])
+def bench_preprocess_image(benchmark, api_module, sample_images, kind):
+    img = sample_images[kind]
+    result = benchmark(api_module.preprocess_image, img)
+    assert result.shape == (1, api_module.IMG_HEIGHT, api_module.IMG_WIDTH, 3)
+
+
+def bench_decode_and_preprocess_large_jpeg(benchmark, api_module, sample_images):
+    """JPEG 4000x3000: biaya decode PIL mendominasi, jadi decode ikut diukur"""
+    data = sample_images["large_jpeg"]
+
+    def run():
+        img = Image.open(io.BytesIO(data))
+        img.load()
+        return api_module.preprocess_image(img)
+
+    result = benchmark(run)
+    assert result.shape == (1, api_module.IMG_HEIGHT, api_module.IMG_WIDTH, 3)
+
+
+# ==============================================================================
+# INFERENSI: model.predict vs pemanggilan langsung
+# ==============================================================================
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+@pytest.mark.parametrize("model_key", ["vgg16", "mobilenetv2"])
+def bench_model_predict(benchmark, api_module, loaded_models, model_key, batch_size):
+    model = loaded_models.get(model_key)
+    if model is None:
+        pytest.skip(f"Model {model_key} tidak dimuat")
+    batch = np.random.default_rng(0).random((batch_size, api_module.IMG_HEIGHT, api_module.IMG_WIDTH, 3), dtype=np.float32)
+    output = benchmark(model.predict, batch, verbose=0)
+    assert output.shape[0] == batch_size
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+@pytest.mark.parametrize("model_key", ["vgg16", "mobilenetv2"])
+def bench_model_direct_call(benchmark, api_module, loaded_models, model_key, batch_size):
+    model = loaded_models.get(model_key)
+    if model is None:
+        pytest.skip(f"Model {model_key} tidak dimuat")
+    batch = np.random.default_rng(0).random((batch_size, api_module.IMG_HEIGHT, api_module.IMG_WIDTH, 3), dtype=np.float32)
+    output = benchmark(lambda: model(batch, training=False).numpy())
+    assert output.shape[0] == batch_size
+
+
+# ==============================================================================
+# POST-PROCESSING: softmax, entropy, threshold "Tidak Valid"
+# ==============================================================================
+
+def _logits(n, seed=0):
+    return np.random.default_rng(seed).normal(0, 3, size=(n, 3)).astype(np.float32)
+
+
+def bench_softmax_single(benchmark, api_module):
+    logits = _logits(1)[0]
+    scores = benchmark(lambda: api_module.tf.nn.softmax(logits).numpy())
+    assert scores.shape == (3,)
+
+
+def bench_postprocess_single(benchmark, api_module):
+    scores = api_module.tf.nn.softmax(_logits(1)[0]).numpy()
+    result = benchmark(api_module.postprocess_scores, scores)
+    assert result[0] is not None
+
+
+def bench_postprocess_batch_64(benchmark, api_module):
+    """64 gambar per panggilan - baseline untuk versi batched/vectorized"""
+    scores = api_module.tf.nn.softmax(_logits(64), axis=-1).numpy()
+    results = benchmark(lambda: [api_module.postprocess_scores(row) for row in scores])
+    assert len(results) == 64
+
+
+def bench_postprocess_batch_64_vectorized(benchmark, api_module):
+    """64 gambar sekaligus lewat postprocess_batch (postprocessing.score_stats vectorized)"""
+    scores = api_module.softmax(_logits(64))
+    results = benchmark(api_module.postprocess_batch, scores)
+    assert len(results) == 64
+
+
+def bench_calibrate_scores_batch_64(benchmark):
+    """Kalibrasi confidence UI (boost + redistribusi) untuk [64, 3] tanpa loop per elemen"""
+    from postprocessing import calibrate_scores, softmax
+    scores = softmax(_logits(64))
+    calibrated, confidences = benchmark(calibrate_scores, scores, rng=np.random.default_rng(0))
+    assert calibrated.shape == (64, 3)
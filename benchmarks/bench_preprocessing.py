@@ -0,0 +1,26 @@
+"""
+Kecepatan kebijakan preprocessing (preprocessing.py): mode resize x filter, pada foto kamera 640x480 dan 4000x3000.
+Tidak membutuhkan TensorFlow. Akurasi tiap kebijakan divalidasi terpisah dengan validate_preprocessing.py.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from preprocessing import RESAMPLE_FILTERS, RESIZE_MODES, to_model_input
+
+
+@pytest.fixture(scope="module")
+def camera_images(sample_images):
+    large = Image.open(io.BytesIO(sample_images["large_jpeg"]))
+    large.load()
+    return {"640x480": sample_images["rgb"], "4000x3000": large}
+
+
+@pytest.mark.parametrize("resample", RESAMPLE_FILTERS)
+@pytest.mark.parametrize("mode", RESIZE_MODES)
+@pytest.mark.parametrize("size", ["640x480", "4000x3000"])
+def bench_preprocess_policy(benchmark, camera_images, size, mode, resample):
+    result = benchmark(to_model_input, camera_images[size], 224, 224, mode, resample)
+    assert result.shape == (1, 224, 224, 3)
@@ -0,0 +1,54 @@
+"""
+Serialisasi respons prediksi: JSON (bentuk PredictionResponse/CombinedPredictionResponse saat ini) vs format biner
+ringkas MessagePack/CBOR (compact_response.py). Waktu CPU diukur pytest-benchmark; ukuran payload (byte)
+dicatat di extra_info["payload_bytes"] dan ikut tersimpan di baseline.
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import compact_response
+from postprocessing import CLASS_NAMES
+
+MODEL_KEYS = ("vgg16", "mobilenetv2")
+
+
+def _result(seed):
+    scores = np.random.default_rng(seed).dirichlet(np.ones(len(CLASS_NAMES))) * 100
+    index = int(np.argmax(scores))
+    return SimpleNamespace(
+        model=MODEL_KEYS[seed % 2],
+        prediction=CLASS_NAMES[index],
+        confidence=float(scores[index]),
+        scores=dict(zip(CLASS_NAMES, scores.tolist())),
+        statistics={"confidence_diff": 41.7, "entropy": 0.62, "max_entropy": 1.0986, "is_invalid": False},
+    )
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {key: _result(i) for i, key in enumerate(MODEL_KEYS)}
+
+
+def bench_json_combined(benchmark, results):
+    """Baseline: dict bersarang dengan nama kelas di scores setiap model"""
+    def run():
+        body = {key: vars(result) for key, result in results.items()}
+        body["message"] = "Prediksi berhasil"
+        return json.dumps(body).encode()
+
+    payload = benchmark(run)
+    benchmark.extra_info["payload_bytes"] = len(payload)
+
+
+@pytest.mark.parametrize("media_type", [compact_response.MSGPACK_MEDIA_TYPE, compact_response.CBOR_MEDIA_TYPE])
+def bench_compact_combined(benchmark, results, media_type):
+    if media_type not in compact_response.available_media_types():
+        pytest.skip(f"Library untuk {media_type} tidak ter-install")
+    payload = benchmark(lambda: compact_response.dumps(compact_response.encode_predictions(results), media_type))
+    benchmark.extra_info["payload_bytes"] = len(payload)
+    decoded = compact_response.decode_predictions(compact_response.loads(payload, media_type))
+    assert decoded["vgg16"]["prediction"] == results["vgg16"].prediction
@@ -0,0 +1,59 @@
+"""
+Fixture bersama untuk micro-benchmark preprocessing, inferensi dan post-processing.
+
+Menyimpan baseline baru (jalankan dari root repository, lalu commit file di benchmarks/baselines/):
+    pytest benchmarks/ --benchmark-autosave
+
+Membandingkan dengan baseline terakhir dan gagal jika median melambat > 10%:
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+
+import io
+import os
+import sys
+import asyncio
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def _random_rgb(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+
+
+@pytest.fixture(scope="session")
+def api_module():
+    """Modul api (membutuhkan TensorFlow); benchmark di-skip jika tidak tersedia"""
+    pytest.importorskip("tensorflow")
+    import api
+    return api
+
+
+@pytest.fixture(scope="session")
+def sample_images():
+    """Gambar uji: RGB kamera, RGBA transparan, mode P (palette), dan JPEG besar (bytes)"""
+    rgba = Image.fromarray(np.random.default_rng(1).integers(0, 256, size=(512, 512, 4), dtype=np.uint8))
+    large_jpeg = io.BytesIO()
+    _random_rgb(3000, 4000, seed=2).save(large_jpeg, format="JPEG", quality=90)
+    return {
+        "rgb": _random_rgb(480, 640),
+        "rgba": rgba,
+        "p": _random_rgb(300, 300, seed=3).convert("P"),
+        "large_jpeg": large_jpeg.getvalue(),
+    }
+
+
+@pytest.fixture(scope="session")
+def loaded_models(api_module):
+    """Model dari model_results/ dimuat sekali (termasuk warm-up) untuk seluruh sesi benchmark"""
+    asyncio.run(api_module.load_models())
+    available = {key: model for key, model in api_module.models.items() if model is not None}
+    if not available:
+        pytest.skip("Tidak ada model yang berhasil dimuat dari model_results/")
+    return available
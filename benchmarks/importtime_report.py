@@ -0,0 +1,81 @@
+"""
+Laporan waktu import (python -X importtime) untuk modul yang dipakai app_naga.py / api.py.
+
+Setiap modul diukur di interpreter baru agar tidak saling mempengaruhi cache sys.modules.
+
+Contoh:
+    python benchmarks/importtime_report.py
+    python benchmarks/importtime_report.py tensorflow streamlit --top 15
+    python benchmarks/importtime_report.py --json importtime.json
+"""
+
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+DEFAULT_MODULES = [
+    "streamlit",
+    "numpy",
+    "PIL.Image",
+    "tensorflow",
+    "google.generativeai",
+    "inference_client",
+    "charts",
+]
+
+# Format baris stderr: "import time:       123 |       4567 |   package.module"
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Mengembalikan (cumulative_ms modul, list (self_us, cumulative_us, nama) untuk semua sub-import) atau None"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            entries.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+    top_level = module.split(".")[0]
+    # Baris terakhir untuk modul top-level berisi waktu kumulatif termasuk semua dependensinya
+    cumulative = max((cum for _, cum, name in entries if name in (module, top_level)), default=0)
+    return cumulative / 1000.0, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laporan waktu import per modul (-X importtime)")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="Jumlah sub-import terberat (self time) per modul")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        result = measure(module)
+        if result is None:
+            print(f"⚠️ {module}: tidak bisa di-import (tidak ter-install?)")
+            report[module] = None
+            continue
+        cumulative_ms, entries = result
+        heaviest = sorted(entries, reverse=True)[:args.top]
+        report[module] = {
+            "cumulative_ms": round(cumulative_ms, 1),
+            "heaviest_self_ms": [(name, round(self_us / 1000.0, 1)) for self_us, _, name in heaviest],
+        }
+        print(f"\n📦 {module}: {cumulative_ms:.1f} ms")
+        for name, self_ms in report[module]["heaviest_self_ms"]:
+            print(f"    {self_ms:>8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
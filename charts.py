@@ -0,0 +1,40 @@
+"""
+Grafik distribusi tingkat kepercayaan untuk UI Streamlit.
+
+Grafik dikirim ke browser sebagai spesifikasi Vega-Lite (st.vega_lite_chart) dan di-render di sisi client,
+jadi server tidak perlu me-render figure matplotlib (Agg) di setiap rerun. Spesifikasi dibangun dari
+template tetap; hanya 3 nilai skor yang berubah per prediksi.
+
+Benchmark waktu render: pytest benchmarks/bench_charts.py
+"""
+
+CHART_HEIGHT = 320
+
+# Bagian spesifikasi yang sama untuk semua grafik (tidak pernah diubah, hanya direferensikan)
+_AXIS_X = {"field": "class", "type": "nominal", "title": "Class", "sort": None,
+           "axis": {"labelAngle": -45, "labelLimit": 200}}
+_AXIS_Y = {"field": "confidence", "type": "quantitative", "title": "Confidence",
+           "scale": {"domain": [0, 1]}, "axis": {"format": ".0%"}}
+_TOOLTIP = [{"field": "class", "type": "nominal", "title": "Class"},
+            {"field": "confidence", "type": "quantitative", "title": "Confidence", "format": ".2%"}]
+
+
+def confidence_chart_spec(class_names, scores, title, scheme="viridis"):
+    """
+    Spesifikasi Vega-Lite bar chart skor kepercayaan per kelas.
+    scheme: nama color scheme Vega (misal "viridis" untuk VGG16, "plasma" untuk MobileNetV2).
+    """
+    values = [{"class": name, "confidence": float(score)} for name, score in zip(class_names, scores)]
+    return {
+        "title": title,
+        "height": CHART_HEIGHT,
+        "data": {"values": values},
+        "mark": {"type": "bar", "cornerRadiusTopLeft": 4, "cornerRadiusTopRight": 4},
+        "encoding": {
+            "x": _AXIS_X,
+            "y": _AXIS_Y,
+            "color": {"field": "class", "type": "nominal", "sort": None,
+                      "scale": {"scheme": scheme}, "legend": None},
+            "tooltip": _TOOLTIP,
+        },
+    }
@@ -0,0 +1,162 @@
+"""
+Format respons biner ringkas (MessagePack/CBOR) untuk klien batch/streaming, dipilih lewat header Accept.
+
+Alih-alih dict `scores` dengan nama kelas di setiap respons, hasil N model disusun kolom per kolom:
+    v        - versi format (1)
+    models   - key model [N], misal ["vgg16", "mobilenetv2"]
+    pred     - indeks kelas int8 [N] (urutan postprocessing.CLASS_NAMES, -1 jika model gagal)
+    conf     - confidence float16 [N] (persen)
+    scores   - skor softmax float16 [N, C] row-major (0..1)
+    ok       - bit-packed [N]: 1 = model menghasilkan prediksi
+    invalid  - bit-packed [N]: 1 = prediksi "Tidak Valid" (pred tetap berisi argmax)
+Array dikirim sebagai bytes little-endian; `statistics` dan `message` hanya ada di respons JSON.
+
+msgpack dan cbor2 opsional - jika tidak ter-install, media type-nya tidak ditawarkan dan respons tetap JSON.
+"""
+
+import struct
+
+import numpy as np
+
+from postprocessing import CLASS_NAMES, INVALID_CLASS_NAME
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2  # type: ignore
+except ImportError:
+    cbor2 = None
+
+FORMAT_VERSION = 1
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+CBOR_MEDIA_TYPE = "application/cbor"
+# Alias yang juga diterima di header Accept -> media type kanonik
+MEDIA_TYPE_ALIASES = {
+    "application/msgpack": MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    "application/cbor": CBOR_MEDIA_TYPE,
+}
+
+
+def available_media_types():
+    """Media type biner yang bisa dilayani (library-nya ter-install)"""
+    available = []
+    if msgpack is not None:
+        available.append(MSGPACK_MEDIA_TYPE)
+    if cbor2 is not None:
+        available.append(CBOR_MEDIA_TYPE)
+    return available
+
+
+def negotiate(accept_header):
+    """
+    Media type biner dengan q tertinggi di header Accept, atau None untuk JSON
+    (tidak ada Accept, JSON/*/* lebih disukai, atau library format biner tidak tersedia).
+    """
+    if not accept_header:
+        return None
+    available = available_media_types()
+    candidates = []
+    for position, item in enumerate(accept_header.split(",")):
+        parts = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, position, parts[0].lower()))
+    for _, _, media_type in sorted(candidates):
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+        media_type = MEDIA_TYPE_ALIASES.get(media_type)
+        if media_type in available:
+            return media_type
+    return None
+
+
+def _pack_bits(flags):
+    """list bool -> bytes bit-packed MSB-first (sama dengan np.packbits)"""
+    packed = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            packed[i // 8] |= 0x80 >> (i % 8)
+    return bytes(packed)
+
+
+def encode_predictions(results):
+    """
+    results: dict model_key -> PredictionResponse (atau objek dengan prediction/confidence/scores), None jika gagal.
+    Mengembalikan dict kolom (lihat docstring modul) siap di-serialisasi.
+    Memakai struct (format "e" = float16) alih-alih NumPy: untuk N kecil overhead pembuatan array NumPy
+    lebih besar dari biaya serialisasinya sendiri.
+    """
+    keys = list(results)
+    pred, conf, scores, ok, invalid = [], [], [], [], []
+    for key in keys:
+        result = results[key]
+        if result is None:
+            pred.append(-1)
+            conf.append(0.0)
+            scores.extend([0.0] * len(CLASS_NAMES))
+            ok.append(False)
+            invalid.append(False)
+            continue
+        row = [result.scores.get(name, 0.0) / 100.0 for name in CLASS_NAMES]
+        pred.append(row.index(max(row)))
+        conf.append(result.confidence)
+        scores.extend(row)
+        ok.append(True)
+        invalid.append(result.prediction == INVALID_CLASS_NAME)
+    return {
+        "v": FORMAT_VERSION,
+        "models": keys,
+        "pred": struct.pack(f"<{len(pred)}b", *pred),
+        "conf": struct.pack(f"<{len(conf)}e", *conf),
+        "scores": struct.pack(f"<{len(scores)}e", *scores),
+        "ok": _pack_bits(ok),
+        "invalid": _pack_bits(invalid),
+    }
+
+
+def dumps(payload, media_type):
+    """Serialisasi dict payload ke bytes sesuai media type"""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type == CBOR_MEDIA_TYPE:
+        return cbor2.dumps(payload)
+    raise ValueError(f"Media type tidak didukung: {media_type}")
+
+
+def loads(data, media_type):
+    """Kebalikan dumps (untuk klien dan benchmark)"""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.unpackb(data, raw=False)
+    if media_type == CBOR_MEDIA_TYPE:
+        return cbor2.loads(data)
+    raise ValueError(f"Media type tidak didukung: {media_type}")
+
+
+def decode_predictions(payload):
+    """Dict kolom -> dict model_key -> {prediction, confidence, scores [C] float32} (None jika model gagal)"""
+    keys = payload["models"]
+    count = len(keys)
+    pred = np.frombuffer(payload["pred"], dtype=np.int8)
+    conf = np.frombuffer(payload["conf"], dtype="<f2").astype(np.float32)
+    scores = np.frombuffer(payload["scores"], dtype="<f2").astype(np.float32).reshape(count, -1)
+    ok = np.unpackbits(np.frombuffer(payload["ok"], dtype=np.uint8), count=count).astype(bool)
+    invalid = np.unpackbits(np.frombuffer(payload["invalid"], dtype=np.uint8), count=count).astype(bool)
+    decoded = {}
+    for i, key in enumerate(keys):
+        decoded[key] = {
+            "prediction": INVALID_CLASS_NAME if invalid[i] else CLASS_NAMES[pred[i]],
+            "confidence": float(conf[i]),
+            "scores": scores[i],
+        } if ok[i] else None
+    return decoded
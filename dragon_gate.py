@@ -0,0 +1,163 @@
+"""
+Gate lokal TAHAP 1 "apakah ini buah naga?" berbasis jarak embedding (pengganti panggilan Gemini per gambar).
+
+Embedding penultimate MobileNetV2 (embeddings.py) dibandingkan dengan centroid embedding buah naga:
+    jarak <= accept_below  -> "accept"     (buah naga)
+    jarak >= reject_above  -> "reject"     (bukan buah naga)
+    di antaranya           -> "borderline" (Gemini dipakai sebagai second opinion jika tersedia)
+
+Threshold dikalibrasi dari gambar contoh: folder positif/negatif dan/atau verdict Gemini (distilasi).
+
+Contoh:
+    # 1. (opsional) Label gambar dengan Gemini -> verdicts.jsonl
+    python dragon_gate.py label --images data/campuran/ --out verdicts.jsonl
+
+    # 2. Bangun gate dari folder buah naga, folder non-buah-naga dan/atau verdict Gemini
+    python dragon_gate.py build --positives data/train/ --negatives data/bukan_buah_naga/ --verdicts verdicts.jsonl
+
+Hasil disimpan di model_results/dragon_gate.npz dan otomatis dipakai app_naga.py (mode lokal).
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from embeddings import embed_files, list_images
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DRAGON_GATE_FILE = os.getenv("DRAGON_GATE_FILE", os.path.join(BASE_DIR, 'model_results', 'dragon_gate.npz'))
+
+GATE_ACCEPT = "accept"
+GATE_REJECT = "reject"
+GATE_BORDERLINE = "borderline"
+
+
+class DragonFruitGate:
+    """Detektor out-of-distribution sederhana: jarak cosine embedding ke centroid buah naga"""
+
+    def __init__(self, centroid, accept_below, reject_above, layer_name=""):
+        self.centroid = np.asarray(centroid, dtype=np.float32)
+        self.accept_below = float(accept_below)
+        self.reject_above = float(reject_above)
+        self.layer_name = layer_name
+
+    @classmethod
+    def fit(cls, positive_embeddings, negative_embeddings=None, accept_quantile=0.95, reject_quantile=0.05,
+            layer_name=""):
+        """
+        Centroid dari embedding positif. accept_below = kuantil jarak positif; reject_above = kuantil bawah jarak
+        negatif (jika ada), selain itu 1.5x accept_below. Embedding harus sudah ter-normalisasi L2.
+        """
+        positives = np.asarray(positive_embeddings, dtype=np.float32)
+        centroid = positives.mean(axis=0)
+        centroid = centroid / max(np.linalg.norm(centroid), 1e-12)
+        positive_distances = 1.0 - positives @ centroid
+        accept_below = float(np.quantile(positive_distances, accept_quantile))
+        if negative_embeddings is not None and len(negative_embeddings):
+            negative_distances = 1.0 - np.asarray(negative_embeddings, dtype=np.float32) @ centroid
+            reject_above = max(float(np.quantile(negative_distances, reject_quantile)), accept_below)
+        else:
+            reject_above = accept_below * 1.5
+        return cls(centroid, accept_below, reject_above, layer_name)
+
+    @classmethod
+    def load(cls, path=DRAGON_GATE_FILE):
+        data = np.load(path)
+        return cls(data["centroid"], data["accept_below"], data["reject_above"], str(data["layer_name"]))
+
+    def save(self, path=DRAGON_GATE_FILE):
+        np.savez(path, centroid=self.centroid, accept_below=self.accept_below, reject_above=self.reject_above,
+                 layer_name=self.layer_name)
+
+    def distances(self, embeddings):
+        """Jarak cosine [N] ke centroid"""
+        return 1.0 - np.atleast_2d(embeddings) @ self.centroid
+
+    def decide(self, embeddings):
+        """
+        Keputusan per embedding: list (keputusan, confidence, jarak).
+        confidence = kemiripan cosine dengan centroid buah naga dalam persen.
+        """
+        distances = self.distances(embeddings)
+        decisions = np.where(distances <= self.accept_below, GATE_ACCEPT,
+                             np.where(distances >= self.reject_above, GATE_REJECT, GATE_BORDERLINE))
+        confidences = np.clip((1.0 - distances) * 100.0, 0.0, 100.0)
+        return [(str(d), float(c), float(dist)) for d, c, dist in zip(decisions, confidences, distances)]
+
+
+# ==============================================================================
+# CLI: LABEL (GEMINI) & BUILD
+# ==============================================================================
+
+def label_with_gemini(args):
+    """Distilasi: simpan verdict Gemini per gambar ke JSONL sebagai data kalibrasi gate"""
+    import google.generativeai as genai  # type: ignore
+    from PIL import Image
+    from config_gemini import GEMINI_API_KEY_DEFAULT, GEMINI_MODEL_NAME, GEMINI_PROMPT_DETECTION
+
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY", GEMINI_API_KEY_DEFAULT))
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    with open(args.out, "a", encoding="utf-8") as out:
+        for path in list_images(args.images):
+            try:
+                with Image.open(path) as img:
+                    text = model.generate_content([GEMINI_PROMPT_DETECTION, img]).text.strip()
+                text = text.split("```json")[-1].split("```")[0].strip() if "```" in text else text
+                verdict = json.loads(text)
+            except Exception as e:
+                print(f"⚠️ {path}: {e}")
+                continue
+            record = {"path": path, "is_dragon_fruit": bool(verdict.get("is_dragon_fruit", False)),
+                      "confidence": float(verdict.get("confidence", 0.0))}
+            out.write(json.dumps(record) + "\n")
+            print(f"  {path}: {'buah naga' if record['is_dragon_fruit'] else 'bukan buah naga'}")
+
+
+def build_gate(args):
+    positives = list_images(args.positives) if args.positives else []
+    negatives = list_images(args.negatives) if args.negatives else []
+    if args.verdicts:
+        with open(args.verdicts, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                (positives if record["is_dragon_fruit"] else negatives).append(record["path"])
+    if not positives:
+        sys.exit("❌ Butuh minimal satu gambar buah naga (--positives atau --verdicts)")
+
+    print(f"🔍 Embedding {len(positives)} gambar positif, {len(negatives)} gambar negatif")
+    embeddings = embed_files(positives + negatives, args.layer)
+    gate = DragonFruitGate.fit(embeddings[:len(positives)], embeddings[len(positives):],
+                               args.accept_quantile, args.reject_quantile, args.layer or "")
+    gate.save(args.out)
+    print(f"✅ Gate disimpan ke {args.out} (accept <= {gate.accept_below:.4f}, reject >= {gate.reject_above:.4f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gate lokal deteksi buah naga (jarak embedding)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    label = sub.add_parser("label", help="Label gambar dengan Gemini ke file JSONL")
+    label.add_argument("--images", required=True, help="Folder/file gambar")
+    label.add_argument("--out", default="verdicts.jsonl")
+
+    build = sub.add_parser("build", help="Bangun gate dari gambar contoh")
+    build.add_argument("--positives", help="Folder gambar buah naga")
+    build.add_argument("--negatives", help="Folder gambar bukan buah naga")
+    build.add_argument("--verdicts", help="JSONL hasil 'label' (verdict Gemini)")
+    build.add_argument("--layer", help="Nama layer embedding (default: input layer terakhir)")
+    build.add_argument("--accept-quantile", type=float, default=0.95)
+    build.add_argument("--reject-quantile", type=float, default=0.05)
+    build.add_argument("--out", default=DRAGON_GATE_FILE)
+
+    args = parser.parse_args()
+    if args.command == "label":
+        label_with_gemini(args)
+    else:
+        build_gate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: dragonfruit.proto
+# Protobuf Python Version: 4.25.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11\x64ragonfruit.proto\x12\x0e\x64ragonfruit.v1\"g\n\x0ePredictRequest\x12\r\n\x05image\x18\x01 \x01(\x0c\x12%\n\x06models\x18\x02 \x03(\x0e\x32\x15.dragonfruit.v1.Model\x12\x0b\n\x03tta\x18\x03 \x01(\t\x12\x12\n\nrequest_id\x18\x04 \x01(\t\"\xc2\x01\n\x0fModelPrediction\x12$\n\x05model\x18\x01 \x01(\x0e\x32\x15.dragonfruit.v1.Model\x12\x12\n\nprediction\x18\x02 \x01(\t\x12\x13\n\x0b\x63lass_index\x18\x03 \x01(\x05\x12\x12\n\nis_invalid\x18\x04 \x01(\x08\x12\x12\n\nconfidence\x18\x05 \x01(\x02\x12\x0e\n\x06scores\x18\x06 \x03(\x02\x12\x17\n\x0f\x63onfidence_diff\x18\x07 \x01(\x02\x12\x0f\n\x07\x65ntropy\x18\x08 \x01(\x02\"p\n\x0fPredictResponse\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x34\n\x0bpredictions\x18\x02 \x03(\x0b\x32\x1f.dragonfruit.v1.ModelPrediction\x12\x13\n\x0b\x63lass_names\x18\x03 \x03(\t*F\n\x05Model\x12\x15\n\x11MODEL_UNSPECIFIED\x10\x00\x12\x0f\n\x0bMODEL_VGG16\x10\x01\x12\x15\n\x11MODEL_MOBILENETV2\x10\x02\x32\xb9\x01\n\x15\x44ragonFruitClassifier\x12J\n\x07Predict\x12\x1e.dragonfruit.v1.PredictRequest\x1a\x1f.dragonfruit.v1.PredictResponse\x12T\n\rPredictStream\x12\x1e.dragonfruit.v1.PredictRequest\x1a\x1f.dragonfruit.v1.PredictResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'dragonfruit_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_MODEL']._serialized_start=453
+  _globals['_MODEL']._serialized_end=523
+  _globals['_PREDICTREQUEST']._serialized_start=37
+  _globals['_PREDICTREQUEST']._serialized_end=140
+  _globals['_MODELPREDICTION']._serialized_start=143
+  _globals['_MODELPREDICTION']._serialized_end=337
+  _globals['_PREDICTRESPONSE']._serialized_start=339
+  _globals['_PREDICTRESPONSE']._serialized_end=451
+  _globals['_DRAGONFRUITCLASSIFIER']._serialized_start=526
+  _globals['_DRAGONFRUITCLASSIFIER']._serialized_end=711
+# @@protoc_insertion_point(module_scope)
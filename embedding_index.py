@@ -0,0 +1,130 @@
+"""
+Index kNN embedding training set untuk deteksi out-of-distribution (OOD) dan near-duplicate.
+
+Embedding penultimate MobileNetV2 (embeddings.py) seluruh gambar training disimpan dalam satu matriks
+ter-normalisasi L2. Pencarian = satu perkalian matriks + argpartition (exact, cukup cepat untuk ribuan
+gambar); jika faiss-cpu ter-install, dipakai IndexFlatIP dengan hasil yang sama.
+
+Contoh:
+    # Subfolder = label kelas (misal data/train/Mature Dragon Fruit/*.jpg)
+    python embedding_index.py build --images data/train/
+
+Hasil disimpan di model_results/embedding_index.npz dan otomatis dipakai api.py (endpoint MobileNetV2).
+"""
+
+import os
+import argparse
+
+import numpy as np
+
+from embeddings import embed_files, list_images
+
+# faiss opsional - tanpa faiss pencarian memakai NumPy
+try:
+    import faiss  # type: ignore
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EMBEDDING_INDEX_FILE = os.getenv("EMBEDDING_INDEX_FILE", os.path.join(BASE_DIR, 'model_results', 'embedding_index.npz'))
+# Jarak cosine di bawah nilai ini dianggap gambar yang (hampir) sama dengan gambar training
+DUPLICATE_DISTANCE = float(os.getenv("DUPLICATE_DISTANCE", "0.02"))
+
+
+class EmbeddingIndex:
+    """Index kNN (inner product pada embedding ter-normalisasi = 1 - jarak cosine)"""
+
+    def __init__(self, vectors, labels, ids, ood_distance, k=5, layer_name=""):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.labels = np.asarray(labels)
+        self.ids = np.asarray(ids)
+        self.ood_distance = float(ood_distance)
+        self.k = int(k)
+        self.layer_name = layer_name
+        self._faiss_index = None
+        if FAISS_AVAILABLE and len(self.vectors):
+            self._faiss_index = faiss.IndexFlatIP(self.vectors.shape[1])
+            self._faiss_index.add(self.vectors)
+
+    @classmethod
+    def build(cls, vectors, labels, ids, k=5, ood_quantile=0.99, layer_name=""):
+        """
+        Threshold OOD = kuantil jarak kNN rata-rata leave-one-out gambar training:
+        gambar baru yang lebih jauh dari hampir semua gambar training ke tetangganya dianggap OOD.
+        """
+        index = cls(vectors, labels, ids, ood_distance=np.inf, k=k, layer_name=layer_name)
+        distances, _ = index.search(index.vectors, k + 1)
+        index.ood_distance = float(np.quantile(distances[:, 1:].mean(axis=1), ood_quantile))
+        return index
+
+    @classmethod
+    def load(cls, path=EMBEDDING_INDEX_FILE):
+        data = np.load(path, allow_pickle=False)
+        return cls(data["vectors"].astype(np.float32), data["labels"], data["ids"], data["ood_distance"],
+                   int(data["k"]), str(data["layer_name"]))
+
+    def save(self, path=EMBEDDING_INDEX_FILE):
+        # float16 di disk: index 2x lebih kecil, selisih jarak jauh di bawah threshold
+        np.savez_compressed(path, vectors=self.vectors.astype(np.float16), labels=self.labels, ids=self.ids,
+                            ood_distance=self.ood_distance, k=self.k, layer_name=self.layer_name)
+
+    def search(self, queries, k=None):
+        """Mengembalikan (jarak cosine [N, k] terurut naik, indeks [N, k])"""
+        k = min(k or self.k, len(self.vectors))
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        if self._faiss_index is not None:
+            similarities, indices = self._faiss_index.search(queries, k)
+            return 1.0 - similarities, indices
+        similarities = queries @ self.vectors.T
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        return 1.0 - np.take_along_axis(top_similarities, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+    def statistics(self, embeddings):
+        """
+        Statistik kNN per embedding untuk field `statistics` respons API:
+        knn_distance (rata-rata k tetangga), knn_label (label mayoritas), is_ood, near_duplicate, duplicate_of.
+        """
+        distances, indices = self.search(embeddings)
+        results = []
+        for row_distances, row_indices in zip(distances, indices):
+            labels, counts = np.unique(self.labels[row_indices], return_counts=True)
+            knn_distance = float(row_distances.mean())
+            near_duplicate = bool(row_distances[0] <= DUPLICATE_DISTANCE)
+            results.append({
+                "knn_distance": knn_distance,
+                "knn_label": str(labels[np.argmax(counts)]),
+                "ood_threshold": self.ood_distance,
+                "is_ood": knn_distance > self.ood_distance,
+                "near_duplicate": near_duplicate,
+                "duplicate_of": str(self.ids[row_indices[0]]) if near_duplicate else None,
+            })
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun index kNN embedding training set")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Embedding semua gambar di folder (subfolder = label kelas)")
+    build.add_argument("--images", required=True)
+    build.add_argument("--layer", help="Nama layer embedding (default: input layer terakhir)")
+    build.add_argument("--k", type=int, default=5)
+    build.add_argument("--ood-quantile", type=float, default=0.99)
+    build.add_argument("--out", default=EMBEDDING_INDEX_FILE)
+    args = parser.parse_args()
+
+    files = list_images(args.images)
+    labels = [os.path.basename(os.path.dirname(path)) for path in files]
+    ids = [os.path.relpath(path, args.images) for path in files]
+    print(f"🔍 Embedding {len(files)} gambar")
+    vectors = embed_files(files, args.layer)
+    index = EmbeddingIndex.build(vectors, labels, ids, args.k, args.ood_quantile, args.layer or "")
+    index.save(args.out)
+    print(f"✅ Index disimpan ke {args.out} ({len(files)} vektor, threshold OOD {index.ood_distance:.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Ekstraksi embedding (fitur penultimate layer) dari model Keras yang sudah dilatih.
+
+Embedding dan output klasifikasi dihitung dalam satu forward pass, jadi fitur untuk gate lokal
+(dragon_gate.py) dan index kNN (embedding_index.py) tidak menambah inferensi kedua. Embedding di-L2-normalisasi sehingga jarak cosine
+cukup dihitung dengan dot product.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def l2_normalize(vectors, axis=-1):
+    """Normalisasi L2 per baris (aman untuk vektor nol)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=axis, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def penultimate_output(model, layer_name=None):
+    """
+    Tensor fitur yang dipakai sebagai embedding: output layer bernama layer_name jika diberikan,
+    selain itu input dari layer terakhir (head klasifikasi Dense).
+    """
+    if layer_name:
+        return model.get_layer(layer_name).output
+    return model.layers[-1].input
+
+
+class FeatureExtractor:
+    """
+    Model turunan dengan dua output: (embedding, output klasifikasi asli).
+    Dipanggil dengan batch [N, 224, 224, 3]; mengembalikan (embeddings [N, D] ter-normalisasi, outputs [N, 3]).
+    """
+
+    def __init__(self, model, layer_name=None):
+        import tensorflow as tf  # Lazy import - modul ini juga di-import oleh UI mode client
+
+        self.layer_name = layer_name or ""
+        self.model = tf.keras.Model(model.inputs, [penultimate_output(model, layer_name), model.outputs[0]])
+
+    def __call__(self, batch):
+        features, outputs = self.model(batch, training=False)
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim == 4:
+            # Feature map konvolusi -> global average pooling
+            features = features.mean(axis=(1, 2))
+        features = features.reshape(len(features), -1)
+        return l2_normalize(features), np.asarray(outputs, dtype=np.float32)
+
+
+def list_images(path):
+    """Semua file gambar di folder (rekursif) atau file tunggal"""
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for root, _, names in os.walk(path):
+        files.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return files
+
+
+def embed_files(files, layer_name=None, batch_size=32):
+    """Embedding MobileNetV2 untuk daftar file (model dan preprocessing dari api.py)"""
+    import asyncio
+    from PIL import Image
+    import api
+
+    asyncio.run(api.load_models())
+    model = api.models.get("mobilenetv2")
+    if model is None:
+        sys.exit("❌ Model MobileNetV2 tidak dapat dimuat dari model_results/")
+    extractor = FeatureExtractor(model, layer_name)
+
+    embeddings = []
+    for start in range(0, len(files), batch_size):
+        batch = []
+        for path in files[start:start + batch_size]:
+            with Image.open(path) as img:
+                batch.append(api.preprocess_image(img)[0])
+        features, _ = extractor(np.stack(batch))
+        embeddings.append(features)
+        print(f"  {min(start + batch_size, len(files))}/{len(files)} gambar")
+    return np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
@@ -0,0 +1,148 @@
+"""
+Layanan gRPC Klasifikasi Buah Naga untuk controller sorting-line internal (proto/dragonfruit.proto).
+
+Mirror endpoint REST /api/predict/* tanpa parsing multipart dan validasi Pydantic: model registry, cache prediksi,
+preprocess_image dan post-processing yang dipakai sama persis dengan api.py (api.predict_cached).
+Tersedia RPC unary (Predict) dan bidirectional streaming (PredictStream).
+
+Menjalankan server (port dari env GRPC_PORT, default 50051):
+    python grpc_server.py
+
+Benchmark terhadap REST pada concurrency yang sama:
+    python bench_api.py run --grpc localhost:50051 --concurrency 4 --out bench_results/grpc.json
+    python bench_api.py run --url http://localhost:8000 --concurrency 4 --out bench_results/rest.json
+"""
+
+import os
+import math
+import asyncio
+import hashlib
+
+import grpc
+from fastapi import HTTPException
+
+import api
+from admission import ADMISSION_ENABLED, ADMISSION_REJECTED_TOTAL, REJECTION_DETAILS, api_key_identity
+import dragonfruit_pb2 as pb2
+import dragonfruit_pb2_grpc as pb2_grpc
+
+GRPC_PORT = int(os.getenv("GRPC_PORT", "50051"))
+GRPC_MAX_MESSAGE_MB = int(os.getenv("GRPC_MAX_MESSAGE_MB", "20"))
+
+MODEL_KEYS = {
+    pb2.MODEL_VGG16: "vgg16",
+    pb2.MODEL_MOBILENETV2: "mobilenetv2",
+}
+MODEL_ENUMS = {key: enum for enum, key in MODEL_KEYS.items()}
+GRPC_ENDPOINT = "grpc"
+API_KEY_METADATA = "x-api-key"
+
+# HTTPException dari pipeline api.py dan penolakan admission control -> status gRPC
+STATUS_CODES = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+
+def client_identity(context, metadata):
+    """Sama dengan admission.client_identity: metadata x-api-key yang terdaftar, selain itu IP peer"""
+    identity = api_key_identity(metadata.get(API_KEY_METADATA))
+    if identity:
+        return identity
+    # peer: "ipv4:10.0.0.1:54321" / "ipv6:[::1]:54321"
+    peer = context.peer() or "unknown"
+    host = peer.split(":", 1)[-1].rsplit(":", 1)[0].strip("[]")
+    return "ip:" + host
+
+
+class DragonFruitClassifier(pb2_grpc.DragonFruitClassifierServicer):
+
+    def _model_keys(self, request):
+        requested = [MODEL_KEYS[m] for m in request.models if m != pb2.MODEL_UNSPECIFIED]
+        if not requested:
+            return [key for key, model in api.models.items() if model is not None]
+        for key in requested:
+            if api.models.get(key) is None:
+                raise HTTPException(status_code=503, detail=f"Model {api.MODEL_DISPLAY_NAMES[key]} tidak dimuat")
+        return requested
+
+    def _predict(self, request, model_keys, lane):
+        """Sinkron (dijalankan di thread): gambar -> PredictResponse"""
+        tta_mode = api.resolve_tta_mode(request.tta)
+        digest = hashlib.sha1(request.image).hexdigest()
+        with api.QUEUE_DEPTH.track_inprogress():
+            results = api.predict_cached(model_keys, request.image, digest, tta_mode, lane)
+
+        response = pb2.PredictResponse(request_id=request.request_id, class_names=api.CLASS_NAMES)
+        for key, result in results.items():
+            if result is None:
+                continue
+            prediction, confidence, scores, stats = result
+            score_list = [scores[name] / 100.0 for name in api.CLASS_NAMES]
+            response.predictions.add(
+                model=MODEL_ENUMS[key],
+                prediction=prediction,
+                class_index=score_list.index(max(score_list)),
+                is_invalid=not stats.get("is_valid", True),
+                confidence=confidence,
+                scores=score_list,
+                confidence_diff=stats.get("confidence_diff", 0.0),
+                entropy=stats.get("entropy", 0.0),
+            )
+        if not response.predictions:
+            raise HTTPException(status_code=500, detail="Gagal melakukan prediksi")
+        return response
+
+    async def _predict_or_abort(self, request, context):
+        if not request.image:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Field image kosong")
+        metadata = dict(context.invocation_metadata())
+        try:
+            # Lane scheduler dari metadata x-inference-lane (sama dengan header REST), default interactive
+            lane = api.resolve_lane(metadata.get(api.LANE_HEADER))
+            model_keys = self._model_keys(request)
+        except HTTPException as e:
+            await context.abort(STATUS_CODES.get(e.status_code, grpc.StatusCode.INTERNAL), str(e.detail))
+
+        # Admission control yang sama dengan REST: token bucket per klien + shedding kapasitas
+        rejection, seconds = (api.admission_controller.admit_models(client_identity(context, metadata), model_keys)
+                              if ADMISSION_ENABLED else (None, 0.0))
+        if rejection is not None:
+            status, reason, retry_after = rejection
+            ADMISSION_REJECTED_TOTAL.inc(reason=reason, endpoint=GRPC_ENDPOINT)
+            context.set_trailing_metadata((("retry-after", str(max(1, math.ceil(retry_after)))),))
+            await context.abort(STATUS_CODES[status], REJECTION_DETAILS[reason])
+
+        try:
+            # to_thread menyalin contextvars, jadi span tracing tetap tercatat di thread inferensi
+            return await asyncio.to_thread(self._predict, request, model_keys, lane)
+        except HTTPException as e:
+            await context.abort(STATUS_CODES.get(e.status_code, grpc.StatusCode.INTERNAL), str(e.detail))
+        finally:
+            api.admission_controller.release(seconds)
+
+    async def Predict(self, request, context):
+        return await self._predict_or_abort(request, context)
+
+    async def PredictStream(self, request_iterator, context):
+        async for request in request_iterator:
+            yield await self._predict_or_abort(request, context)
+
+
+async def serve(port=GRPC_PORT):
+    await api.load_models()
+    max_bytes = GRPC_MAX_MESSAGE_MB * 1024 * 1024
+    server = grpc.aio.server(options=[
+        ("grpc.max_receive_message_length", max_bytes),
+        ("grpc.max_send_message_length", max_bytes),
+    ])
+    pb2_grpc.add_DragonFruitClassifierServicer_to_server(DragonFruitClassifier(), server)
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    print(f"🚀 gRPC server berjalan di port {port}")
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,138 @@
+"""
+Client inferensi untuk UI Streamlit - memanggil layanan FastAPI (api.py) alih-alih memuat TensorFlow.
+
+Aktif jika env INFERENCE_API_URL di-set, contoh:
+    INFERENCE_API_URL=http://localhost:8000 streamlit run app_naga.py
+    INFERENCE_API_URL=stub://            streamlit run app_naga.py   # stand-in lokal tanpa server/TF (untuk test UI)
+
+Satu tier inferensi bisa melayani banyak replika UI, dan proses UI tidak perlu import TensorFlow.
+"""
+
+import os
+import hashlib
+import threading
+
+import numpy as np
+
+from tensor_ingest import encode_tensor
+
+CLASS_NAMES = ['Defect Dragon Fruit', 'Immature Dragon Fruit', 'Mature Dragon Fruit']
+MODEL_KEYS = ("vgg16", "mobilenetv2")
+
+
+def _array_to_tensor_upload(img_array):
+    """
+    Array hasil preprocess ([1, H, W, 3], nilai uint8/255) -> part upload tensor uint8 mentah (tensor_ingest.py).
+    Server memakai array ini langsung tanpa decode/preprocess, jadi hasil prediksi sama dengan mode lokal.
+    """
+    pixels = np.clip(np.rint(img_array[0] * 255.0), 0, 255).astype(np.uint8)
+    data, content_type, headers = encode_tensor(pixels)
+    return ("frame.raw", data, content_type, headers)
+
+
+class InferenceClient:
+    """Client HTTP ke api.py dengan connection pool (keep-alive) yang dipakai bersama semua sesi UI"""
+
+    def __init__(self, base_url, timeout=30.0, pool_size=16, retries=2):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Identitas untuk rate limit api.py (admission.py); daftarkan di RATE_LIMIT_EXEMPT_KEYS server
+        api_key = os.getenv("INFERENCE_API_KEY")
+        if api_key:
+            self.session.headers["X-API-Key"] = api_key
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            # Hanya gagal koneksi yang diulang untuk semua method (request belum sampai ke server). Retry status
+            # 502/504 hanya untuk method idempoten (GET /api/health); POST /api/predict/* tidak pernah diulang,
+            # dan 503 (load shedding admission.py) tidak diulang sama sekali agar tidak memperparah beban
+            max_retries=Retry(total=retries, connect=retries, read=0, backoff_factor=0.2,
+                              status_forcelist=(502, 504), allowed_methods=Retry.DEFAULT_ALLOWED_METHODS),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def health(self):
+        response = self.session.get(f"{self.base_url}/api/health", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def loaded_models(self):
+        health = self.health()
+        return {key: bool(health.get(f"{key}_loaded")) for key in MODEL_KEYS}
+
+    def predict_scores(self, model_key, img_array):
+        """Mengembalikan skor softmax (np.ndarray [3], urutan CLASS_NAMES) dari endpoint /api/predict/<model_key>"""
+        files = {"file": _array_to_tensor_upload(img_array)}
+        response = self.session.post(f"{self.base_url}/api/predict/{model_key}", files=files, timeout=self.timeout)
+        response.raise_for_status()
+        scores = response.json()["scores"]
+        return np.array([scores[name] / 100.0 for name in CLASS_NAMES], dtype=np.float32)
+
+
+class StubInferenceClient:
+    """
+    Stand-in lokal untuk test UI: tanpa HTTP dan tanpa TensorFlow.
+    Skor deterministik diturunkan dari warna rata-rata gambar, jadi gambar yang sama selalu memberi hasil yang sama.
+    """
+
+    def __init__(self, loaded=MODEL_KEYS):
+        self.loaded = set(loaded)
+
+    def health(self):
+        return {"status": "healthy", **{f"{key}_loaded": key in self.loaded for key in MODEL_KEYS}}
+
+    def loaded_models(self):
+        return {key: key in self.loaded for key in MODEL_KEYS}
+
+    def predict_scores(self, model_key, img_array):
+        mean_rgb = img_array.reshape(-1, 3).mean(axis=0)
+        # Merah dominan -> Mature, hijau dominan -> Immature, gelap -> Defect
+        logits = np.array([1.0 - mean_rgb.mean(), mean_rgb[1], mean_rgb[0]], dtype=np.float32) * 6.0
+        if model_key == "vgg16":
+            logits = logits * 1.1
+        exp = np.exp(logits - logits.max())
+        return exp / exp.sum()
+
+
+class RemoteModel:
+    """
+    Pengganti model Keras di UI: menyediakan predict_scores(img_array).
+    Hasil terakhir di-memo per array, karena TAHAP 1 (fallback) dan TAHAP 2 memakai gambar yang sama.
+    """
+
+    def __init__(self, client, model_key):
+        self.client = client
+        self.model_key = model_key
+        self._lock = threading.Lock()
+        self._last = (None, None)
+
+    def predict_scores(self, img_array):
+        digest = hashlib.sha1(np.ascontiguousarray(img_array).tobytes()).hexdigest()
+        with self._lock:
+            last_digest, last_scores = self._last
+        if digest == last_digest:
+            return last_scores.copy()
+        scores = self.client.predict_scores(self.model_key, img_array)
+        with self._lock:
+            self._last = (digest, scores)
+        return scores.copy()
+
+
+def connect(api_url, **kwargs):
+    """Membuat client dari URL: 'stub://' untuk stand-in lokal, selain itu HTTP(S) ke api.py"""
+    if api_url.startswith("stub://"):
+        return StubInferenceClient()
+    return InferenceClient(api_url, **kwargs)
+
+
+def load_remote_models(api_url, **kwargs):
+    """Mengembalikan (model_vgg16, model_mobilenetv2) berupa RemoteModel, atau None jika model tidak dimuat di server"""
+    client = connect(api_url, **kwargs)
+    loaded = client.loaded_models()
+    return tuple(RemoteModel(client, key) if loaded.get(key) else None for key in MODEL_KEYS)
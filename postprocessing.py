@@ -0,0 +1,91 @@
+"""
+Post-processing skor softmax yang dipakai bersama oleh UI Streamlit (app_naga.py) dan API (api.py).
+
+Semua fungsi bekerja pada array [N, 3] (satu baris per gambar, urutan CLASS_NAMES) tanpa loop Python
+per elemen, jadi jalur yang sama dipakai untuk satu gambar, batch, maupun stream. Hanya butuh NumPy.
+"""
+
+import numpy as np
+
+CLASS_NAMES = ['Defect Dragon Fruit', 'Immature Dragon Fruit', 'Mature Dragon Fruit']
+INVALID_CLASS_NAME = "Tidak Valid - Bukan Buah Naga"
+
+
+def softmax(logits, axis=-1):
+    """Softmax NumPy yang stabil secara numerik (setara tf.nn.softmax)"""
+    logits = np.asarray(logits, dtype=np.float32)
+    exp = np.exp(logits - np.max(logits, axis=axis, keepdims=True))
+    return exp / np.sum(exp, axis=axis, keepdims=True)
+
+
+def score_stats(scores):
+    """
+    Statistik dan deteksi "Tidak Valid" per baris untuk skor softmax [N, 3].
+    Mengembalikan dict berisi array [N]: predicted_index, max_confidence (persen), confidence_diff (persen),
+    entropy, is_invalid; plus max_entropy (skalar).
+    """
+    scores = np.atleast_2d(np.asarray(scores, dtype=np.float32))
+    num_classes = scores.shape[1]
+    predicted_index = np.argmax(scores, axis=1)
+    max_confidence = scores.max(axis=1) * 100
+    if num_classes > 1:
+        top2 = np.partition(scores, num_classes - 2, axis=1)[:, -2:]
+        confidence_diff = (top2[:, 1] - top2[:, 0]) * 100
+    else:
+        confidence_diff = np.full(len(scores), 100.0, dtype=np.float32)
+    entropy = -np.sum(scores * np.log(scores + 1e-10), axis=1)
+    max_entropy = np.log(num_classes)
+
+    # Threshold "Tidak Valid" (sama dengan logika per gambar sebelumnya)
+    low = max_confidence < 70
+    mid = (max_confidence >= 75) & (max_confidence < 85) & (
+        (confidence_diff < 30) | ((entropy > max_entropy * 0.50) & (confidence_diff < 40)))
+    high = (max_confidence >= 85) & (max_confidence < 98) & (
+        (confidence_diff < 50) | ((entropy > max_entropy * 0.45) & (confidence_diff < 60)))
+
+    return {
+        "predicted_index": predicted_index,
+        "max_confidence": max_confidence,
+        "confidence_diff": confidence_diff,
+        "entropy": entropy,
+        "max_entropy": float(max_entropy),
+        "is_invalid": low | mid | high,
+    }
+
+
+def calibrate_scores(scores, confidences=None, floor=80.0, cap=92.0, ceiling=95.0, max_boost=0.15,
+                     jitter=(-1.0, 2.0), rng=None):
+    """
+    Kalibrasi tampilan UI untuk skor [N, 3]: baris dengan confidence < floor dinaikkan secara proporsional
+    (boost maks max_boost, dibatasi cap), diberi variasi acak kecil (jitter, None = tanpa variasi) lalu
+    di-clip ke [floor, ceiling]. Skor kelas terprediksi diganti dengan confidence baru dan sisanya
+    didistribusikan ke kelas lain dengan proporsi yang sama (rata jika semuanya nol).
+    confidences: confidence awal per baris (persen); default skor tertinggi * 100.
+    Mengembalikan (scores_terkalibrasi [N, 3], confidences [N]); input tidak diubah.
+    """
+    scores = np.atleast_2d(np.asarray(scores, dtype=np.float32))
+    num_rows, num_classes = scores.shape
+    predicted_index = np.argmax(scores, axis=1)
+    if confidences is None:
+        confidences = scores.max(axis=1) * 100
+    confidences = np.asarray(confidences, dtype=np.float32).reshape(num_rows)
+
+    boost_rows = confidences < floor
+    boost_factor = 1.0 + ((floor - confidences) / 100.0) * max_boost
+    boosted = np.maximum(floor, np.minimum(cap, confidences * boost_factor))
+    if jitter is not None:
+        rng = np.random.default_rng() if rng is None else rng
+        boosted = boosted + rng.uniform(jitter[0], jitter[1], size=num_rows)
+    boosted = np.clip(boosted, floor, ceiling)
+    new_confidences = np.where(boost_rows, boosted, confidences).astype(np.float32)
+
+    # Redistribusi sisa probabilitas ke kelas selain kelas terprediksi
+    predicted_mask = np.arange(num_classes) == predicted_index[:, None]
+    others = np.where(predicted_mask, 0.0, scores)
+    other_sum = others.sum(axis=1, keepdims=True)
+    remaining = 1.0 - new_confidences[:, None] / 100.0
+    redistributed = np.where(other_sum > 0, others / np.where(other_sum > 0, other_sum, 1.0) * remaining,
+                             remaining / max(num_classes - 1, 1))
+    calibrated = np.where(predicted_mask, new_confidences[:, None] / 100.0, redistributed)
+
+    return np.where(boost_rows[:, None], calibrated, scores).astype(np.float32), new_confidences
@@ -0,0 +1,90 @@
+"""
+Kebijakan preprocessing gambar -> input model [1, 224, 224, 3] float32 (0..1), dipakai bersama api.py dan app_naga.py.
+
+Mode resize (env PREPROCESS_RESIZE):
+    stretch     - resize langsung ke 224x224 (default, sama dengan saat training; foto non-persegi terdistorsi)
+    letterbox   - pertahankan aspect ratio, sisi terpanjang = 224, sisa diisi padding putih
+    center_crop - pertahankan aspect ratio, sisi terpendek = 224, lalu crop tengah
+
+Filter resampling (env PREPROCESS_FILTER):
+    default  - filter default PIL (bicubic), perilaku lama
+    nearest  - tercepat, paling banyak aliasing
+    bilinear - bilinear penuh
+    reduce   - reduksi kelipatan bulat (box) dulu lalu bilinear (reducing_gap); cepat untuk foto kamera besar
+
+Kebijakan selain default harus dicek dulu dengan validate_preprocessing.py (akurasi pada data berlabel) dan
+benchmarks/bench_preprocessing.py (kecepatan).
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+RESIZE_MODES = ("stretch", "letterbox", "center_crop")
+RESAMPLE_FILTERS = ("default", "nearest", "bilinear", "reduce")
+PREPROCESS_RESIZE = os.getenv("PREPROCESS_RESIZE", "stretch")
+PREPROCESS_FILTER = os.getenv("PREPROCESS_FILTER", "default")
+# Warna padding letterbox, sama dengan latar transparansi di convert_to_rgb
+LETTERBOX_FILL = (255, 255, 255)
+
+if PREPROCESS_RESIZE not in RESIZE_MODES or PREPROCESS_FILTER not in RESAMPLE_FILTERS:
+    raise ValueError(f"PREPROCESS_RESIZE harus salah satu dari {RESIZE_MODES} dan "
+                     f"PREPROCESS_FILTER salah satu dari {RESAMPLE_FILTERS}")
+
+
+def convert_to_rgb(img):
+    """Konversi RGBA/LA/P (transparansi di atas latar putih) dan mode lain ke RGB"""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _resize(img, size, resample, box=None):
+    """img.resize dengan filter sesuai kebijakan (box = area sumber yang di-resample)"""
+    if resample == "default":
+        return img.resize(size, box=box)
+    if resample == "nearest":
+        return img.resize(size, Image.NEAREST, box=box)
+    if resample == "bilinear":
+        return img.resize(size, Image.BILINEAR, box=box)
+    if resample == "reduce":
+        return img.resize(size, Image.BILINEAR, box=box, reducing_gap=2.0)
+    raise ValueError(f"Filter resampling harus salah satu dari: {', '.join(RESAMPLE_FILTERS)}")
+
+
+def resize_image(img, width, height, mode=PREPROCESS_RESIZE, resample=PREPROCESS_FILTER):
+    """Resize PIL Image RGB ke (width, height) sesuai mode resize dan filter"""
+    if mode == "stretch":
+        return _resize(img, (width, height), resample)
+
+    if mode == "letterbox":
+        scale = min(width / img.width, height / img.height)
+        inner = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        canvas = Image.new('RGB', (width, height), LETTERBOX_FILL)
+        canvas.paste(_resize(img, inner, resample), ((width - inner[0]) // 2, (height - inner[1]) // 2))
+        return canvas
+
+    if mode == "center_crop":
+        # Area tengah langsung dijadikan box sumber resize: tanpa copy crop, hanya area itu yang di-resample
+        scale = max(width / img.width, height / img.height)
+        crop_w, crop_h = width / scale, height / scale
+        left, top = (img.width - crop_w) / 2, (img.height - crop_h) / 2
+        return _resize(img, (width, height), resample, box=(left, top, left + crop_w, top + crop_h))
+
+    raise ValueError(f"Mode resize harus salah satu dari: {', '.join(RESIZE_MODES)}")
+
+
+def to_model_input(img, width, height, mode=PREPROCESS_RESIZE, resample=PREPROCESS_FILTER):
+    """PIL Image (mode apa pun) -> array [1, height, width, 3] float32 ternormalisasi 0..1"""
+    img = resize_image(convert_to_rgb(img), width, height, mode, resample)
+    # Setara image.img_to_array untuk gambar RGB, tanpa perlu import TensorFlow
+    img_array = np.asarray(img, dtype=np.float32)
+    img_array = np.expand_dims(img_array, axis=0)
+    return img_array / 255.0  # Normalisasi
@@ -0,0 +1,223 @@
+"""
+Scheduler inferensi dengan dua lane prioritas untuk instance model bersama di api.py.
+
+    interactive - scan kamera / UI: batch kecil, selalu diambil lebih dulu
+    bulk        - grading offline: mengisi kapasitas sisa dengan batch besar
+
+Semua forward pass dijalankan satu thread worker, jadi model tidak pernah dipanggil bersamaan. Setelah setiap
+batch worker kembali memeriksa lane interactive lebih dulu: request interactive "memotong" antrean bulk di batas
+batch (batch bulk yang sedang berjalan tidak diinterupsi). Job yang lebih besar dari batas batch lane-nya (tiles,
+view TTA, batch offline) dipotong menjadi beberapa forward pass dan hasilnya digabung kembali, sehingga job besar
+pun tidak menahan worker lebih lama dari satu batch. Lane bulk menunggu sebentar (BULK_BATCH_WAIT_MS) agar batch
+terisi, kecuali ada request interactive yang masuk.
+
+Pemanggil (thread request, lihat asyncio.to_thread di api.py) memanggil run() dan menunggu hasilnya.
+Metrik per lane: latensi (antre + forward), pelanggaran SLO, kedalaman antrean dan ukuran batch.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from metrics import Counter, Gauge, Histogram
+
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+LANE_HEADER = "x-inference-lane"
+
+INTERACTIVE_MAX_BATCH = int(os.getenv("INTERACTIVE_MAX_BATCH", "8"))
+BULK_MAX_BATCH = int(os.getenv("BULK_MAX_BATCH", "32"))
+BULK_BATCH_WAIT_MS = float(os.getenv("BULK_BATCH_WAIT_MS", "20"))
+# Target latensi (antre + forward) per lane
+LANE_SLO_SECONDS = {
+    LANE_INTERACTIVE: float(os.getenv("INTERACTIVE_SLO_MS", "1000")) / 1000.0,
+    LANE_BULK: float(os.getenv("BULK_SLO_MS", "30000")) / 1000.0,
+}
+
+LANE_LATENCY = Histogram("dragonfruit_lane_latency_seconds", "Latensi antre + forward per lane scheduler",
+                         ["lane", "model"])
+LANE_REQUESTS_TOTAL = Counter("dragonfruit_lane_requests_total", "Job forward per lane scheduler", ["lane"])
+LANE_SLO_VIOLATIONS_TOTAL = Counter("dragonfruit_lane_slo_violations_total",
+                                    "Job forward yang melewati target SLO lane-nya", ["lane"])
+LANE_QUEUE_DEPTH = Gauge("dragonfruit_lane_queue_depth", "Job yang menunggu di antrean per lane", ["lane"])
+BATCH_SIZE = Histogram("dragonfruit_scheduler_batch_size", "Jumlah gambar per forward pass scheduler",
+                       ["lane", "model"], buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+
+
+class _Job:
+    __slots__ = ("model_key", "model", "batch", "lane", "observe", "limit", "enqueued", "offset", "parts", "done",
+                 "result", "error")
+
+    def __init__(self, model_key, model, batch, lane, observe=True, limit=None):
+        self.model_key = model_key
+        self.model = model
+        self.batch = batch
+        self.lane = lane
+        self.observe = observe
+        self.limit = limit
+        self.enqueued = time.perf_counter()
+        self.offset = 0  # baris batch yang sudah diambil worker (job besar diproses per potongan)
+        self.parts = []  # hasil forward per potongan, berurutan
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    @property
+    def remaining(self):
+        return len(self.batch) - self.offset
+
+    def assemble(self):
+        if len(self.parts) == 1:
+            return self.parts[0]
+        embeddings = [part[0] for part in self.parts]
+        return (None if embeddings[0] is None else np.concatenate(embeddings),
+                np.concatenate([part[1] for part in self.parts]))
+
+
+class InferenceScheduler:
+    """
+    forward(model_key, model, batch) -> (embeddings [N, D] atau None, predictions [N, C]) dijalankan di thread worker.
+    observe(model_key, detik) (opsional) menerima durasi setiap forward pass yang berisi job request biasa
+    (bukan warm-up/autotune, lihat run(observe=False)), misal untuk estimasi kapasitas admission control.
+    Ukuran batch maksimum bisa diatur per lane dan per model (configure), misal dari hasil autotune.
+    """
+
+    def __init__(self, forward, interactive_batch=INTERACTIVE_MAX_BATCH, bulk_batch=BULK_MAX_BATCH,
+                 bulk_wait_ms=BULK_BATCH_WAIT_MS, observe=None):
+        self.forward = forward
+        self.observe = observe
+        self.default_batch = {LANE_INTERACTIVE: interactive_batch, LANE_BULK: bulk_batch}
+        self.max_batch = {LANE_INTERACTIVE: {}, LANE_BULK: {}}
+        self.bulk_wait = bulk_wait_ms / 1000.0
+        self._queues = {lane: deque() for lane in LANES}
+        self._cond = threading.Condition()
+        self._worker = None
+
+    def configure(self, model_key, interactive_batch=None, bulk_batch=None):
+        """Ukuran batch maksimum untuk satu model (None = tidak diubah)"""
+        with self._cond:
+            if interactive_batch:
+                self.max_batch[LANE_INTERACTIVE][model_key] = int(interactive_batch)
+            if bulk_batch:
+                self.max_batch[LANE_BULK][model_key] = int(bulk_batch)
+
+    def batch_limit(self, lane, model_key):
+        return self.max_batch[lane].get(model_key, self.default_batch[lane])
+
+    def run(self, model_key, model, batch, lane=LANE_INTERACTIVE, observe=True, batch_limit=None):
+        """
+        Antrekan batch [N, H, W, 3] di lane, tunggu hasil forward-nya (dipanggil dari thread request).
+        observe=False untuk job sintetis (warm-up, autotune) agar durasinya tidak diteruskan ke callback observe.
+        batch_limit menggantikan batas batch lane untuk forward yang dimulai job ini (autotune mengukur ukuran
+        batch di atas batas saat ini tanpa dipotong).
+        """
+        job = _Job(model_key, model, batch, lane, observe, batch_limit)
+        with self._cond:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="inference-scheduler", daemon=True)
+                self._worker.start()
+            self._queues[lane].append(job)
+            LANE_QUEUE_DEPTH.inc(lane=lane)
+            self._cond.notify()
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _take(self, lane):
+        """
+        Ambil potongan job dari lane untuk satu forward: model yang sama dengan job terdepan, sampai batas batch.
+        Job terdepan yang melebihi batas hanya diambil sebagian dan tetap di depan antrean, sehingga lane
+        interactive bisa menyela di antara potongannya. Mengembalikan (lane, [(job, awal, akhir), ...]).
+        """
+        queue = self._queues[lane]
+        first = queue[0]
+        limit = first.limit or self.batch_limit(lane, first.model_key)
+        end = min(len(first.batch), first.offset + limit)
+        chunks = [(first, first.offset, end)]
+        rows = end - first.offset
+        first.offset = end
+        if first.remaining:
+            return lane, chunks
+
+        queue.popleft()
+        taken, skipped = 1, []
+        while queue and rows < limit:
+            job = queue.popleft()
+            if job.model_key == first.model_key and rows + job.remaining <= limit:
+                chunks.append((job, job.offset, len(job.batch)))
+                rows += job.remaining
+                job.offset = len(job.batch)
+                taken += 1
+            else:
+                skipped.append(job)
+        queue.extendleft(reversed(skipped))
+        LANE_QUEUE_DEPTH.dec(taken, lane=lane)
+        return lane, chunks
+
+    def _discard(self, lane, job):
+        """Buang sisa potongan job yang gagal dari antrean"""
+        with self._cond:
+            if job in self._queues[lane]:
+                self._queues[lane].remove(job)
+                LANE_QUEUE_DEPTH.dec(lane=lane)
+
+    def _next_jobs(self):
+        with self._cond:
+            while True:
+                if self._queues[LANE_INTERACTIVE]:
+                    return self._take(LANE_INTERACTIVE)
+                bulk = self._queues[LANE_BULK]
+                if bulk:
+                    rows = sum(job.remaining for job in bulk)
+                    # Beri kesempatan batch bulk terisi, kecuali batch sudah penuh (batas job sendiri jika ada,
+                    # sama dengan _take), job tertua sudah cukup lama atau job terdepan sedang diproses per potongan
+                    age = time.perf_counter() - bulk[0].enqueued
+                    limit = bulk[0].limit or self.batch_limit(LANE_BULK, bulk[0].model_key)
+                    if rows >= limit or age >= self.bulk_wait or bulk[0].offset:
+                        return self._take(LANE_BULK)
+                    self._cond.wait(self.bulk_wait - age)
+                    continue
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            lane, chunks = self._next_jobs()
+            first = chunks[0][0]
+            BATCH_SIZE.observe(sum(end - start for _, start, end in chunks), lane=lane, model=first.model_key)
+            try:
+                if len(chunks) == 1:
+                    batch = first.batch[chunks[0][1]:chunks[0][2]]
+                else:
+                    batch = np.concatenate([job.batch[start:end] for job, start, end in chunks])
+                started = time.perf_counter()
+                embeddings, predictions = self.forward(first.model_key, first.model, batch)
+                if self.observe is not None and any(job.observe for job, _, _ in chunks):
+                    self.observe(first.model_key, time.perf_counter() - started)
+                position = 0
+                for job, start, end in chunks:
+                    size = end - start
+                    job.parts.append((None if embeddings is None else embeddings[position:position + size],
+                                      predictions[position:position + size]))
+                    position += size
+            except Exception as e:
+                for job, _, _ in chunks:
+                    job.error = e
+            finished = time.perf_counter()
+            for job, _, end in chunks:
+                if end < len(job.batch):
+                    if job.error is None:
+                        continue  # potongan berikutnya masih di antrean
+                    self._discard(lane, job)
+                if job.error is None:
+                    job.result = job.assemble()
+                latency = finished - job.enqueued
+                LANE_LATENCY.observe(latency, lane=lane, model=job.model_key)
+                LANE_REQUESTS_TOTAL.inc(lane=lane)
+                if latency > LANE_SLO_SECONDS[lane]:
+                    LANE_SLO_VIOLATIONS_TOTAL.inc(lane=lane)
+                job.done.set()
@@ -0,0 +1,70 @@
+"""
+Ingest tensor mentah: frame RGB 224x224 yang sudah di-resize di perangkat edge dikirim apa adanya,
+tanpa JPEG/PNG, sehingga server tidak perlu Image.open maupun preprocess_image.
+
+Format part `file` (multipart) yang diterima endpoint prediksi selain image/*:
+    application/octet-stream  - byte uint8 mentah HWC, shape dari header part X-Tensor-Shape (default 224,224,3)
+    application/x-npy         - file .npy (np.save) dtype uint8, shape [224, 224, 3] atau [1, 224, 224, 3]
+Keduanya boleh di-base64 dengan header part `Content-Transfer-Encoding: base64`.
+
+Contoh (requests):
+    files = {"file": ("frame.raw", frame.tobytes(), "application/octet-stream", {"X-Tensor-Shape": "224,224,3"})}
+"""
+
+import io
+import base64
+import binascii
+
+import numpy as np
+
+RAW_CONTENT_TYPE = "application/octet-stream"
+NPY_CONTENT_TYPE = "application/x-npy"
+TENSOR_CONTENT_TYPES = (RAW_CONTENT_TYPE, NPY_CONTENT_TYPE)
+SHAPE_HEADER = "x-tensor-shape"
+TRANSFER_ENCODING_HEADER = "content-transfer-encoding"
+
+
+def is_tensor_upload(content_type):
+    """Apakah content type part upload adalah salah satu format tensor"""
+    return (content_type or "").split(";")[0].strip().lower() in TENSOR_CONTENT_TYPES
+
+
+def decode_tensor(data, content_type, height, width, shape_header=None, transfer_encoding=None):
+    """
+    bytes upload -> array uint8 [height, width, 3] (view di atas buffer upload jika memungkinkan, tanpa copy).
+    ValueError jika format, dtype atau shape tidak sesuai input model.
+    """
+    if (transfer_encoding or "").strip().lower() == "base64":
+        try:
+            data = base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("Base64 tidak valid")
+
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type == NPY_CONTENT_TYPE:
+        try:
+            pixels = np.load(io.BytesIO(data), allow_pickle=False)
+        except Exception:
+            raise ValueError("File .npy tidak valid")
+    else:
+        try:
+            shape = tuple(int(v) for v in (shape_header or f"{height},{width},3").split(","))
+        except ValueError:
+            raise ValueError("Header X-Tensor-Shape harus berupa angka dipisah koma, contoh 224,224,3")
+        if len(data) != int(np.prod(shape)):
+            raise ValueError(f"Ukuran data {len(data)} byte tidak sesuai shape {shape} (uint8)")
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+
+    if pixels.dtype != np.uint8:
+        raise ValueError(f"dtype tensor harus uint8, bukan {pixels.dtype}")
+    if pixels.ndim == 4 and pixels.shape[0] == 1:
+        pixels = pixels[0]
+    if pixels.shape != (height, width, 3):
+        raise ValueError(f"Shape tensor harus ({height}, {width}, 3), bukan {pixels.shape}")
+    return pixels
+
+
+def encode_tensor(pixels):
+    """Array uint8 [H, W, 3] -> (bytes, content type, header part) untuk upload format mentah"""
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    return pixels.tobytes(), RAW_CONTENT_TYPE, {"X-Tensor-Shape": ",".join(str(v) for v in pixels.shape)}
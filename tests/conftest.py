@@ -0,0 +1,11 @@
+"""
+Unit test modul tanpa TensorFlow (scheduler, admission control, tiling). Jalankan dari root repository:
+    pytest tests/
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
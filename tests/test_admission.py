@@ -0,0 +1,108 @@
+from urllib.parse import parse_qs
+
+import pytest
+
+import admission
+from admission import PRIOR_LATENCY, AdmissionController, TokenBucket, client_identity, tile_cost_factor
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2, burst=2, now=0.0)
+    assert bucket.take(1, 0.0) == 0
+    assert bucket.take(1, 0.0) == 0
+    assert bucket.take(1, 0.0) == pytest.approx(0.5)
+    assert bucket.take(1, 0.5) == 0
+
+
+def test_token_bucket_cost_is_clamped_to_burst():
+    bucket = TokenBucket(rate=1, burst=1, now=0.0)
+    assert bucket.take(2, 0.0) == 0  # /both (2 token) tetap bisa lolos saat bucket penuh
+
+
+@pytest.mark.parametrize("query, factor", [
+    ("grid=4", 4),
+    ("grid=8&overlap=0.75", 8),
+    ("grid=100000", 1),
+    ("grid=0", 1),
+    ("grid=-5", 1),
+    ("grid=3&overlap=5", 1),
+    ("grid=abc", 1),
+    ("", 3),
+])
+def test_tile_cost_factor_uses_endpoint_bounds(query, factor):
+    assert tile_cost_factor(parse_qs(query)) == factor
+
+
+def test_oversized_grid_does_not_inflate_cost():
+    controller = AdmissionController(rate=100, burst=100, max_wait=10)
+    _, seconds, _ = controller.request_cost("/api/predict/tiles", "model=vgg16&grid=100000")
+    assert seconds == pytest.approx(PRIOR_LATENCY["vgg16"])
+
+
+def test_rate_limit_returns_429_with_retry_after():
+    controller = AdmissionController(rate=1, burst=1, max_wait=100)
+    rejection, seconds = controller.admit("ip:1", "/api/predict/mobilenetv2", "")
+    assert rejection is None
+    controller.release(seconds)
+    rejection, _ = controller.admit("ip:1", "/api/predict/mobilenetv2", "")
+    assert rejection[:2] == (429, "rate_limit")
+    assert rejection[2] > 0
+    # Klien lain punya bucket sendiri
+    assert controller.admit("ip:2", "/api/predict/mobilenetv2", "")[0] is None
+
+
+def test_capacity_sheds_low_priority_before_high_priority():
+    controller = AdmissionController(rate=100, burst=100, max_wait=1.0)
+    controller.latency = {"vgg16": 0.4, "mobilenetv2": 0.1}
+    assert controller.admit("ip:1", "/api/predict/vgg16", "")[0] is None  # pending 0.4 s
+
+    rejection, _ = controller.admit("ip:2", "/api/predict/vgg16", "")  # 0.8 s > 0.5 s (batas low priority)
+    assert rejection[:2] == (503, "capacity")
+    assert controller.admit("ip:3", "/api/predict/mobilenetv2", "")[0] is None  # 0.5 s <= 1.0 s
+
+
+def test_release_frees_capacity():
+    controller = AdmissionController(rate=100, burst=100, max_wait=1.0)
+    controller.latency = {"vgg16": 0.6, "mobilenetv2": 0.1}
+    _, seconds = controller.admit("ip:1", "/api/predict/vgg16", "")
+    assert controller.admit("ip:2", "/api/predict/vgg16", "")[0] is not None
+    controller.release(seconds)
+    assert controller.admit("ip:2", "/api/predict/vgg16", "")[0] is None
+
+
+def test_observe_updates_latency_ewma():
+    controller = AdmissionController()
+    controller.latency = {"vgg16": 1.0}
+    controller.observe("vgg16", 2.0)
+    assert controller.latency["vgg16"] == pytest.approx(1.2)
+
+
+def test_client_identity_prefers_known_api_key():
+    scope = {"headers": [(b"x-api-key", b"secret")], "client": ("10.0.0.1", 1234)}
+    assert client_identity(scope, known_keys={"secret"}) == "key:secret"
+    assert client_identity({"headers": [], "client": ("10.0.0.1", 1234)}) == "ip:10.0.0.1"
+
+
+def test_rotating_unknown_api_keys_share_the_ip_bucket():
+    controller = AdmissionController(rate=1, burst=2, max_wait=10)
+    rejections = []
+    for i in range(4):
+        scope = {"headers": [(b"x-api-key", f"random-{i}".encode())], "client": ("10.0.0.1", 1234)}
+        identity = client_identity(scope, known_keys={"secret"})
+        assert identity == "ip:10.0.0.1"
+        rejection, seconds = controller.admit(identity, "/api/predict/mobilenetv2", "")
+        controller.release(seconds)
+        rejections.append(rejection and rejection[0])
+    assert rejections == [None, None, 429, 429]
+
+
+def test_forged_forwarded_for_uses_rightmost_hop(monkeypatch):
+    monkeypatch.setattr(admission, "TRUST_FORWARDED_FOR", True)
+    scope = {"headers": [(b"x-forwarded-for", b"1.2.3.4, 203.0.113.7")], "client": ("10.0.0.1", 1234)}
+    assert client_identity(scope) == "ip:203.0.113.7"
+
+
+def test_forwarded_for_ignored_unless_trusted(monkeypatch):
+    monkeypatch.setattr(admission, "TRUST_FORWARDED_FOR", False)
+    scope = {"headers": [(b"x-forwarded-for", b"1.2.3.4")], "client": ("10.0.0.1", 1234)}
+    assert client_identity(scope) == "ip:10.0.0.1"
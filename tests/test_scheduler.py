@@ -0,0 +1,136 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from scheduler import LANE_BULK, LANE_INTERACTIVE, InferenceScheduler
+
+
+class RecordingForward:
+    """forward palsu: prediksi = nilai piksel pertama tiap baris, mencatat (model, ukuran batch) tiap pemanggilan"""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.calls = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def __call__(self, model_key, model, batch):
+        self.calls.append((model_key, len(batch)))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail_on is not None and len(self.calls) == self.fail_on:
+            raise RuntimeError("forward gagal")
+        return None, batch[:, 0, 0, :1].copy()
+
+
+def make_batch(rows, start=0):
+    values = np.arange(start, start + rows, dtype=np.float32)
+    return np.broadcast_to(values[:, None, None, None], (rows, 2, 2, 3)).copy()
+
+
+def run_in_thread(scheduler, results, name, *args):
+    def target():
+        results[name] = scheduler.run(*args)
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+
+def test_oversized_job_is_split_into_lane_sized_chunks():
+    forward = RecordingForward()
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=32, bulk_wait_ms=0)
+
+    _, predictions = scheduler.run("vgg16", None, make_batch(100), LANE_BULK)
+
+    assert [size for _, size in forward.calls] == [32, 32, 32, 4]
+    np.testing.assert_array_equal(predictions[:, 0], np.arange(100, dtype=np.float32))
+
+
+def test_interactive_preempts_between_chunks_of_bulk_job():
+    forward = RecordingForward(delay=0.02)
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=10, bulk_wait_ms=0)
+    results = {}
+
+    bulk = run_in_thread(scheduler, results, "bulk", "vgg16", None, make_batch(100), LANE_BULK)
+    time.sleep(0.03)  # chunk bulk pertama sedang berjalan
+    interactive = run_in_thread(scheduler, results, "interactive", "mobilenetv2", None, make_batch(1, 500),
+                                LANE_INTERACTIVE)
+    bulk.join(5)
+    interactive.join(5)
+
+    order = [key for key, _ in forward.calls]
+    assert order.index("mobilenetv2") < len(order) - 1, "interactive harus menyela sebelum bulk selesai"
+    np.testing.assert_array_equal(results["bulk"][1][:, 0], np.arange(100, dtype=np.float32))
+    assert results["interactive"][1][0, 0] == 500
+
+
+def test_small_jobs_for_same_model_are_batched_together():
+    forward = RecordingForward()
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=32, bulk_wait_ms=100)
+    results = {}
+
+    threads = [run_in_thread(scheduler, results, i, "vgg16", None, make_batch(2, 10 * i), LANE_BULK)
+               for i in range(3)]
+    for thread in threads:
+        thread.join(5)
+
+    assert sum(size for _, size in forward.calls) == 6
+    assert len(forward.calls) < 3
+    for i in range(3):
+        np.testing.assert_array_equal(results[i][1][:, 0], [10 * i, 10 * i + 1])
+
+
+def test_per_model_batch_limit_from_configure():
+    forward = RecordingForward()
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=32, bulk_wait_ms=0)
+    scheduler.configure("vgg16", interactive_batch=3)
+
+    scheduler.run("vgg16", None, make_batch(7), LANE_INTERACTIVE)
+
+    assert [size for _, size in forward.calls] == [3, 3, 1]
+    assert scheduler.batch_limit(LANE_BULK, "vgg16") == 32
+
+
+def test_failed_chunk_fails_job_and_drops_remaining_chunks():
+    forward = RecordingForward(fail_on=2)
+    scheduler = InferenceScheduler(forward, interactive_batch=4, bulk_batch=4, bulk_wait_ms=0)
+
+    with pytest.raises(RuntimeError):
+        scheduler.run("vgg16", None, make_batch(12), LANE_INTERACTIVE)
+
+    # Scheduler tetap melayani job berikutnya
+    _, predictions = scheduler.run("vgg16", None, make_batch(2, 7), LANE_INTERACTIVE)
+    assert len(forward.calls) == 3
+    np.testing.assert_array_equal(predictions[:, 0], [7, 8])
+
+
+def test_observe_hook_skips_synthetic_jobs():
+    observed = []
+    scheduler = InferenceScheduler(RecordingForward(), bulk_wait_ms=0,
+                                   observe=lambda key, seconds: observed.append(key))
+
+    scheduler.run("vgg16", None, make_batch(2), LANE_INTERACTIVE, observe=False)
+    assert observed == []
+    scheduler.run("vgg16", None, make_batch(2), LANE_INTERACTIVE)
+    assert observed == ["vgg16"]
+
+
+def test_job_batch_limit_overrides_lane_limit():
+    forward = RecordingForward()
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=32, bulk_wait_ms=0)
+
+    scheduler.run("vgg16", None, make_batch(64), LANE_BULK, batch_limit=64)
+
+    assert [size for _, size in forward.calls] == [64]
+
+
+def test_capped_bulk_job_does_not_wait_for_bulk_window():
+    forward = RecordingForward()
+    scheduler = InferenceScheduler(forward, interactive_batch=8, bulk_batch=32, bulk_wait_ms=2000)
+
+    started = time.perf_counter()
+    scheduler.run("vgg16", None, make_batch(4), LANE_BULK, batch_limit=4)
+
+    assert time.perf_counter() - started < 1.0
+    assert [size for _, size in forward.calls] == [4]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tiling import (MAX_GRID, MAX_OVERLAP, TILE_SIZE, TileLimitError, box_iou, check_tile_limits, count_tiles,
+                    merge_regions, tile_batch, tile_positions, valid_tile_params)
+
+
+def make_image(width, height):
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+
+
+def test_tile_positions_cover_both_edges():
+    positions = tile_positions(600, 224, 168)
+    assert positions[0] == 0
+    assert positions[-1] == 600 - 224
+    assert np.all(np.diff(positions) <= 168)
+
+
+def test_tile_batch_shapes_and_boxes_inside_image():
+    img = make_image(640, 480)
+    batch, boxes = tile_batch(img, grid=3, overlap=0.25)
+    assert batch.shape == (count_tiles(640, 480, 3, 0.25), TILE_SIZE, TILE_SIZE, 3)
+    assert batch.dtype == np.uint8
+    assert boxes.min() >= 0
+    assert np.all(boxes[:, [0, 2]] <= 640) and np.all(boxes[:, [1, 3]] <= 480)
+    # Tile terakhir menempel di pojok kanan bawah
+    np.testing.assert_allclose(boxes[-1, 2:], [640, 480])
+
+
+def test_tile_count_is_capped():
+    assert count_tiles(1200, 480, 8, 0.75) == 200
+    with pytest.raises(TileLimitError):
+        check_tile_limits(1200, 480, 8, 0.75, max_tiles=96)
+    with pytest.raises(TileLimitError):
+        tile_batch(make_image(1200, 480), grid=8, overlap=0.75, max_tiles=96)
+
+
+def test_max_grid_on_4_3_photo_fits_default_cap():
+    check_tile_limits(4000, 3000, MAX_GRID, MAX_OVERLAP, max_tiles=96)
+
+
+def test_image_smaller_than_a_tile_is_rejected_not_upscaled():
+    with pytest.raises(TileLimitError):
+        tile_batch(make_image(200, 150), grid=1, overlap=0.0)
+    tile_batch(make_image(TILE_SIZE, TILE_SIZE), grid=1, overlap=0.0)
+
+
+@pytest.mark.parametrize("grid, overlap, valid", [
+    (1, 0.0, True), (MAX_GRID, MAX_OVERLAP, True), (0, 0.25, False), (MAX_GRID + 1, 0.25, False),
+    (3, -0.1, False), (3, 0.9, False),
+])
+def test_valid_tile_params(grid, overlap, valid):
+    assert valid_tile_params(grid, overlap) is valid
+
+
+def test_box_iou():
+    boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+    np.testing.assert_allclose(box_iou(boxes[0], boxes), [1.0, 50 / 150, 0.0])
+
+
+def test_merge_regions_is_per_class_nms():
+    boxes = np.array([[0, 0, 10, 10], [1, 0, 11, 10], [1, 0, 11, 10], [50, 50, 60, 60]], dtype=float)
+    classes = np.array([0, 0, 1, 0])
+    confidences = np.array([0.6, 0.9, 0.8, 0.7])
+    # Tile 0 tertutup tile 1 (kelas sama, confidence lebih tinggi); tile 2 kelas lain tetap dipertahankan
+    assert merge_regions(boxes, classes, confidences) == [1, 2, 3]
@@ -0,0 +1,113 @@
+"""
+Mode multi-buah: foto besar (peti, conveyor) dipecah menjadi tile yang saling overlap dan semua tile
+diklasifikasikan dalam satu batch forward pass.
+
+Gambar di-resize sekali sehingga ukuran tile = ukuran input model (224), lalu tile diambil lewat
+np.lib.stride_tricks.sliding_window_view (view tanpa copy); satu-satunya copy adalah saat batch disusun.
+"""
+
+import os
+
+import numpy as np
+
+TILE_SIZE = 224
+# Batas parameter endpoint /api/predict/tiles (juga dipakai admission.py untuk estimasi biaya)
+MAX_GRID = 8
+MAX_OVERLAP = 0.75
+# Jumlah tile maksimum per gambar (tiap tile = satu baris forward pass). Default cukup untuk grid 8 pada foto 4:3
+# (88-96 tile); gambar panjang dengan grid/overlap besar bisa menghasilkan ratusan tile dan ditolak
+MAX_TILES = int(os.getenv("MAX_TILES", "96"))
+# Sisi terpendek minimum gambar sumber: gambar yang lebih kecil dari satu tile ditolak, bukan di-upscale
+MIN_SOURCE_SIDE = int(os.getenv("TILE_MIN_SOURCE_SIDE", str(TILE_SIZE)))
+
+
+class TileLimitError(ValueError):
+    pass
+
+
+def valid_tile_params(grid, overlap):
+    return 1 <= grid <= MAX_GRID and 0.0 <= overlap <= MAX_OVERLAP
+
+
+def tile_positions(length, size, stride):
+    """Posisi awal tile sepanjang satu sumbu; tile terakhir selalu menempel di tepi"""
+    positions = list(range(0, max(length - size, 0) + 1, stride))
+    if positions[-1] != max(length - size, 0):
+        positions.append(length - size)
+    return np.array(positions, dtype=np.intp)
+
+
+def tile_layout(width, height, grid, overlap, size=TILE_SIZE):
+    """Ukuran gambar setelah di-resize dan posisi tile: (scale, scaled_w, scaled_h, ys, xs)"""
+    stride = max(1, int(round(size * (1.0 - overlap))))
+    short_side = size + (grid - 1) * stride
+    scale = short_side / min(width, height)
+    scaled_w = max(size, int(round(width * scale)))
+    scaled_h = max(size, int(round(height * scale)))
+    return scale, scaled_w, scaled_h, tile_positions(scaled_h, size, stride), tile_positions(scaled_w, size, stride)
+
+
+def count_tiles(width, height, grid, overlap, size=TILE_SIZE):
+    _, _, _, ys, xs = tile_layout(width, height, grid, overlap, size)
+    return len(ys) * len(xs)
+
+
+def check_tile_limits(width, height, grid, overlap, size=TILE_SIZE, max_tiles=MAX_TILES, min_side=MIN_SOURCE_SIDE):
+    """TileLimitError jika gambar lebih kecil dari min_side atau jumlah tile melebihi max_tiles"""
+    if min(width, height) < min_side:
+        raise TileLimitError(f"Sisi terpendek gambar minimal {min_side} piksel untuk mode tiles "
+                             f"(gambar {width}x{height})")
+    tiles = count_tiles(width, height, grid, overlap, size)
+    if max_tiles > 0 and tiles > max_tiles:
+        raise TileLimitError(f"grid={grid} dan overlap={overlap:g} menghasilkan {tiles} tile untuk gambar "
+                             f"{width}x{height}, maksimum {max_tiles}; kecilkan grid atau overlap")
+
+
+def tile_batch(img, grid=3, overlap=0.25, size=TILE_SIZE, max_tiles=MAX_TILES, min_side=MIN_SOURCE_SIDE):
+    """
+    img: PIL Image RGB. grid: jumlah tile di sisi terpendek. overlap: fraksi overlap antar tile (0..MAX_OVERLAP, 0.75).
+    Mengembalikan (batch uint8 [N, size, size, 3], boxes [N, 4] (x0, y0, x1, y1) dalam koordinat gambar asli).
+    TileLimitError jika gambar terlalu kecil atau jumlah tile melebihi max_tiles (dicek sebelum resize).
+    """
+    check_tile_limits(img.size[0], img.size[1], grid, overlap, size, max_tiles, min_side)
+    scale, scaled_w, scaled_h, ys, xs = tile_layout(img.size[0], img.size[1], grid, overlap, size)
+    pixels = np.asarray(img.resize((scaled_w, scaled_h)), dtype=np.uint8)
+
+    # [ny_total, nx_total, size, size, 3] - view di atas buffer yang sama, tanpa copy
+    windows = np.lib.stride_tricks.sliding_window_view(pixels, (size, size, 3))[:, :, 0]
+    batch = windows[ys[:, None], xs[None, :]].reshape(-1, size, size, 3)
+
+    grid_y, grid_x = np.meshgrid(ys, xs, indexing="ij")
+    boxes = np.stack([grid_x.ravel(), grid_y.ravel(), grid_x.ravel() + size, grid_y.ravel() + size], axis=1)
+    return batch, np.minimum(boxes / scale, [img.size[0], img.size[1], img.size[0], img.size[1]])
+
+
+def box_iou(box, boxes):
+    """IoU satu box terhadap array box [N, 4]"""
+    x0 = np.maximum(box[0], boxes[:, 0])
+    y0 = np.maximum(box[1], boxes[:, 1])
+    x1 = np.minimum(box[2], boxes[:, 2])
+    y1 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return intersection / np.maximum(area + areas - intersection, 1e-9)
+
+
+def merge_regions(boxes, class_indices, confidences, iou_threshold=0.3):
+    """
+    Non-maximum suppression per kelas: tile kelas sama yang overlap > iou_threshold digabung ke tile
+    dengan confidence tertinggi. Mengembalikan indeks tile yang dipertahankan.
+    """
+    keep = []
+    for class_index in np.unique(class_indices):
+        candidates = np.flatnonzero(class_indices == class_index)
+        candidates = candidates[np.argsort(-confidences[candidates])]
+        while len(candidates):
+            best = candidates[0]
+            keep.append(int(best))
+            if len(candidates) == 1:
+                break
+            overlaps = box_iou(boxes[best], boxes[candidates[1:]])
+            candidates = candidates[1:][overlaps <= iou_threshold]
+    return sorted(keep)
@@ -0,0 +1,146 @@
+"""
+Tracing opsional per-request untuk API Klasifikasi Buah Naga
+
+Tracing hanya aktif jika diminta (header X-Trace: 1) atau dipaksa lewat env TRACING_ENABLED=1.
+Durasi setiap tahap dikembalikan sebagai header Server-Timing, dan span bisa diekspor:
+- TRACE_EXPORT_PATH=/path/spans.jsonl  -> span format OTLP-JSON per baris (stand-in collector lokal)
+- TRACE_EXPORT_OTEL=1                  -> dikirim ke TracerProvider OpenTelemetry yang terpasang
+Ekspor dilakukan di thread background agar tidak menambah latensi request.
+"""
+
+import os
+import json
+import time
+import queue
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# OpenTelemetry bersifat opsional
+try:
+    from opentelemetry import trace as otel_trace  # type: ignore
+    OTEL_AVAILABLE = True
+except ImportError:
+    otel_trace = None
+    OTEL_AVAILABLE = False
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_HEADER = "x-trace"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_EXPORT_OTEL = os.getenv("TRACE_EXPORT_OTEL", "0") == "1" and OTEL_AVAILABLE
+
+_current_trace = contextvars.ContextVar("dragonfruit_trace", default=None)
+
+
+class Trace:
+    """Kumpulan span untuk satu request"""
+
+    def __init__(self, name):
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.root_span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.spans = []  # (nama, start_ns, end_ns, durasi_ms)
+
+    def add_span(self, name, start_ns, end_ns, duration_ms):
+        self.spans.append((name, start_ns, end_ns, duration_ms))
+
+    def finish(self):
+        self.end_ns = time.time_ns()
+
+    def server_timing(self):
+        """Nilai header Server-Timing, contoh: 'decode;dur=3.10, forward-vgg16;dur=812.44, total;dur=830.02'"""
+        entries = [f"{name};dur={duration_ms:.2f}" for name, _, _, duration_ms in self.spans]
+        if self.end_ns is not None:
+            entries.append(f"total;dur={(self.end_ns - self.start_ns) / 1e6:.2f}")
+        return ", ".join(entries)
+
+    def to_otlp_json(self):
+        """Span dalam format mirip OTLP-JSON (satu dict per span, root lebih dulu)"""
+        root = {
+            "traceId": self.trace_id,
+            "spanId": self.root_span_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+        }
+        children = [{
+            "traceId": self.trace_id,
+            "spanId": secrets.token_hex(8),
+            "parentSpanId": self.root_span_id,
+            "name": name,
+            "startTimeUnixNano": start_ns,
+            "endTimeUnixNano": end_ns,
+        } for name, start_ns, end_ns, _ in self.spans]
+        return [root] + children
+
+
+def is_requested(headers):
+    """True jika tracing diaktifkan global atau diminta lewat header X-Trace"""
+    return TRACING_ENABLED or headers.get(TRACE_HEADER, "").lower() in ("1", "true", "yes")
+
+
+def start_trace(name):
+    """Membuat Trace baru dan menjadikannya trace aktif di context saat ini"""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    return trace, token
+
+
+def end_trace(trace, token):
+    trace.finish()
+    _current_trace.reset(token)
+    if TRACE_EXPORT_PATH or TRACE_EXPORT_OTEL:
+        _export_queue.put(trace)
+
+
+@contextmanager
+def span(name):
+    """Mencatat durasi blok sebagai span jika ada trace aktif; no-op murah jika tidak"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, start_ns, time.time_ns(), (time.perf_counter() - start) * 1000)
+
+
+# ==============================================================================
+# EKSPOR SPAN (BACKGROUND)
+# ==============================================================================
+
+_export_queue = queue.SimpleQueue()
+
+
+def _export_otel(trace):
+    tracer = otel_trace.get_tracer("dragonfruit-api")
+    root = tracer.start_span(trace.name, start_time=trace.start_ns)
+    context = otel_trace.set_span_in_context(root)
+    for name, start_ns, end_ns, _ in trace.spans:
+        child = tracer.start_span(name, context=context, start_time=start_ns)
+        child.end(end_time=end_ns)
+    root.end(end_time=trace.end_ns)
+
+
+def _export_worker():
+    while True:
+        trace = _export_queue.get()
+        try:
+            if TRACE_EXPORT_PATH:
+                with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+                    for record in trace.to_otlp_json():
+                        f.write(json.dumps(record) + "\n")
+            if TRACE_EXPORT_OTEL:
+                _export_otel(trace)
+        except Exception as e:
+            print(f"⚠️ Gagal mengekspor trace {trace.trace_id}: {e}")
+
+
+if TRACE_EXPORT_PATH or TRACE_EXPORT_OTEL:
+    threading.Thread(target=_export_worker, name="trace-exporter", daemon=True).start()
@@ -0,0 +1,86 @@
+"""
+Test-time augmentation (TTA): K view teraugmentasi dari satu gambar, dibangun dalam satu operasi vectorized.
+
+Setiap view adalah transformasi affine (flip, crop tengah/sudut, rotasi kecil) dari grid output 224x224 ke
+koordinat sumber. Koordinat semua view dihitung sekaligus lalu di-gather (nearest neighbour) menjadi batch
+[K, 224, 224, 3], sehingga model cukup dijalankan sekali untuk semua view.
+
+Mode (env TTA_MODE atau query ?tta= di endpoint prediksi):
+    off      - satu view (default)
+    adaptive - TTA hanya jika margin skor view tunggal berada di rentang ambigu [TTA_MARGIN_LOW, TTA_MARGIN_HIGH]
+    always   - selalu TTA
+"""
+
+import os
+
+import numpy as np
+
+TTA_MODES = ("off", "adaptive", "always")
+TTA_MODE = os.getenv("TTA_MODE", "off")
+# Rentang margin (persen, selisih skor top-1 dan top-2) yang dianggap ambigu untuk mode adaptive
+TTA_MARGIN_LOW = float(os.getenv("TTA_MARGIN_LOW", "5"))
+TTA_MARGIN_HIGH = float(os.getenv("TTA_MARGIN_HIGH", "50"))
+
+# (flip horizontal, skala crop, offset crop (fraksi, -1..1), rotasi derajat)
+DEFAULT_VIEWS = (
+    (False, 1.0, (0.0, 0.0), 0.0),     # asli
+    (True, 1.0, (0.0, 0.0), 0.0),      # flip horizontal
+    (False, 0.875, (0.0, 0.0), 0.0),   # crop tengah
+    (False, 0.875, (-1.0, -1.0), 0.0), # crop kiri atas
+    (False, 0.875, (1.0, -1.0), 0.0),  # crop kanan atas
+    (False, 0.875, (-1.0, 1.0), 0.0),  # crop kiri bawah
+    (False, 0.875, (1.0, 1.0), 0.0),   # crop kanan bawah
+    (False, 1.0, (0.0, 0.0), 10.0),    # rotasi +10°
+    (False, 1.0, (0.0, 0.0), -10.0),   # rotasi -10°
+)
+
+
+def sampling_grid(height, width, views=DEFAULT_VIEWS):
+    """
+    Indeks piksel sumber (ys, xs) berbentuk [K, H, W] untuk semua view.
+    Hanya bergantung pada ukuran gambar, jadi bisa dihitung sekali dan dipakai ulang.
+    """
+    cy, cx = (height - 1) / 2.0, (width - 1) / 2.0
+    yy, xx = np.meshgrid(np.arange(height, dtype=np.float32) - cy, np.arange(width, dtype=np.float32) - cx,
+                         indexing="ij")
+    flip = np.array([-1.0 if v[0] else 1.0 for v in views], dtype=np.float32)[:, None, None]
+    scale = np.array([v[1] for v in views], dtype=np.float32)[:, None, None]
+    offsets = np.array([v[2] for v in views], dtype=np.float32)
+    angles = np.deg2rad(np.array([v[3] for v in views], dtype=np.float32))[:, None, None]
+
+    # Rotasi di sekitar pusat, lalu skala (crop) dan geser ke pojok yang diminta
+    cos, sin = np.cos(angles), np.sin(angles)
+    src_x = (cos * xx[None] * flip - sin * yy[None]) * scale + (offsets[:, 0, None, None] * (1 - scale) * cx)
+    src_y = (sin * xx[None] * flip + cos * yy[None]) * scale + (offsets[:, 1, None, None] * (1 - scale) * cy)
+
+    ys = np.clip(np.rint(src_y + cy), 0, height - 1).astype(np.intp)
+    xs = np.clip(np.rint(src_x + cx), 0, width - 1).astype(np.intp)
+    return ys, xs
+
+
+_GRID_CACHE = {}
+
+
+def augmented_views(img_array, views=DEFAULT_VIEWS):
+    """[1, H, W, 3] atau [H, W, 3] -> batch [K, H, W, 3] (satu gather vectorized untuk semua view)"""
+    img = img_array[0] if img_array.ndim == 4 else img_array
+    key = (img.shape[0], img.shape[1], views)
+    grid = _GRID_CACHE.get(key)
+    if grid is None:
+        grid = _GRID_CACHE[key] = sampling_grid(img.shape[0], img.shape[1], views)
+    ys, xs = grid
+    return img[ys, xs]
+
+
+def should_apply(mode, margin):
+    """Apakah TTA dijalankan untuk margin (persen) hasil view tunggal"""
+    if mode == "always":
+        return True
+    if mode == "adaptive":
+        return TTA_MARGIN_LOW <= margin <= TTA_MARGIN_HIGH
+    return False
+
+
+def aggregate(scores):
+    """Rata-rata skor softmax semua view [K, C] -> [C]"""
+    return np.asarray(scores, dtype=np.float32).mean(axis=0)
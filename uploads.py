@@ -0,0 +1,89 @@
+"""
+Penanganan upload tanpa copy untuk api.py.
+
+- MaxBodySizeMiddleware: middleware ASGI yang menolak body > MAX_UPLOAD_MB dengan 413, langsung dari header
+  Content-Length (sebelum body dibaca) atau saat streaming jika Content-Length tidak ada / tidak jujur.
+- hash_upload: sha1 dari file upload ter-spool (SpooledTemporaryFile milik UploadFile) tanpa membaca ulang
+  isinya ke bytes: memoryview buffer in-memory, atau chunk untuk file yang sudah di-spool ke disk.
+  Setelah itu file di-rewind dan bisa langsung diberikan ke Image.open (tanpa io.BytesIO(contents)).
+"""
+
+import io
+import os
+import json
+import hashlib
+
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "10"))
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class MaxBodySizeMiddleware:
+    """Middleware ASGI murni (tanpa BaseHTTPMiddleware) agar body tidak di-buffer sebelum diperiksa"""
+
+    def __init__(self, app, max_bytes=MAX_UPLOAD_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send):
+        limit_mb = self.max_bytes / (1024 * 1024)
+        body = json.dumps({"detail": f"Ukuran upload melebihi batas {limit_mb:g} MB"}).encode()
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"connection", b"close")]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # Parser form FastAPI mengubah error body menjadi 400; respons itu dibuang dan diganti 413
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            pass
+        if exceeded:
+            await self._reject(send)
+
+
+def hash_upload(fileobj):
+    """sha1 hex isi file upload (tanpa copy untuk buffer in-memory), lalu rewind ke awal"""
+    digest = hashlib.sha1()
+    inner = getattr(fileobj, "_file", fileobj)  # SpooledTemporaryFile -> BytesIO atau file disk
+    if isinstance(inner, io.BytesIO):
+        with inner.getbuffer() as view:
+            digest.update(view)
+    else:
+        inner.seek(0)
+        for chunk in iter(lambda: inner.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
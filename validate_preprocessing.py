@@ -0,0 +1,86 @@
+"""
+Validasi kebijakan preprocessing (preprocessing.py): akurasi dan waktu preprocess per kombinasi mode resize x filter
+pada data berlabel, untuk memilih kebijakan tercepat yang tidak menurunkan akurasi dibanding default (stretch + default).
+
+Contoh:
+    # Subfolder = label kelas (misal data/val/Mature Dragon Fruit/*.jpg)
+    python validate_preprocessing.py --images data/val/
+    python validate_preprocessing.py --images data/val/ --model vgg16 --modes stretch letterbox --filters default reduce
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+from PIL import Image
+
+from embeddings import list_images
+from postprocessing import CLASS_NAMES
+from preprocessing import RESAMPLE_FILTERS, RESIZE_MODES, to_model_input
+
+
+def evaluate_policy(model, images, labels, mode, resample, width, height, batch_size=32):
+    """Mengembalikan (akurasi, rata-rata ms preprocess per gambar, prediksi [N])"""
+    predictions = []
+    preprocess_seconds = 0.0
+    for start in range(0, len(images), batch_size):
+        batch = []
+        for img in images[start:start + batch_size]:
+            started = time.perf_counter()
+            batch.append(to_model_input(img, width, height, mode, resample)[0])
+            preprocess_seconds += time.perf_counter() - started
+        outputs = model.predict(np.stack(batch), batch_size=len(batch), verbose=0)
+        predictions.append(np.argmax(outputs, axis=1))
+    predictions = np.concatenate(predictions)
+    accuracy = float(np.mean(predictions == labels))
+    return accuracy, preprocess_seconds * 1000.0 / len(images), predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validasi akurasi & kecepatan kebijakan preprocessing")
+    parser.add_argument("--images", required=True, help="Folder data berlabel (subfolder = nama kelas)")
+    parser.add_argument("--model", default="mobilenetv2", choices=["vgg16", "mobilenetv2"])
+    parser.add_argument("--modes", nargs="+", default=list(RESIZE_MODES), choices=RESIZE_MODES)
+    parser.add_argument("--filters", nargs="+", default=list(RESAMPLE_FILTERS), choices=RESAMPLE_FILTERS)
+    args = parser.parse_args()
+
+    files = [path for path in list_images(args.images)
+             if os.path.basename(os.path.dirname(path)) in CLASS_NAMES]
+    if not files:
+        sys.exit(f"❌ Tidak ada gambar di subfolder {CLASS_NAMES}")
+    labels = np.array([CLASS_NAMES.index(os.path.basename(os.path.dirname(path))) for path in files])
+
+    import api
+    asyncio.run(api.load_models())
+    model = api.models.get(args.model)
+    if model is None:
+        sys.exit(f"❌ Model {args.model} tidak dapat dimuat dari model_results/")
+
+    # Decode sekali di luar pengukuran: yang dibandingkan hanya biaya preprocess
+    images = []
+    for path in files:
+        with Image.open(path) as img:
+            img.load()
+            images.append(img.copy())
+    print(f"🔍 {len(files)} gambar berlabel, model {api.MODEL_DISPLAY_NAMES[args.model]}\n")
+
+    # Baseline = kebijakan default (stretch + filter default PIL), selalu diukur lebih dulu
+    policies = [("stretch", "default")] + [(mode, resample) for mode in args.modes for resample in args.filters
+                                           if (mode, resample) != ("stretch", "default")]
+    baseline = None
+    print(f"{'mode':<12} {'filter':<9} {'akurasi':>8} {'Δ akurasi':>10} {'ms/gambar':>10} {'sama dgn default':>17}")
+    for mode, resample in policies:
+        accuracy, ms, predictions = evaluate_policy(model, images, labels, mode, resample,
+                                                    api.IMG_WIDTH, api.IMG_HEIGHT)
+        if baseline is None:
+            baseline = (accuracy, predictions)
+        agreement = float(np.mean(predictions == baseline[1]))
+        print(f"{mode:<12} {resample:<9} {accuracy * 100:>7.2f}% {(accuracy - baseline[0]) * 100:>+9.2f}% "
+              f"{ms:>10.2f} {agreement * 100:>16.1f}%")
+
+
+if __name__ == "__main__":
+    main()